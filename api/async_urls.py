@@ -0,0 +1,24 @@
+"""
+Async variants of the read-heavy API routes, see api.async_views.
+
+Only used under ASGI through placement_management.asgi_urls, where these
+routes shadow the sync ones at the same paths.
+"""
+from django.urls import path
+from . async_views import async_read_view
+from . views import CompanyCreateListApiView, CompanyUpdateDeleteRetrieveApiView, QuestionCreateListApiView \
+    , QuestionUpdateDeleteRetrieveApiView, ApplicationCreateListApiView, ApplicationUpdateDeleteRetrieveApiView \
+    , InterviewCreateListApiView, InterviewUpdateDeleteRetrieveApiView, OfferCreateListApiView, OfferUpdateDeleteRetrieveApiView
+
+urlpatterns = [
+    path('company', async_read_view(CompanyCreateListApiView), name='list-create-company'),
+    path('company/<int:pk>', async_read_view(CompanyUpdateDeleteRetrieveApiView), name='crud-company'),
+    path('question', async_read_view(QuestionCreateListApiView), name='list-create-question'),
+    path('question/<int:pk>', async_read_view(QuestionUpdateDeleteRetrieveApiView), name='crud-question'),
+    path('application', async_read_view(ApplicationCreateListApiView), name='list-create-application'),
+    path('application/<int:pk>', async_read_view(ApplicationUpdateDeleteRetrieveApiView), name='crud-application'),
+    path('interview', async_read_view(InterviewCreateListApiView), name='list-create-interview'),
+    path('interview/<int:pk>', async_read_view(InterviewUpdateDeleteRetrieveApiView), name='crud-interview'),
+    path('offer', async_read_view(OfferCreateListApiView), name='list-create-offer'),
+    path('offer/<int:pk>', async_read_view(OfferUpdateDeleteRetrieveApiView), name='crud-offer'),
+]
@@ -0,0 +1,201 @@
+"""
+Async GET handlers for the read-heavy endpoints, used under ASGI.
+
+``async_read_view(ViewClass)`` serves a DRF generic view's list or detail
+GET on the event loop. The user is loaded with ``aget``, the conditional
+GET summary with ``aaggregate`` and the page with ``aiterator``, and the
+response is rendered in place. Everything else (permissions, owner scoping,
+expand, cursors, ETags, caching and serializers) comes from the view class
+itself. Other methods, and requests for the browsable API, go to the sync
+view as before.
+
+The async views are routed through ASGI_URLCONF, which AsyncUrlconfMiddleware
+applies to ASGI requests only. WSGI deployments keep the sync views, so
+they don't pay for an event loop per request.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse
+from django.template.response import SimpleTemplateResponse
+from rest_framework import exceptions
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from core import user_cache
+from core.db import afetch
+
+from .authentication import CachedJWTAuthentication, token_user_id
+
+
+async def aget_jwt_user(authenticator, validated_token):
+    """Async counterpart of JWTAuthentication.get_user.
+
+    Goes through core.user_cache like CachedJWTAuthentication does.
+    """
+    user_id = token_user_id(validated_token)
+    cached = isinstance(authenticator, CachedJWTAuthentication)
+    if cached:
+        user = await user_cache.aget(user_id)
+        if user is not None:
+            return user
+
+    try:
+        user = await authenticator.user_model.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+    except authenticator.user_model.DoesNotExist:
+        raise AuthenticationFailed('User not found', code='user_not_found')
+
+    if not user.is_active:
+        raise AuthenticationFailed('User is inactive', code='user_inactive')
+    if cached:
+        await user_cache.astore(user)
+    return user
+
+
+async def aauthenticate_jwt(authenticator, request):
+    header = authenticator.get_header(request)
+    if header is None:
+        return None
+    raw_token = authenticator.get_raw_token(header)
+    if raw_token is None:
+        return None
+    validated_token = authenticator.get_validated_token(raw_token)
+    return await aget_jwt_user(authenticator, validated_token), validated_token
+
+
+async def aauthenticate(request):
+    """Async counterpart of ``Request._authenticate``.
+
+    JWT is handled on the event loop, other authenticators run in the sync
+    thread.
+    """
+    for authenticator in request.authenticators:
+        try:
+            if isinstance(authenticator, JWTAuthentication):
+                user_auth_tuple = await aauthenticate_jwt(authenticator, request)
+            else:
+                user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+        except exceptions.APIException:
+            request._not_authenticated()
+            raise
+
+        if user_auth_tuple is not None:
+            request._authenticator = authenticator
+            request.user, request.auth = user_auth_tuple
+            return
+    request._not_authenticated()
+
+
+def rendered(response):
+    """Render a DRF response here, so Django doesn't hop to a thread for it."""
+    if not isinstance(response, SimpleTemplateResponse):
+        return response
+    response.render()
+    plain = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        plain[header] = value
+    return plain
+
+
+class AsyncReadMixin:
+    """Async ``alist``/``aretrieve`` for a DRF generic view.
+
+    Mixins like ConditionalGetMixin and CachedResponseMixin provide their
+    own ``alist``/``aretrieve`` that end up here through ``super()``.
+    """
+
+    def is_detail(self):
+        return (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+
+    def serves_async(self, request):
+        """Only JSON is rendered on the event loop, the browsable API isn't."""
+        drf_request = self.initialize_request(request)
+        renderer, _ = self.perform_content_negotiation(drf_request, force=True)
+        return renderer.format == 'json'
+
+    async def adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await aauthenticate(request)
+            self.initial(request, *args, **kwargs)
+            handler = self.aretrieve if self.is_detail() else self.alist
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return rendered(self.response)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = self.paginator
+        if paginator is not None:
+            page = await paginator.apaginate_queryset(queryset, request, view=self)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(await afetch(queryset), many=True)
+        return Response(serializer.data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+def async_read_view(view_class, **initkwargs):
+    """Return an async view serving ``view_class``'s GET on the event loop."""
+    async_class = type('Async' + view_class.__name__, (view_class, AsyncReadMixin), {})
+    sync_view = sync_to_async(view_class.as_view(**initkwargs))
+
+    async def view(request, *args, **kwargs):
+        self = async_class(**initkwargs)
+        self.setup(request, *args, **kwargs)
+        if request.method != 'GET' or not self.serves_async(request):
+            return await sync_view(request, *args, **kwargs)
+        return await self.adispatch(request, *args, **kwargs)
+
+    view.view_class = view_class
+    view.initkwargs = initkwargs
+    view.csrf_exempt = True
+    return view
+
+
+class AsyncUrlconfMiddleware:
+    """Resolve ASGI requests against ``settings.ASGI_URLCONF``."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        urlconf = getattr(settings, 'ASGI_URLCONF', None)
+        if urlconf and isinstance(request, ASGIRequest):
+            request.urlconf = urlconf
+        return await self.get_response(request)
@@ -0,0 +1,30 @@
+"""
+Authentication classes.
+"""
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from core import user_cache
+
+
+def token_user_id(validated_token):
+    try:
+        return validated_token[jwt_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken('Token contained no recognizable user identification')
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that reads the user through core.user_cache.
+
+    Only active users are cached, so a missing or inactive user is looked
+    up, and rejected, every time.
+    """
+
+    def get_user(self, validated_token):
+        user = user_cache.get(token_user_id(validated_token))
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.store(user)
+        return user
@@ -0,0 +1,151 @@
+"""
+Read-through cache for API responses that rarely change.
+
+Responses are cached per namespace under a version number. Invalidating a
+namespace bumps its version, so every cached page and detail goes stale at
+once without enumerating keys, on any cache backend Django supports.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+
+# Validators stored with a cached payload so hits can still answer 304.
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+
+
+def _key(namespace, suffix):
+    return 'api:%s:%s' % (namespace, suffix)
+
+
+def get_version(namespace):
+    key = _key(namespace, 'version')
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock so an evicted version key can't bring back
+        # entries cached under an older version.
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(namespace):
+    key = _key(namespace, 'version')
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, int(time.time() * 1000), None)
+        version = await cache.aget(key)
+    return version
+
+
+def invalidate(namespace):
+    try:
+        cache.incr(_key(namespace, 'version'))
+    except ValueError:
+        get_version(namespace)
+
+
+def _increment(key):
+    if cache.add(key, 1, None):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+async def _aincrement(key):
+    if await cache.aadd(key, 1, None):
+        return
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 1, None)
+
+
+def stats(namespace):
+    """Return the hit and miss counters for a namespace."""
+    return {
+        'hits': cache.get(_key(namespace, 'hits'), 0),
+        'misses': cache.get(_key(namespace, 'misses'), 0),
+    }
+
+
+class CachedResponseMixin:
+    """Serve GET list/retrieve responses from Django's cache.
+
+    The key covers the host and full path, so cursors, page sizes and
+    other query parameters are cached separately. Validator headers are
+    cached alongside the data, so conditional requests are answered from
+    the cache too. Responses carry an ``X-Cache: HIT`` or ``MISS`` header.
+    """
+    cache_namespace = None
+
+    def get_cache_key(self, request, version):
+        raw = '%s%s' % (request.get_host(), request.get_full_path())
+        digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+        return _key(self.cache_namespace, '%s:%s' % (version, digest))
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_cache_key(request, get_version(self.cache_namespace))
+        cached = cache.get(key)
+        if cached is not None:
+            _increment(_key(self.cache_namespace, 'hits'))
+            return self.response_from_cache(request, cached)
+
+        _increment(_key(self.cache_namespace, 'misses'))
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, self.cache_entry(response), getattr(settings, 'API_CACHE_TIMEOUT', 300))
+        response['X-Cache'] = 'MISS'
+        return response
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        key = self.get_cache_key(request, await aget_version(self.cache_namespace))
+        cached = await cache.aget(key)
+        if cached is not None:
+            await _aincrement(_key(self.cache_namespace, 'hits'))
+            return self.response_from_cache(request, cached)
+
+        await _aincrement(_key(self.cache_namespace, 'misses'))
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            await cache.aset(key, self.cache_entry(response), getattr(settings, 'API_CACHE_TIMEOUT', 300))
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def cache_entry(self, response):
+        headers = {header: response[header] for header in CACHED_HEADERS if header in response}
+        return response.data, headers
+
+    def response_from_cache(self, request, cached):
+        data, headers = cached
+        last_modified = headers.get('Last-Modified')
+        response = get_conditional_response(
+            request,
+            etag=headers.get('ETag'),
+            last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+        )
+        if response is None:
+            response = Response(data)
+        for header, value in headers.items():
+            response[header] = value
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(super().aretrieve, request, *args, **kwargs)
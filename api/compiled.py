@@ -0,0 +1,201 @@
+"""
+Compiled serializers for high-volume list responses.
+
+A DRF ModelSerializer looks up, converts and formats every field of every
+instance through the field classes. For serializers made of plain model
+fields, ``compile_serializer`` works out once per serializer class and set
+of fields which ``values()`` column feeds each output key and how it's
+converted. List pages are then read with ``values()`` and turned into dicts
+by a flat loop, without creating model instances. The output is the same
+as the serializer's, so the JSON is byte-identical.
+
+Fields whose conversion isn't known here (nested serializers, method
+fields, files, fields with their own ``to_representation``) make
+``compile_serializer`` return None, and the view serializes as usual.
+"""
+import datetime
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from core.db import afetch
+
+
+_compiled = {}
+
+
+def _datetime_converter(field, current_timezone):
+    field_timezone = field.timezone if hasattr(field, 'timezone') else (current_timezone if settings.USE_TZ else None)
+
+    def convert(value):
+        # DateTimeField.to_representation for the ISO 8601 format.
+        if field_timezone is not None:
+            if timezone.is_aware(value):
+                value = value.astimezone(field_timezone)
+            else:
+                value = timezone.make_aware(value, field_timezone)
+        elif timezone.is_aware(value):
+            value = timezone.make_naive(value, datetime.timezone.utc)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def _converter(field):
+    """Return a ``current_timezone -> converter`` factory for ``field``.
+
+    The converter is None where the value is output as read. Returns False
+    if the field can't be compiled.
+    """
+    method = type(field).to_representation
+    if method is serializers.ReadOnlyField.to_representation:
+        return lambda current_timezone: None
+    if method is serializers.CharField.to_representation:
+        return lambda current_timezone: str
+    if method is serializers.IntegerField.to_representation:
+        return lambda current_timezone: int
+    if method is serializers.BooleanField.to_representation:
+        return lambda current_timezone: bool
+    if method is serializers.PrimaryKeyRelatedField.to_representation and field.pk_field is None:
+        return lambda current_timezone: None
+    if method is serializers.DateTimeField.to_representation:
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if output_format is None:
+            return lambda current_timezone: None
+        if output_format.lower() == ISO_8601:
+            return lambda current_timezone: _datetime_converter(field, current_timezone)
+    return False
+
+
+def _column(model, field):
+    """Return the ``values()`` lookup for ``field``'s source, None if there isn't one.
+
+    Relations on the way must be single-valued and not null, as DRF and
+    ``values()`` differ on missing related rows. Only primary key related
+    fields may end on a relation, where ``values()`` gives the key.
+    """
+    if field.source == '*':
+        return None
+    opts = model._meta
+    for attr in field.source_attrs[:-1]:
+        try:
+            model_field = opts.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not (model_field.many_to_one or model_field.one_to_one) or model_field.null or not model_field.concrete:
+            return None
+        opts = model_field.related_model._meta
+    try:
+        model_field = opts.get_field(field.source_attrs[-1])
+    except FieldDoesNotExist:
+        return None
+    if not model_field.concrete:
+        return None
+    if model_field.is_relation != isinstance(field, serializers.PrimaryKeyRelatedField):
+        return None
+    if model_field.is_relation and not model_field.target_field.primary_key:
+        return None
+    return '__'.join(field.source_attrs)
+
+
+class CompiledSerializer:
+    """Turns ``values()`` rows into the dicts a serializer would output."""
+
+    def __init__(self, fields):
+        # (output key, values() column, converter factory)
+        self.fields = fields
+        self.columns = tuple(dict.fromkeys(column for _, column, _ in fields))
+
+    def dump(self, rows):
+        current_timezone = timezone.get_current_timezone()
+        fields = [(name, column, make(current_timezone)) for name, column, make in self.fields]
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in fields:
+                value = row[column]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+
+def compile_serializer(serializer):
+    """Return a CompiledSerializer matching ``serializer``'s output, None if it can't be compiled.
+
+    Compiled once per serializer class and set of readable fields.
+    """
+    serializer_class = type(serializer)
+    readable = list(serializer._readable_fields)
+    key = (serializer_class, tuple(field.field_name for field in readable))
+    try:
+        return _compiled[key]
+    except KeyError:
+        pass
+
+    compiled = None
+    model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+    if model is not None and serializer_class.to_representation is serializers.Serializer.to_representation:
+        fields = []
+        for field in readable:
+            make = _converter(field)
+            column = _column(model, field) if make is not False else None
+            if column is None:
+                fields = None
+                break
+            fields.append((field.field_name, column, make))
+        if fields is not None:
+            compiled = CompiledSerializer(fields)
+    _compiled[key] = compiled
+    return compiled
+
+
+class CompiledListMixin:
+    """Serve list pages through a compiled serializer when there is one.
+
+    Rows are read with ``values()``, so no model instances are created. The
+    view's ordering columns are read too, for the cursor positions. Set
+    API_COMPILED_SERIALIZERS to False to always use the serializer.
+    """
+
+    def get_compiled_serializer(self):
+        if not settings.API_COMPILED_SERIALIZERS:
+            return None
+        return compile_serializer(self.get_serializer())
+
+    def get_compiled_queryset(self, compiled):
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = getattr(self, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        names = [field.lstrip('-') for field in ordering] + list(getattr(self, 'ordering_fields', None) or ())
+        concrete = {field.name for field in queryset.model._meta.concrete_fields}
+        extra = [name for name in dict.fromkeys(names) if name in concrete and name not in compiled.columns]
+        return queryset.values(*compiled.columns, *extra)
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.get_compiled_queryset(compiled)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(compiled.dump(page))
+        return Response(compiled.dump(queryset))
+
+    async def alist(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return await super().alist(request, *args, **kwargs)
+        queryset = self.get_compiled_queryset(compiled)
+        paginator = self.paginator
+        if paginator is not None:
+            page = await paginator.apaginate_queryset(queryset, request, view=self)
+            if page is not None:
+                return self.get_paginated_response(compiled.dump(page))
+        return Response(compiled.dump(await afetch(queryset)))
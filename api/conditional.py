@@ -0,0 +1,122 @@
+"""
+Conditional GET support for list and detail endpoints.
+
+Validators come from the ``updated_at`` column, so a 304 is answered with
+one small query and no serialization. The ``updated_at`` indexes on the
+models (led by the owner column for per-user lists) let the database read
+the latest timestamp with an index seek, however many rows there are.
+Deletions don't move it, so they bump a per-model version in the API
+cache instead, which like the response cache needs a cache shared
+between workers. ``alist`` and ``aretrieve`` do the same for the async read
+views in api.async_views.
+"""
+import hashlib
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.http import http_date
+
+from .cache import aget_version, get_version, invalidate
+
+
+def deletions_namespace(model):
+    return 'deleted:%s' % model._meta.label_lower
+
+
+def record_deletion(model):
+    """Change the list ETags of ``model`` once the deleting transaction commits."""
+    transaction.on_commit(lambda: invalidate(deletions_namespace(model)))
+
+
+class ConditionalGetMixin:
+    """Add ETag and Last-Modified to GET list/retrieve responses.
+
+    A detail ETag is derived from the row's ``updated_at``. A list ETag is
+    derived from the max ``updated_at`` of the view's queryset before
+    filtering, so a row edited out of a filter changes it too, and from
+    the model's deletion version. Lists don't send Last-Modified, as a
+    deletion doesn't move the max ``updated_at`` and an If-Modified-Since
+    would be answered with a stale 304; they are only revalidated with the
+    ETag. Both also cover the path, query
+    string, user and media type. Requests using a parameter from
+    ``conditional_skip_params`` (such as ``expand``, whose related rows
+    aren't covered by the timestamp) are served normally.
+    """
+    last_modified_field = 'updated_at'
+    conditional_skip_params = ('expand',)
+
+    def skip_conditional(self, request):
+        return any(param in request.query_params for param in self.conditional_skip_params)
+
+    def make_etag(self, request, *parts):
+        raw = '|'.join(str(part) for part in (
+            request.get_full_path(), request.user.pk, request.accepted_media_type,
+        ) + parts)
+        return quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+    def conditional_response(self, handler, request, etag, last_modified, *args, **kwargs):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return self.set_validators(response, etag, timestamp)
+
+    async def aconditional_response(self, handler, request, etag, last_modified, *args, **kwargs):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        return self.set_validators(response, etag, timestamp)
+
+    def set_validators(self, response, etag, timestamp):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_list_summary_queryset(self):
+        return self.get_queryset().order_by()
+
+    def get_detail_timestamp_queryset(self, kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        ).values_list(self.last_modified_field, flat=True)
+
+    def list(self, request, *args, **kwargs):
+        if self.skip_conditional(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.get_list_summary_queryset()
+        last_modified = queryset.aggregate(last_modified=Max(self.last_modified_field))['last_modified']
+        etag = self.make_etag(request, get_version(deletions_namespace(queryset.model)), last_modified)
+        return self.conditional_response(super().list, request, etag, None, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.skip_conditional(request):
+            return super().retrieve(request, *args, **kwargs)
+        last_modified = self.get_detail_timestamp_queryset(kwargs).first()
+        if last_modified is None:
+            return super().retrieve(request, *args, **kwargs)
+        etag = self.make_etag(request, last_modified)
+        return self.conditional_response(super().retrieve, request, etag, last_modified, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        if self.skip_conditional(request):
+            return await super().alist(request, *args, **kwargs)
+        queryset = self.get_list_summary_queryset()
+        summary = await queryset.aaggregate(last_modified=Max(self.last_modified_field))
+        version = await aget_version(deletions_namespace(queryset.model))
+        etag = self.make_etag(request, version, summary['last_modified'])
+        return await self.aconditional_response(super().alist, request, etag, None, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        if self.skip_conditional(request):
+            return await super().aretrieve(request, *args, **kwargs)
+        last_modified = await self.get_detail_timestamp_queryset(kwargs).afirst()
+        if last_modified is None:
+            return await super().aretrieve(request, *args, **kwargs)
+        etag = self.make_etag(request, last_modified)
+        return await self.aconditional_response(super().aretrieve, request, etag, last_modified, *args, **kwargs)
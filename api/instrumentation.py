@@ -0,0 +1,80 @@
+"""
+Per-request SQL instrumentation.
+
+QueryInstrumentationMiddleware records the queries each request runs, see
+core.querylog, and reports them in a Server-Timing header, which browser
+dev tools show in the request's timing tab::
+
+    Server-Timing: db;dur=4.2;desc="7 queries", db-duplicates;desc="2"
+
+and as a structured record on the ``api.queries`` logger, carrying the
+fingerprint, count and SQL of every query run more than once. Requests
+running more than QUERY_COUNT_WARNING queries are logged as warnings.
+Queries run while a streaming response is consumed happen after the
+middleware returns and aren't counted.
+"""
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from core.querylog import record_queries
+
+
+logger = logging.getLogger('api.queries')
+
+
+def server_timing(log):
+    metrics = ['db;dur=%.1f;desc="%d queries"' % (log.duration * 1000, log.count)]
+    repeated = sum(count - 1 for _, count, _ in log.duplicates())
+    if repeated:
+        metrics.append('db-duplicates;desc="%d"' % repeated)
+    return ', '.join(metrics)
+
+
+class QueryInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with record_queries() as log:
+            response = self.get_response(request)
+        self.report(request, response, log)
+        return response
+
+    async def __acall__(self, request):
+        with record_queries() as log:
+            response = await self.get_response(request)
+        self.report(request, response, log)
+        return response
+
+    def report(self, request, response, log):
+        if settings.QUERY_SERVER_TIMING:
+            timing = server_timing(log)
+            if response.has_header('Server-Timing'):
+                timing = '%s, %s' % (response['Server-Timing'], timing)
+            response['Server-Timing'] = timing
+
+        duplicates = log.duplicates()
+        level = logging.WARNING if log.count > settings.QUERY_COUNT_WARNING else logging.INFO
+        logger.log(
+            level, '%s %s ran %d queries in %.1fms (%d duplicated)',
+            request.method, request.path, log.count, log.duration * 1000, len(duplicates),
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'queries': log.count,
+                'db_ms': round(log.duration * 1000, 3),
+                'duplicates': [
+                    {'fingerprint': key, 'count': count, 'sql': sql} for key, count, sql in duplicates
+                ],
+            },
+        )
@@ -0,0 +1,186 @@
+"""
+Authorized serving of uploaded media.
+
+Resumes are only served to their owner and staff. Profile images are
+served to any signed-in user, as the user list is public. Once a request is
+authorized the transfer is handed to the front proxy when
+MEDIA_SENDFILE_BACKEND is set:
+
+* ``'x-accel-redirect'`` for nginx, with an ``internal`` location at
+  MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT.
+* ``'x-sendfile'`` for Apache mod_xsendfile or lighttpd.
+
+Without one, files are streamed by FileResponse with single-range Range
+requests and conditional GET support. The file objects keep ``fileno()``,
+so WSGI servers with a file wrapper can still use os.sendfile.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connections, router
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from core.media import MEDIA_FIELDS
+from core.models import CustomUser, Resume
+from core.storage import is_blob
+
+from .authentication import CachedJWTAuthentication
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """Read at most ``length`` bytes from a file's current position."""
+
+    def __init__(self, file, length):
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """Serve files whatever the Accept header says, errors render as JSON."""
+
+    def select_parser(self, request, parsers):
+        return parsers[0] if parsers else None
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+def file_query(model, name):
+    """Match rows of ``model`` whose file or one of its renditions is ``name``.
+
+    On Postgres renditions are matched by containment, which the GIN index
+    on the renditions column answers; a key lookup would scan the table.
+    """
+    field_name, prefix = MEDIA_FIELDS[model._meta.label]
+    contains = connections[router.db_for_read(model)].vendor == 'postgresql'
+    query = Q(**{field_name: name})
+    for rendition in settings.MEDIA_RENDITIONS:
+        if contains:
+            query |= Q(**{prefix + 'renditions__contains': {rendition: name}})
+        else:
+            query |= Q(**{'%srenditions__%s' % (prefix, rendition): name})
+    return query
+
+
+def can_access(user, name):
+    if user.is_staff:
+        return True
+    if CustomUser.objects.filter(file_query(CustomUser, name)).exists():
+        return True
+    return Resume.objects.filter(file_query(Resume, name), user_id=user).exists()
+
+
+def parse_range(header, size):
+    """Return the ``(start, end)`` of a single byte range, inclusive.
+
+    Returns None to serve the whole file (no header, or several ranges),
+    and raises ValueError for a range that can't be satisfied.
+    """
+    match = RANGE_RE.match(header or '')
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        raise ValueError
+    return start, end
+
+
+class ProtectedMediaView(APIView):
+    authentication_classes = [CachedJWTAuthentication, SessionAuthentication]
+    permission_classes = [IsAuthenticated]
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get(self, request, name):
+        name = os.path.normpath(name).replace(os.sep, '/')
+        if name.startswith(('../', '/')) or not can_access(request.user, name):
+            # Don't reveal whether a file the user may not see exists.
+            raise Http404
+        try:
+            path = default_storage.path(name)
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            raise Http404
+
+        # Blob names are the content digest, so they never change.
+        if is_blob(name):
+            etag = quote_etag(os.path.splitext(os.path.basename(name))[0])
+            max_age, immutable = 365 * 24 * 60 * 60, True
+        else:
+            etag = quote_etag('%x-%x' % (int(stat.st_mtime), stat.st_size))
+            max_age, immutable = settings.MEDIA_CACHE_MAX_AGE, False
+
+        response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+        if response is None:
+            response = self.send(request, name, path, stat.st_size, etag)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        patch_cache_control(response, private=True, max_age=max_age)
+        if immutable:
+            patch_cache_control(response, immutable=True)
+        return response
+
+    def send(self, request, name, path, size, etag):
+        backend = settings.MEDIA_SENDFILE_BACKEND
+        if backend:
+            response = HttpResponse(content_type=mimetypes.guess_type(name)[0] or 'application/octet-stream')
+            if backend == 'x-accel-redirect':
+                response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + quote(name)
+            else:
+                response['X-Sendfile'] = path
+            return response
+
+        if_range = request.META.get('HTTP_IF_RANGE')
+        header = request.META.get('HTTP_RANGE') if if_range in (None, etag) else None
+        try:
+            byte_range = parse_range(header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = 'bytes */%d' % size
+            return response
+
+        file = open(path, 'rb')
+        if byte_range is None:
+            response = FileResponse(file)
+        else:
+            start, end = byte_range
+            file.seek(start)
+            response = FileResponse(FileRange(file, end - start + 1), status=206)
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = 'bytes %d-%d/%d' % (start, end, size)
+        response['Accept-Ranges'] = 'bytes'
+        return response
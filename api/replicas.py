@@ -0,0 +1,60 @@
+"""
+Replica reads for API views, see core.replicas.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from core.replicas import pin, read_alias
+
+
+class ReplicaReadMixin:
+    """Serve GET/HEAD requests from a read replica.
+
+    The replica is picked once the user is authenticated, so users pinned
+    after a write read from the primary. It is applied with ``.using()``,
+    so querysets evaluated after the view returns, like streamed exports,
+    stay on it.
+    """
+    read_alias = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            self.read_alias = read_alias(request.user)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.read_alias:
+            queryset = queryset.using(self.read_alias)
+        return queryset
+
+
+class ReplicaPinningMiddleware:
+    """Pin the user's reads to the primary after a successful write."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def should_pin(self, request, response):
+        return bool(settings.DATABASE_REPLICAS) and request.method not in SAFE_METHODS \
+            and response.status_code < 400
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.should_pin(request, response):
+            pin(request.user)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.should_pin(request, response):
+            # request.user may still be the lazy session user.
+            await sync_to_async(lambda: pin(request.user))()
+        return response
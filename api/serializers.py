@@ -1,9 +1,94 @@
+from django.core.files.storage import default_storage
 from rest_framework import serializers
-from core.models import CustomUser, Company, Question, Application, Interview, Offer, Resume
+from core.funnel import FUNNEL_FIELDS
+from core.models import CustomUser, Company, Question, Application, Interview, Offer, Resume, CompanyFunnel
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field that resolves against objects loaded up front.
+
+    Bulk views put ``{Model: {pk: obj}}`` in the context under ``prefetched``
+    so validating many items doesn't run one query per foreign key.
+
+    Models in ``owned_models`` only resolve to the requesting user's rows,
+    unless the user is staff. Companies are shared, so any can be referenced.
+    """
+    owned_models = {Application: 'user_id'}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        owner_field = self.owned_models.get(queryset.model)
+        request = self.context.get('request')
+        if owner_field is None or request is None or request.user.is_staff:
+            return queryset
+        return queryset.filter(**{owner_field: request.user})
+
+    def to_internal_value(self, data):
+        queryset = self.get_queryset()
+        prefetched = self.context.get('prefetched', {}).get(queryset.model)
+        if prefetched is None:
+            return super().to_internal_value(data)
+        try:
+            return prefetched[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class ExpandableSerializerMixin:
+    """Inline related objects requested through the ``expand`` context.
+
+    ``expandable_fields`` maps an expand name to a serializer class and the
+    keyword arguments used to build it. The view is expected to have loaded
+    the relation with select_related/prefetch_related already.
+    """
+    expandable_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.context.get('expand', ()):
+            serializer_class, kwargs = self.expandable_fields[name]
+            fields[name] = serializer_class(read_only=True, **kwargs)
+        return fields
+
+
+class SparseFieldsetSerializerMixin:
+    """Render only the fields named by the ``fields`` and ``omit`` arguments.
+
+    api.views.SparseFieldsMixin passes them from ``?fields=`` and
+    ``?omit=``. Nested and expanded serializers are rendered in full.
+    """
+
+    def __init__(self, *args, fields=None, omit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fields = fields
+        self.sparse_omit = omit
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in list(fields):
+            if self.sparse_fields is not None and name not in self.sparse_fields:
+                del fields[name]
+            elif self.sparse_omit is not None and name in self.sparse_omit:
+                del fields[name]
+        return fields
+
+
+class RenditionsField(serializers.ReadOnlyField):
+    """Turn a ``{name: storage path}`` renditions dict into URLs."""
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        urls = {}
+        for name, path in (value or {}).items():
+            url = default_storage.url(path)
+            urls[name] = request.build_absolute_uri(url) if request is not None else url
+        return urls
+
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     default_error_messages = {
         'no_active_account': ('No account exists with these credentials, check password and email')
@@ -36,30 +121,35 @@ class CustomUserSerializer(serializers.ModelSerializer):
         model = CustomUser
         fields = ('username', 'email', 'id', 'is_staff', 'password', 'access', 'refresh',)
     
+    def get_token(self, user):
+        # Mint one token pair per user and share it between both fields.
+        token = getattr(user, '_refresh_token', None)
+        if token is None:
+            token = user._refresh_token = RefreshToken.for_user(user)
+        return token
+
     def get_refresh(self, user):
-        refresh = RefreshToken.for_user(user)
-        return str(refresh)
+        return str(self.get_token(user))
 
     def get_access(self, user):
-        refresh = RefreshToken.for_user(user)
-        access = str(refresh.access_token),
-        return access
+        return str(self.get_token(user).access_token)
 
     def create(self, validated_data):
-        user = super(CustomUserSerializer, self).create(validated_data)
-        user.set_password(validated_data['password'])
-        user.save()
-        return user
+        # create_user hashes the password before the one and only INSERT.
+        return CustomUser.objects.create_user(**validated_data)
 
 
-class ListCustomUserSerializer(serializers.ModelSerializer):
-    
+class ListCustomUserSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    profile_image_renditions = RenditionsField()
+
     class Meta:
         model = CustomUser
-        fields = ('id', 'username', 'email', 'firstName', 'lastName', 'is_staff',)
+        fields = ('id', 'username', 'email', 'firstName', 'lastName', 'is_staff', 'profile_image',
+                  'profile_image_width', 'profile_image_height', 'profile_image_renditions',)
+        read_only_fields = ('profile_image',)
 
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Company
@@ -67,30 +157,50 @@ class CompanySerializer(serializers.ModelSerializer):
         read_only_fields = ['user_id']
 
 
-class QuestionSerializer(serializers.ModelSerializer):
+class QuestionSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
 
     class Meta:
         model = Question
-        fields = '__all__'
+        exclude = ('search_vector',)
         read_only_fields = ['user_id',]
 
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class InterviewSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
 
     class Meta:
-        model = Application
-        fields = '__all__'
-        read_only_fields = ['user_id',]
+        model = Interview
+        exclude = ('search_vector',)
 
 
-class InterviewSerializer(serializers.ModelSerializer):
+class CalendarInterviewSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    """Interview with its company, for the upcoming interviews calendar."""
+    company_id = serializers.ReadOnlyField(source='application_id.company_id_id')
+    company = serializers.ReadOnlyField(source='application_id.company_id.name')
 
     class Meta:
         model = Interview
-        fields = '__all__'
+        fields = ('id', 'application_id', 'company_id', 'company', 'round', 'result', 'scheduled_at', 'notes')
+
+
+class ApplicationSerializer(SparseFieldsetSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+    expandable_fields = {
+        'company': (CompanySerializer, {'source': 'company_id'}),
+        'interviews': (InterviewSerializer, {'source': 'interview_set', 'many': True}),
+    }
+
+    class Meta:
+        model = Application
+        exclude = ('search_vector',)
+        read_only_fields = ['user_id',]
 
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(SparseFieldsetSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'company': (CompanySerializer, {'source': 'company_id'}),
+    }
 
     class Meta:
         model = Offer
@@ -98,9 +208,20 @@ class OfferSerializer(serializers.ModelSerializer):
         read_only_fields = ['user_id',]
 
 
-class ResumeSerializer(serializers.ModelSerializer):
+class ResumeSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    renditions = RenditionsField()
 
     class Meta:
         model = Resume
         fields = '__all__'
         read_only_fields = ['user_id',]
+
+
+class CompanyFunnelSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    company_name = serializers.CharField(source='company_id.name', read_only=True)
+
+    class Meta:
+        model = CompanyFunnel
+        fields = ('company_id', 'company_name') + FUNNEL_FIELDS + ('updated_at',)
+        read_only_fields = fields
+
@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.models import CustomUser, Company, Question, Application, Interview, Offer, Resume, CompanyFunnel
+from .cache import invalidate
+from .conditional import record_deletion
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_company_cache(sender, **kwargs):
+    # After the commit, so a request in between can't cache the old rows again.
+    transaction.on_commit(lambda: invalidate('company'))
+
+
+def invalidate_list_etags(sender, **kwargs):
+    record_deletion(sender)
+
+
+# Models served by ConditionalGetMixin lists.
+for model in (CustomUser, Company, Question, Application, Interview, Offer, Resume, CompanyFunnel):
+    post_delete.connect(invalidate_list_etags, sender=model)
@@ -4,17 +4,19 @@ Tests for application APIs.
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from core.models import (
-    Company, Application
+    Company, Application, Interview
 )
 
 from api.serializers import (
     ApplicationSerializer
 )
+from api.tests.utils import QueryBudgetMixin
 
 
 APPLICATIONS_URL = reverse('api:list-create-application')
@@ -59,7 +61,7 @@ class PublicApplicationAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateApplicationApiTests(TestCase):
+class PrivateApplicationApiTests(QueryBudgetMixin, TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
@@ -98,6 +100,41 @@ class PrivateApplicationApiTests(TestCase):
         # self.assertEqual(res.data, serializer.data)
 
 
+    def test_application_list_limited_to_user(self):
+        """Test list of applications is limited to authenticated user."""
+        other_user = create_user(email='other@example.com', password='test123')
+        sample_company = create_company(user_id=self.user, name='Samsung')
+        create_application(user_id=other_user, company_id=sample_company, notes='Other Note')
+        application = create_application(user_id=self.user, company_id=sample_company, notes='My Note')
+
+        res = self.client.get(APPLICATIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in res.data['results']], [application.id])
+
+
+    def test_staff_list_all_applications(self):
+        """Test staff can list every user's applications."""
+        other_user = create_user(email='other@example.com', password='test123')
+        sample_company = create_company(user_id=self.user, name='Samsung')
+        create_application(user_id=other_user, company_id=sample_company, notes='Other Note')
+        create_application(user_id=self.user, company_id=sample_company, notes='My Note')
+        self.user.is_staff = True
+        self.user.save()
+
+        res = self.client.get(APPLICATIONS_URL, {'scope': 'all'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+
+
+    def test_non_staff_list_all_forbidden(self):
+        """Test non staff users cannot list every user's applications."""
+        res = self.client.get(APPLICATIONS_URL, {'scope': 'all'})
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
     def test_get_application_detail(self):
         """Test get application detail."""
         company = create_company(user_id=self.user)
@@ -111,6 +148,40 @@ class PrivateApplicationApiTests(TestCase):
         self.assertEqual(res.data, serializer.data)
     
 
+    def test_get_application_detail_expanded(self):
+        """Test company and interviews are inlined with ?expand=."""
+        company = create_company(user_id=self.user, name='Samsung')
+        application = create_application(user_id=self.user, company_id=company, notes='One Note')
+        interview = Interview.objects.create(application_id=application, notes='Round one', scheduled_at=timezone.now())
+
+        res = self.client.get(detail_url(application.id), {'expand': 'company,interviews'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['company']['name'], 'Samsung')
+        self.assertEqual([item['id'] for item in res.data['interviews']], [interview.id])
+
+
+    def test_list_applications_expanded_query_count(self):
+        """Test expanding a list runs a fixed number of queries."""
+        for name in ['Samsung', 'Nokia', 'Apple']:
+            company = create_company(user_id=self.user, name=name)
+            application = create_application(user_id=self.user, company_id=company, notes='Note')
+            Interview.objects.create(application_id=application, notes='Round one', scheduled_at=timezone.now())
+
+        with self.assertNumQueries(2):
+            res = self.client.get(APPLICATIONS_URL, {'expand': 'company,interviews'})
+
+        self.assertEqual(len(res.data['results']), 3)
+        self.assertTrue(all(len(item['interviews']) == 1 for item in res.data['results']))
+
+
+    def test_expand_unknown_relation(self):
+        """Test expanding an unknown relation returns an error."""
+        res = self.client.get(APPLICATIONS_URL, {'expand': 'offers'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
     def test_partial_application_update(self):
         """Test partial update of an application."""
         company = create_company(
@@ -151,4 +222,25 @@ class PrivateApplicationApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Application.objects.filter(id=application.id).exists())
-   
\ No newline at end of file
+
+
+    def test_list_query_budget(self):
+        """Test listing applications with expands runs a fixed number of queries."""
+        company = create_company(user_id=self.user)
+        for i in range(5):
+            create_application(user_id=self.user, company_id=company, notes='Note %d' % i)
+
+        with self.assertMaxQueries(2):
+            res = self.client.get(APPLICATIONS_URL, {'expand': 'company,interviews'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 5)
+
+    def test_create_query_budget(self):
+        """Test creating an application stays within its query budget."""
+        company = create_company(user_id=self.user)
+
+        with self.assertMaxQueries(6):
+            res = self.client.post(APPLICATIONS_URL, {'notes': 'Notes', 'company_id': company.id})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
@@ -0,0 +1,138 @@
+"""
+Tests for the async read views served under ASGI.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from django.urls import resolve
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Company, Question, Application, Interview
+
+
+QUESTIONS_URL = '/api/question'
+APPLICATIONS_URL = '/api/application'
+COMPANIES_URL = '/api/company'
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+def auth_header(user):
+    # AsyncClient in Django 4.1 takes raw header names.
+    return {'authorization': 'Bearer %s' % RefreshToken.for_user(user).access_token}
+
+
+class AsyncRoutingTests(TestCase):
+    """Test ASGI requests are routed to the async views."""
+
+    def test_asgi_urlconf_routes(self):
+        """Test read routes resolve to coroutines, other routes fall through."""
+        urlconf = 'placement_management.asgi_urls'
+
+        self.assertTrue(asyncio.iscoroutinefunction(resolve(QUESTIONS_URL, urlconf).func))
+        self.assertTrue(asyncio.iscoroutinefunction(resolve('/api/offer/1', urlconf).func))
+        self.assertFalse(asyncio.iscoroutinefunction(resolve('/api/question/bulk', urlconf).func))
+        self.assertFalse(asyncio.iscoroutinefunction(resolve(QUESTIONS_URL).func))
+
+
+class AsyncReadApiTests(TestCase):
+    """Test the async list and detail views."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.other = create_user(email='other@example.com', password='test123')
+        self.company = Company.objects.create(user_id=self.user, name='Samsung')
+        for index in range(3):
+            Question.objects.create(user_id=self.user, company_id=self.company, content='Question %d' % index)
+        Question.objects.create(user_id=self.other, company_id=self.company, content='Not mine')
+        self.application = Application.objects.create(user_id=self.user, company_id=self.company)
+        Interview.objects.create(application_id=self.application, round='HR', scheduled_at=timezone.now())
+        self.client = AsyncClient()
+        self.headers = auth_header(self.user)
+        self.sync_client = APIClient()
+        self.sync_client.force_authenticate(self.user)
+
+    async def test_auth_required(self):
+        """Test auth is required to call API."""
+        res = await self.client.get(QUESTIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('Bearer', res['WWW-Authenticate'])
+
+    async def test_invalid_token(self):
+        """Test an invalid token is rejected."""
+        res = await self.client.get(QUESTIONS_URL, authorization='Bearer nope')
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_list_matches_sync_view(self):
+        """Test the async list returns what the sync view does."""
+        res = await self.client.get(QUESTIONS_URL, {'page_size': 2}, **self.headers)
+        expected = await sync_to_async(self.sync_client.get)(QUESTIONS_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        # Rendered on the event loop rather than returned as a DRF Response.
+        self.assertNotIsInstance(res, Response)
+        self.assertIsInstance(expected, Response)
+        self.assertEqual(res.json(), expected.json())
+        self.assertEqual(len(res.json()['results']), 2)
+
+        res = await self.client.get(res.json()['next'], **self.headers)
+        self.assertEqual([q['content'] for q in res.json()['results']], ['Question 0'])
+        self.assertIsNotNone(res.json()['previous'])
+
+    async def test_list_scope_and_expand(self):
+        """Test owner scoping and prefetched expands work on the async path."""
+        res = await self.client.get(QUESTIONS_URL, {'scope': 'all'}, **self.headers)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        res = await self.client.get(APPLICATIONS_URL, {'expand': 'company,interviews'}, **self.headers)
+        result = res.json()['results'][0]
+        self.assertEqual(result['company']['name'], 'Samsung')
+        self.assertEqual(result['interviews'][0]['round'], 'HR')
+
+    async def test_retrieve(self):
+        """Test detail GETs, 404s and conditional requests."""
+        question = await Question.objects.filter(user_id=self.user).afirst()
+        url = '%s/%d' % (QUESTIONS_URL, question.id)
+
+        res = await self.client.get(url, **self.headers)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['content'], question.content)
+
+        res = await self.client.get(url, **{'if-none-match': res['ETag']}, **self.headers)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        res = await self.client.get('%s/%d' % (QUESTIONS_URL, 999999), **self.headers)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_cached_company_list(self):
+        """Test the company cache is used by the async views."""
+        res = await self.client.get(COMPANIES_URL, **self.headers)
+        self.assertEqual(res['X-Cache'], 'MISS')
+
+        res = await self.client.get(COMPANIES_URL, **self.headers)
+        self.assertEqual(res['X-Cache'], 'HIT')
+        self.assertEqual(res.json()['results'][0]['name'], 'Samsung')
+
+    async def test_writes_use_sync_view(self):
+        """Test non-GET methods on an async route still work."""
+        res = await self.client.post(
+            QUESTIONS_URL, {'company_id': self.company.id, 'content': 'New'},
+            content_type='application/json', **self.headers,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(await Question.objects.filter(content='New', user_id=self.user).aexists())
@@ -0,0 +1,119 @@
+"""
+Tests for token authentication with cached users.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import SystemCheckError
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+QUESTIONS_URL = reverse('api:list-create-question')
+CACHE_STATS_URL = reverse('api:cache-stats')
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+def user_queries(ctx):
+    table = get_user_model()._meta.db_table
+    return [query['sql'] for query in ctx.captured_queries if table in query['sql']]
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """Test JWT requests skip the user query once the user is cached."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer %s' % self.token)
+
+    def test_user_loaded_once(self):
+        """Test only the first request queries the user table."""
+        with CaptureQueriesContext(connection) as first:
+            res = self.client.get(QUESTIONS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(user_queries(first)), 1)
+
+        with CaptureQueriesContext(connection) as second:
+            res = self.client.get(QUESTIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries(second), [])
+        self.assertEqual(len(second), len(first) - 1)
+
+    def test_deactivated_user_rejected(self):
+        """Test deactivating a user invalidates the cached row."""
+        self.client.get(QUESTIONS_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(QUESTIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_rejected(self):
+        """Test deleting a user invalidates the cached row."""
+        self.client.get(QUESTIONS_URL)
+
+        self.user.delete()
+        res = self.client.get(QUESTIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_changes_visible(self):
+        """Test changes to the user show on the next request."""
+        res = self.client.get(CACHE_STATS_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    async def test_async_views_use_cache(self):
+        """Test the async views share the cached user."""
+        client = AsyncClient()
+        authorization = {'authorization': 'Bearer %s' % self.token}
+        await client.get('/api/question', **authorization)
+
+        self.user.is_active = False
+        await sync_to_async(self.user.save)()
+        res = await client.get('/api/question', **authorization)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class SharedCacheCheckTests(TestCase):
+    """Test the deployment check for a per-process user cache."""
+
+    def test_locmem_cache_warns(self):
+        """Test check --deploy warns about LocMemCache with the user cache enabled."""
+        with self.assertRaisesMessage(SystemCheckError, 'core.W001'):
+            call_command('check', '--deploy', '--tag', 'caches', '--fail-level', 'WARNING')
+
+    @override_settings(USER_CACHE_SECONDS=0)
+    def test_disabled_user_cache_passes(self):
+        """Test no warning when the user cache is disabled."""
+        call_command('check', '--deploy', '--tag', 'caches', '--fail-level', 'WARNING')
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379',
+    }})
+    def test_shared_cache_passes(self):
+        """Test no warning with a cache shared between processes."""
+        call_command('check', '--deploy', '--tag', 'caches', '--fail-level', 'WARNING')
@@ -0,0 +1,171 @@
+"""
+Tests for bulk create, update and delete APIs.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Company, Application, Interview
+)
+
+
+APPLICATIONS_BULK_URL = reverse('api:bulk-application')
+INTERVIEWS_BULK_URL = reverse('api:bulk-interview')
+QUESTIONS_BULK_URL = reverse('api:bulk-question')
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class PublicBulkAPITests(TestCase):
+    """Test unauthenticated API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        """Test auth is required to call API."""
+        res = self.client.post(APPLICATIONS_BULK_URL, [], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateBulkApiTests(TestCase):
+    """Test authenticated API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+        self.samsung = Company.objects.create(user_id=self.user, name='Samsung')
+        self.nokia = Company.objects.create(user_id=self.user, name='Nokia')
+
+    def test_bulk_create_applications(self):
+        """Test creating many applications in one request."""
+        payload = [
+            {'company_id': self.samsung.id, 'notes': 'Note One', 'source': 'Campus'},
+            {'company_id': self.nokia.id, 'notes': 'Note Two'},
+        ]
+        res = self.client.post(APPLICATIONS_BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 2)
+        applications = Application.objects.filter(user_id=self.user).order_by('id')
+        self.assertEqual([a.company_id for a in applications], [self.samsung, self.nokia])
+
+    def test_bulk_create_query_count_is_constant(self):
+        """Test the number of queries doesn't grow with the batch size."""
+        def run(size):
+            payload = [
+                {'company_id': company.id, 'notes': 'Note'}
+                for company in [self.samsung, self.nokia] * size
+            ]
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.post(APPLICATIONS_BULK_URL, payload, format='json')
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(run(1), run(10))
+
+    def test_bulk_create_reports_errors_per_item(self):
+        """Test invalid items are reported by position and nothing is saved."""
+        payload = [
+            {'company_id': self.samsung.id, 'notes': 'Valid'},
+            {'company_id': 999999, 'notes': 'Unknown company'},
+            {'company_id': self.nokia.id},
+        ]
+        res = self.client.post(APPLICATIONS_BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('company_id', res.data[1])
+        self.assertIn('notes', res.data[2])
+        self.assertFalse(Application.objects.exists())
+
+    def test_bulk_create_requires_list(self):
+        """Test a non list body is rejected."""
+        res = self.client.post(QUESTIONS_BULK_URL, {'content': 'Question'}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update_interviews(self):
+        """Test updating results of many interviews in one request."""
+        application = Application.objects.create(user_id=self.user, company_id=self.samsung, notes='Note')
+        first = Interview.objects.create(application_id=application, notes='One', scheduled_at=timezone.now())
+        second = Interview.objects.create(application_id=application, notes='Two', scheduled_at=timezone.now())
+
+        payload = [
+            {'id': first.id, 'result': 'Passed'},
+            {'id': second.id, 'result': 'Failed', 'round': 'Final'},
+        ]
+        res = self.client.patch(INTERVIEWS_BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.result, 'Passed')
+        self.assertEqual(second.result, 'Failed')
+        self.assertEqual(second.round, 'Final')
+
+    def test_bulk_update_other_users_rows_not_found(self):
+        """Test rows owned by another user can't be updated."""
+        other_user = create_user(email='other@example.com', password='test123')
+        application = Application.objects.create(user_id=other_user, company_id=self.samsung, notes='Note')
+
+        res = self.client.patch(APPLICATIONS_BULK_URL, [{'id': application.id, 'notes': 'Mine'}], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {'id': ['Not found.']})
+        application.refresh_from_db()
+        self.assertEqual(application.notes, 'Note')
+
+    def test_bulk_other_users_application_not_found(self):
+        """Test interviews can't be created on or moved to another user's application."""
+        other_user = create_user(email='other@example.com', password='test123')
+        theirs = Application.objects.create(user_id=other_user, company_id=self.samsung, notes='Theirs')
+        mine = Application.objects.create(user_id=self.user, company_id=self.samsung, notes='Mine')
+        interview = Interview.objects.create(application_id=mine, notes='One', scheduled_at=timezone.now())
+
+        res = self.client.post(INTERVIEWS_BULK_URL, [
+            {'application_id': theirs.id, 'notes': 'Round one', 'scheduled_at': timezone.now()},
+        ], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('application_id', res.data[0])
+        self.assertFalse(Interview.objects.filter(application_id=theirs).exists())
+
+        res = self.client.patch(INTERVIEWS_BULK_URL, [{'id': interview.id, 'application_id': theirs.id}], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('application_id', res.data[0])
+        interview.refresh_from_db()
+        self.assertEqual(interview.application_id, mine)
+
+    def test_bulk_delete_applications(self):
+        """Test deleting many applications in one request."""
+        first = Application.objects.create(user_id=self.user, company_id=self.samsung, notes='One')
+        second = Application.objects.create(user_id=self.user, company_id=self.nokia, notes='Two')
+
+        res = self.client.delete(APPLICATIONS_BULK_URL, [first.id, second.id], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Application.objects.exists())
+
+    def test_bulk_delete_unknown_id(self):
+        """Test deleting with an unknown id deletes nothing."""
+        application = Application.objects.create(user_id=self.user, company_id=self.samsung, notes='One')
+
+        res = self.client.delete(APPLICATIONS_BULK_URL, [application.id, 999999], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[1], {'id': ['Not found.']})
+        self.assertTrue(Application.objects.filter(id=application.id).exists())
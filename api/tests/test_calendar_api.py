@@ -0,0 +1,164 @@
+"""
+Tests for the interview calendar and iCalendar feed.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.tests.utils import QueryBudgetMixin
+from core.calendar import _fold, feed_token, upcoming_interviews
+from core.models import Company, Application, Interview
+
+
+CALENDAR_URL = reverse('api:calendar-interview')
+
+
+def feed_url(user):
+    return reverse('api:calendar-feed', args=[feed_token(user)])
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+def read_stream(res):
+    return b''.join(res.streaming_content).decode('utf-8')
+
+
+class PublicCalendarApiTests(TestCase):
+    """Test unauthenticated API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        """Test auth is required to call API."""
+        res = self.client.get(CALENDAR_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalid_feed_token(self):
+        """Test a feed token that doesn't match a user is a 404."""
+        user = create_user(email='user@example.com', password='test123')
+        token = feed_token(user)
+
+        for bad in (token[:-1] + ('0' if token[-1] != '0' else '1'), 'zz-abc', 'nothing'):
+            res = self.client.get(reverse('api:calendar-feed', args=[bad]))
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PrivateCalendarApiTests(QueryBudgetMixin, TestCase):
+    """Test authenticated API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.other = create_user(email='other@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+        self.now = timezone.now()
+        samsung = Company.objects.create(user_id=self.user, name='Samsung')
+        self.application = Application.objects.create(user_id=self.user, company_id=samsung)
+        other_application = Application.objects.create(user_id=self.other, company_id=samsung)
+        self.soon = Interview.objects.create(
+            application_id=self.application, notes='Bring ID', round='HR', scheduled_at=self.now + timedelta(days=2),
+        )
+        self.later = Interview.objects.create(
+            application_id=self.application, notes='Later', scheduled_at=self.now + timedelta(days=20),
+        )
+        self.past = Interview.objects.create(
+            application_id=self.application, notes='Past', result='Passed', scheduled_at=self.now - timedelta(days=3),
+        )
+        Interview.objects.create(application_id=other_application, notes='Theirs', scheduled_at=self.now + timedelta(days=1))
+
+    def test_upcoming_interviews(self):
+        """Test the calendar lists the user's interviews of the next 14 days."""
+        with self.assertMaxQueries(2):
+            res = self.client.get(CALENDAR_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in res.data['results']], [self.soon.id])
+        self.assertEqual(res.data['results'][0]['company'], 'Samsung')
+        self.assertTrue(res.data['feed_url'].endswith(feed_url(self.user)))
+
+    def test_days_param(self):
+        """Test ?days= widens the window and is validated."""
+        res = self.client.get(CALENDAR_URL, {'days': 30})
+        self.assertEqual([item['id'] for item in res.data['results']], [self.soon.id, self.later.id])
+
+        for days in ('0', '1000', 'x'):
+            res = self.client.get(CALENDAR_URL, {'days': days})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_feed(self):
+        """Test the feed streams the user's recent and upcoming interviews."""
+        client = APIClient()
+
+        res = client.get(feed_url(self.user), HTTP_ACCEPT='text/calendar')
+        body = read_stream(res)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertEqual(body.count('BEGIN:VEVENT'), 3)
+        self.assertIn('UID:interview-%d@testserver\r\n' % self.soon.id, body)
+        self.assertIn('SUMMARY:HR - Samsung\r\n', body)
+        self.assertIn('DESCRIPTION:Result: Passed\\n\\nPast\r\n', body)
+        self.assertNotIn('Theirs', body)
+
+    def test_feed_etag(self):
+        """Test an unchanged feed is a 304, and changes give a new ETag."""
+        client = APIClient()
+        url = feed_url(self.user)
+        etag = client.get(url)['ETag']
+
+        with self.assertMaxQueries(2):
+            res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.later.delete()
+        res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_feed_token_revoked_by_password_change(self):
+        """Test changing the password invalidates the old feed URL."""
+        url = feed_url(self.user)
+        self.user.set_password('changed123')
+        self.user.save()
+
+        res = APIClient().get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CalendarHelperTests(TestCase):
+    """Test the calendar query and iCalendar formatting."""
+
+    def test_fold_long_lines(self):
+        """Test lines are folded at 75 octets without splitting characters."""
+        line = 'DESCRIPTION:' + 'é' * 100
+        folded = _fold(line)
+
+        parts = folded[:-2].split('\r\n ')
+        self.assertTrue(all(len(part.encode('utf-8')) <= 75 for part in parts))
+        self.assertEqual(''.join(parts), line)
+
+    def test_upcoming_uses_index(self):
+        """Test the range query reads interviews through their application index."""
+        user = create_user(email='user@example.com', password='test123')
+        if connection.vendor == 'postgresql':
+            # Tiny test tables are cheaper to scan, see test_filters.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        now = timezone.now()
+        plan = upcoming_interviews(user, now, now + timedelta(days=14)).explain()
+
+        self.assertIn('interview_app_scheduled_idx', plan)
@@ -2,6 +2,7 @@
 Tests for company APIs.
 """
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 
@@ -15,9 +16,11 @@ from core.models import (
 from api.serializers import (
     CompanySerializer,
 )
+from api.tests.utils import QueryBudgetMixin
 
 
 COMPANIES_URL = reverse('api:list-create-company')
+CACHE_STATS_URL = reverse('api:cache-stats')
 
 
 def detail_url(pk):
@@ -54,13 +57,14 @@ class PublicCompanyAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateCompanyApiTests(TestCase):
+class PrivateCompanyApiTests(QueryBudgetMixin, TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
         self.client = APIClient()
         self.user = create_user(email='user@example.com', password='test123')
         self.client.force_authenticate(self.user)
+        cache.clear()
 
     def test_retrieve_companies(self):
         """Test retrieving a list of companies."""
@@ -130,4 +134,89 @@ class PrivateCompanyApiTests(TestCase):
         self.assertFalse(Company.objects.filter(id=company.id).exists())
 
 
-   
\ No newline at end of file
+    def test_company_list_cached(self):
+        """Test the second identical list request is served from cache."""
+        create_company(user_id=self.user, name='Samsung')
+
+        res = self.client.get(COMPANIES_URL)
+        self.assertEqual(res['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            res = self.client.get(COMPANIES_URL)
+        self.assertEqual(res['X-Cache'], 'HIT')
+        self.assertEqual(res.data['results'][0]['name'], 'Samsung')
+
+
+    def test_company_cache_invalidated_on_change(self):
+        """Test saving or deleting a company invalidates cached responses."""
+        company = create_company(user_id=self.user, name='Samsung')
+        self.client.get(detail_url(company.id))
+        self.client.get(COMPANIES_URL)
+
+        company.name = 'Nokia'
+        with self.captureOnCommitCallbacks(execute=True):
+            company.save()
+        res = self.client.get(detail_url(company.id))
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['name'], 'Nokia')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            company.delete()
+        res = self.client.get(COMPANIES_URL)
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'], [])
+
+
+    def test_company_cache_invalidated_after_commit(self):
+        """Test cached responses are only dropped once the change commits."""
+        company = create_company(user_id=self.user, name='Samsung')
+        self.client.get(COMPANIES_URL)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            company.name = 'Nokia'
+            company.save()
+            res = self.client.get(COMPANIES_URL)
+            self.assertEqual(res['X-Cache'], 'HIT')
+
+        for callback in callbacks:
+            callback()
+        res = self.client.get(COMPANIES_URL)
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'][0]['name'], 'Nokia')
+
+
+    def test_cache_stats(self):
+        """Test staff can read hit and miss counters."""
+        self.user.is_staff = True
+        self.user.save()
+        create_company(user_id=self.user)
+        self.client.get(COMPANIES_URL)
+        self.client.get(COMPANIES_URL)
+
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['company'], {'hits': 1, 'misses': 1})
+
+
+    def test_company_cache_hit_not_modified(self):
+        """Test a cached company list still answers conditional requests."""
+        create_company(user_id=self.user, name='Samsung')
+        res = self.client.get(COMPANIES_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(COMPANIES_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['X-Cache'], 'HIT')
+
+
+    def test_list_query_budget(self):
+        """Test listing companies runs a fixed number of queries."""
+        for i in range(5):
+            create_company(user_id=self.user, name='Company %d' % i)
+
+        with self.assertMaxQueries(2):
+            res = self.client.get(COMPANIES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -0,0 +1,128 @@
+"""
+Tests for the compiled list serializers.
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api import compiled
+from api.serializers import ApplicationSerializer, InterviewSerializer, ResumeSerializer
+from core.models import Company, Application, Interview, Offer, Question
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class CompiledSerializerTests(TestCase):
+    """Test which serializers compile."""
+
+    def test_plain_model_serializers_compile(self):
+        """Test serializers of plain model fields compile, others don't."""
+        self.assertIsNotNone(compiled.compile_serializer(InterviewSerializer(context={})))
+        self.assertIsNotNone(compiled.compile_serializer(ApplicationSerializer(context={})))
+        self.assertIsNone(compiled.compile_serializer(ApplicationSerializer(context={'expand': ('company',)})))
+        self.assertIsNone(compiled.compile_serializer(ResumeSerializer(context={})))
+
+    def test_same_output_as_serializer(self):
+        """Test a compiled row matches the serializer's representation."""
+        user = create_user(email='user@example.com', password='test123')
+        company = Company.objects.create(user_id=user, name='Samsung')
+        application = Application.objects.create(user_id=user, company_id=company, notes='Notes')
+        interview = Interview.objects.create(
+            application_id=application, notes='Notes', result=None, scheduled_at=timezone.now(),
+        )
+
+        serializer = InterviewSerializer(context={})
+        rows = Interview.objects.values(*compiled.compile_serializer(serializer).columns)
+
+        self.assertEqual(
+            compiled.compile_serializer(serializer).dump(rows),
+            [dict(InterviewSerializer(interview).data)],
+        )
+
+
+class CompiledListApiTests(TestCase):
+    """Test list endpoints return the same bytes with compiled serializers."""
+
+    def setUp(self):
+        self.user = create_user(email='user@example.com', password='test123', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        now = timezone.now()
+        companies = [Company.objects.create(user_id=self.user, name='Company %d' % i) for i in range(3)]
+        for i, company in enumerate(companies):
+            Question.objects.create(user_id=self.user, company_id=company, content='Question, "quoted" é')
+            application = Application.objects.create(
+                user_id=self.user, company_id=company, notes='Notes %d' % i, source='Referral' if i else None,
+            )
+            for j in range(2):
+                Interview.objects.create(
+                    application_id=application, notes='Round %d' % j, round='Technical',
+                    result='Passed' if j else None, scheduled_at=now + timedelta(days=i, hours=j),
+                )
+            Offer.objects.create(
+                user_id=self.user, company_id=company, ctc='%d LPA' % i, received_at=now, is_accepted=bool(i),
+            )
+
+    def get_both(self, url, params=None):
+        # Cleared so the company list isn't answered from the response cache.
+        cache.clear()
+        with override_settings(API_COMPILED_SERIALIZERS=False):
+            expected = self.client.get(url, params)
+        cache.clear()
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return expected, res
+
+    def test_lists_byte_identical(self):
+        """Test every compiled list renders exactly like its serializer."""
+        names = ['company', 'question', 'application', 'interview', 'offer']
+        urls = [reverse('api:list-create-%s' % name) for name in names] + [reverse('api:list-funnel')]
+        for url in urls:
+            with self.subTest(url=url):
+                expected, res = self.get_both(url)
+                self.assertEqual(res.content, expected.content)
+
+    def test_pages_and_parameters(self):
+        """Test cursors, ordering and sparse fieldsets match too."""
+        url = reverse('api:list-create-interview')
+        for params in ({'page_size': 2}, {'ordering': 'scheduled_at', 'page_size': 4}, {'fields': 'id,result'}):
+            with self.subTest(params=params):
+                expected, res = self.get_both(url, params)
+                self.assertEqual(res.content, expected.content)
+                if res.data.get('next'):
+                    expected, res = self.get_both(res.data['next'])
+                    self.assertEqual(res.content, expected.content)
+
+    def test_no_instances_created(self):
+        """Test the compiled path reads rows without model instances."""
+        with mock.patch.object(Interview, '__init__', side_effect=AssertionError('instance created')):
+            res = self.client.get(reverse('api:list-create-interview'))
+
+        self.assertEqual(len(res.data['results']), 6)
+
+    def test_expand_falls_back(self):
+        """Test ?expand= is served by the regular serializer."""
+        expected, res = self.get_both(reverse('api:list-create-application'), {'expand': 'company,interviews'})
+
+        self.assertEqual(res.content, expected.content)
+        self.assertEqual(len(res.data['results'][0]['interviews']), 2)
+
+    async def test_async_list(self):
+        """Test the async list view serves compiled pages."""
+        token = RefreshToken.for_user(self.user).access_token
+        res = await AsyncClient().get('/api/application', authorization='Bearer %s' % token)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.json()['results']), 3)
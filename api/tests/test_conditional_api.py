@@ -0,0 +1,204 @@
+"""
+Tests for conditional GET (ETag / Last-Modified) on APIs.
+"""
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Max
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from api.views import (
+    ApplicationCreateListApiView, CompanyCreateListApiView, InterviewCreateListApiView, ListCustomUsersApiView,
+    OfferCreateListApiView, QuestionCreateListApiView, ResumeCreateListApiView,
+)
+from core.models import (
+    Company, Application, Interview
+)
+
+
+APPLICATIONS_URL = reverse('api:list-create-application')
+INTERVIEWS_URL = reverse('api:list-create-interview')
+
+
+def application_url(pk):
+    """Create and return an application detail URL."""
+    return reverse('api:crud-application', args=[pk])
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class ConditionalGetApiTests(TestCase):
+    """Test conditional GET requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+        self.company = Company.objects.create(user_id=self.user, name='Samsung')
+        self.application = Application.objects.create(user_id=self.user, company_id=self.company, notes='Note')
+
+    def test_detail_not_modified(self):
+        """Test a matching ETag returns 304 with a single query."""
+        res = self.client.get(application_url(self.application.id))
+        etag = res['ETag']
+        self.assertTrue(res.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):
+            res = self.client.get(application_url(self.application.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+
+    def test_detail_modified_after_update(self):
+        """Test updating the row changes its ETag."""
+        res = self.client.get(application_url(self.application.id))
+        etag = res['ETag']
+
+        self.application.notes = 'Changed'
+        self.application.save()
+        res = self.client.get(application_url(self.application.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_if_modified_since(self):
+        """Test If-Modified-Since is honoured."""
+        future = http_date((timezone.now() + timedelta(minutes=1)).timestamp())
+        past = http_date((timezone.now() - timedelta(minutes=1)).timestamp())
+
+        res = self.client.get(application_url(self.application.id), HTTP_IF_MODIFIED_SINCE=future)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        res = self.client.get(application_url(self.application.id), HTTP_IF_MODIFIED_SINCE=past)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_not_modified_until_rows_change(self):
+        """Test list ETags change on insert and delete."""
+        interview = Interview.objects.create(application_id=self.application, notes='One', scheduled_at=timezone.now())
+        res = self.client.get(INTERVIEWS_URL)
+        etag = res['ETag']
+
+        res = self.client.get(INTERVIEWS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Interview.objects.create(application_id=self.application, notes='Two', scheduled_at=timezone.now())
+        res = self.client.get(INTERVIEWS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        etag = res['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            interview.delete()
+        res = self.client.get(INTERVIEWS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_not_modified_in_one_query(self):
+        """Test a list 304 reads the latest timestamp only, without counting rows."""
+        Interview.objects.create(application_id=self.application, notes='One', scheduled_at=timezone.now())
+        etag = self.client.get(INTERVIEWS_URL)['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(INTERVIEWS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('COUNT', queries[0]['sql'])
+
+    def test_filtered_list_changes_when_row_leaves_filter(self):
+        """Test editing a row out of a filtered list changes its ETag."""
+        interview = Interview.objects.create(
+            application_id=self.application, notes='One', result='Pending', scheduled_at=timezone.now(),
+        )
+        etag = self.client.get(INTERVIEWS_URL, {'result': 'Pending'})['ETag']
+
+        interview.result = 'Passed'
+        interview.save()
+        res = self.client.get(INTERVIEWS_URL, {'result': 'Pending'}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
+
+    def test_list_deletion_not_hidden_by_if_modified_since(self):
+        """Test lists send no Last-Modified, so a deletion can't be answered with 304."""
+        interview = Interview.objects.create(application_id=self.application, notes='One', scheduled_at=timezone.now())
+        res = self.client.get(INTERVIEWS_URL)
+        self.assertFalse(res.has_header('Last-Modified'))
+
+        interview.delete()
+        future = http_date((timezone.now() + timedelta(minutes=1)).timestamp())
+        res = self.client.get(INTERVIEWS_URL, HTTP_IF_MODIFIED_SINCE=future)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
+
+    def test_list_etag_differs_per_query(self):
+        """Test different query strings get different ETags."""
+        first = self.client.get(APPLICATIONS_URL)
+        second = self.client.get(APPLICATIONS_URL, {'page_size': 1})
+
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+    def test_company_timestamps(self):
+        """Test created_at is fixed and updated_at moves on save."""
+        created_at = self.company.created_at
+        updated_at = self.company.updated_at
+
+        self.company.name = 'Nokia'
+        self.company.save()
+        self.company.refresh_from_db()
+
+        self.assertEqual(self.company.created_at, created_at)
+        self.assertGreater(self.company.updated_at, updated_at)
+
+
+class ListSummaryIndexTests(TestCase):
+    """Test the list validators are read from an updated_at index."""
+
+    def setUp(self):
+        self.user = create_user(email='user@example.com', password='test123', is_staff=True)
+        if connection.vendor == 'postgresql':
+            # Tiny test tables are cheaper to scan, make the planner show
+            # which index it would use at scale.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def get_plan(self, view_class):
+        request = APIRequestFactory().get('/')
+        force_authenticate(request, self.user)
+        view = view_class()
+        view.setup(request)
+        view.request = view.initialize_request(request)
+        view.format_kwarg = None
+        view.initial(view.request)
+        with CaptureQueriesContext(connection) as queries:
+            view.get_list_summary_queryset().aggregate(last_modified=Max('updated_at'))
+        with connection.cursor() as cursor:
+            cursor.execute('%s %s' % (connection.ops.explain_query_prefix(), queries[-1]['sql']))
+            return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+    def test_summaries_use_indexes(self):
+        """Test the max updated_at of each list is read from its index."""
+        cases = [
+            (ListCustomUsersApiView, 'user_updated_idx'),
+            (CompanyCreateListApiView, 'company_updated_idx'),
+            (QuestionCreateListApiView, 'question_user_updated_idx'),
+            (ApplicationCreateListApiView, 'application_user_updated_idx'),
+            (InterviewCreateListApiView, 'interview_updated_idx'),
+            (OfferCreateListApiView, 'offer_user_updated_idx'),
+            (ResumeCreateListApiView, 'resume_user_updated_idx'),
+        ]
+        for view_class, index in cases:
+            with self.subTest(view=view_class.__name__):
+                plan = self.get_plan(view_class)
+                self.assertIn(index, plan, 'Expected %s in the plan:\n%s' % (index, plan))
+                # An index seek, not a scan of every row (SQLite's wording).
+                self.assertNotIn('SCAN', plan)
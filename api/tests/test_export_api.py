@@ -0,0 +1,149 @@
+"""
+Tests for the streaming export APIs.
+"""
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Company, Application, Interview, Offer
+
+
+def export_url(kind, fmt):
+    return reverse('api:export-%s' % kind, args=[fmt])
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+def read_stream(res):
+    return b''.join(res.streaming_content).decode('utf-8')
+
+
+class PublicExportApiTests(TestCase):
+    """Test unauthenticated API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        """Test auth is required to call API."""
+        res = self.client.get(export_url('application', 'csv'))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateExportApiTests(TestCase):
+    """Test authenticated API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.other = create_user(email='other@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+        self.samsung = Company.objects.create(user_id=self.user, name='Samsung')
+        self.nokia = Company.objects.create(user_id=self.user, name='Nokia')
+        self.application = Application.objects.create(user_id=self.user, company_id=self.samsung, notes='a, "quoted" note')
+        Application.objects.create(user_id=self.user, company_id=self.nokia)
+        Application.objects.create(user_id=self.other, company_id=self.nokia)
+
+    def test_export_applications_csv(self):
+        """Test applications stream as CSV with joined columns."""
+        res = self.client.get(export_url('application', 'csv'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        self.assertIn('attachment; filename="applications.csv"', res['Content-Disposition'])
+        rows = list(csv.DictReader(StringIO(read_stream(res))))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['id'], str(self.application.id))
+        self.assertEqual(rows[0]['company'], 'Samsung')
+        self.assertEqual(rows[0]['user_email'], 'user@example.com')
+        self.assertEqual(rows[0]['notes'], 'a, "quoted" note')
+
+    def test_export_csv_escapes_formulas(self):
+        """Test CSV cells that spreadsheets would run as formulas are escaped."""
+        self.application.notes = '=HYPERLINK("http://example.com")'
+        self.application.save()
+        Company.objects.filter(pk=self.samsung.pk).update(name='@SUM(1+1)')
+
+        rows = list(csv.DictReader(StringIO(read_stream(self.client.get(export_url('application', 'csv'))))))
+        self.assertEqual(rows[0]['notes'], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(rows[0]['company'], "'@SUM(1+1)")
+
+        res = self.client.get(export_url('application', 'ndjson'))
+        first = json.loads(read_stream(res).splitlines()[0])
+        self.assertEqual(first['notes'], '=HYPERLINK("http://example.com")')
+
+    def test_export_applications_ndjson(self):
+        """Test applications stream as one JSON object per line."""
+        res = self.client.get(export_url('application', 'ndjson'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in read_stream(res).splitlines()]
+        self.assertEqual([row['company'] for row in rows], ['Samsung', 'Nokia'])
+
+    def test_export_filter_company(self):
+        """Test filtering the export by company."""
+        res = self.client.get(export_url('application', 'ndjson'), {'company_id': self.nokia.id})
+
+        rows = [json.loads(line) for line in read_stream(res).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['company_id'], self.nokia.id)
+
+    def test_export_filter_date_range(self):
+        """Test filtering interviews by scheduled date."""
+        now = timezone.now()
+        Interview.objects.create(application_id=self.application, round='HR', scheduled_at=now - timedelta(days=10))
+        recent = Interview.objects.create(application_id=self.application, round='Tech', scheduled_at=now)
+
+        res = self.client.get(export_url('interview', 'ndjson'), {
+            'since': (now - timedelta(days=1)).date().isoformat(),
+            'until': (now + timedelta(days=1)).isoformat(),
+        })
+
+        rows = [json.loads(line) for line in read_stream(res).splitlines()]
+        self.assertEqual([row['id'] for row in rows], [recent.id])
+        self.assertEqual(rows[0]['company'], 'Samsung')
+
+    def test_export_invalid_params(self):
+        """Test invalid company and date parameters are rejected."""
+        res = self.client.get(export_url('application', 'csv'), {'company_id': 'abc'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(export_url('application', 'csv'), {'since': '2023-13-45'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_unknown_format(self):
+        """Test an unsupported format returns 404."""
+        res = self.client.get(export_url('application', 'xlsx'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_offers_limited_to_user(self):
+        """Test users only export their own offers, staff export everything."""
+        now = timezone.now()
+        Offer.objects.create(user_id=self.user, company_id=self.samsung, received_at=now, is_accepted=True)
+        Offer.objects.create(user_id=self.other, company_id=self.nokia, received_at=now)
+
+        res = self.client.get(export_url('offer', 'ndjson'))
+        rows = [json.loads(line) for line in read_stream(res).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertTrue(rows[0]['is_accepted'])
+
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get(export_url('offer', 'ndjson'))
+        self.assertEqual(len(read_stream(res).splitlines()), 2)
@@ -0,0 +1,163 @@
+"""
+Tests for filtering and ordering list endpoints.
+"""
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from api.views import (
+    ApplicationCreateListApiView, InterviewCreateListApiView, OfferCreateListApiView, QuestionCreateListApiView,
+)
+from core.models import Application, Company, Interview, Offer
+
+
+APPLICATIONS_URL = reverse('api:list-create-application')
+INTERVIEWS_URL = reverse('api:list-create-interview')
+OFFERS_URL = reverse('api:list-create-offer')
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+def ids(res):
+    return [item['id'] for item in res.data['results']]
+
+
+class FilterApiTests(TestCase):
+    """Test query parameter filters and ordering."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+        self.samsung = Company.objects.create(user_id=self.user, name='Samsung')
+        self.nokia = Company.objects.create(user_id=self.user, name='Nokia')
+
+    def test_filter_applications(self):
+        """Test applications filter by company and source."""
+        match = Application.objects.create(user_id=self.user, company_id=self.samsung, notes='A', source='Referral')
+        Application.objects.create(user_id=self.user, company_id=self.samsung, notes='B', source='Campus')
+        Application.objects.create(user_id=self.user, company_id=self.nokia, notes='C', source='Referral')
+
+        res = self.client.get(APPLICATIONS_URL, {'company_id': self.samsung.id, 'source': 'Referral'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(ids(res), [match.id])
+
+    def test_filter_interviews_by_week_and_result(self):
+        """Test interviews scheduled next week with a pending result."""
+        application = Application.objects.create(user_id=self.user, company_id=self.samsung, notes='A')
+        start = timezone.make_aware(datetime(2024, 6, 3))
+        match = Interview.objects.create(
+            application_id=application, notes='A', result='Pending', scheduled_at=start + timedelta(days=2),
+        )
+        Interview.objects.create(application_id=application, notes='B', result='Passed', scheduled_at=start)
+        Interview.objects.create(
+            application_id=application, notes='C', result='Pending', scheduled_at=start + timedelta(days=7),
+        )
+
+        res = self.client.get(INTERVIEWS_URL, {
+            'scheduled_after': '2024-06-03', 'scheduled_before': '2024-06-10', 'result': 'Pending',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(ids(res), [match.id])
+
+    def test_filter_offers(self):
+        """Test offers filter by acceptance."""
+        now = timezone.now()
+        accepted = Offer.objects.create(user_id=self.user, company_id=self.samsung, received_at=now, is_accepted=True)
+        Offer.objects.create(user_id=self.user, company_id=self.samsung, received_at=now)
+
+        res = self.client.get(OFFERS_URL, {'is_accepted': 'true'})
+
+        self.assertEqual(ids(res), [accepted.id])
+
+    def test_invalid_values(self):
+        """Test invalid filter values are rejected by parameter."""
+        res = self.client.get(OFFERS_URL, {'company_id': 'x', 'is_accepted': 'maybe', 'received_after': 'soon'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(res.data), {'company_id', 'is_accepted', 'received_after'})
+
+    def test_ordering(self):
+        """Test whitelisted ordering, with other fields ignored."""
+        now = timezone.now()
+        older = Offer.objects.create(user_id=self.user, received_at=now - timedelta(days=1))
+        newer = Offer.objects.create(user_id=self.user, received_at=now)
+
+        res = self.client.get(OFFERS_URL, {'ordering': 'received_at'})
+        self.assertEqual(ids(res), [older.id, newer.id])
+
+        res = self.client.get(OFFERS_URL, {'ordering': 'ctc'})
+        self.assertEqual(ids(res), [newer.id, older.id])
+
+    def test_ordering_pages(self):
+        """Test cursor pages follow the requested ordering."""
+        now = timezone.now()
+        offers = [Offer.objects.create(user_id=self.user, received_at=now + timedelta(hours=i)) for i in range(3)]
+
+        res = self.client.get(OFFERS_URL, {'ordering': 'received_at', 'page_size': 2})
+        next_res = self.client.get(res.data['next'])
+
+        self.assertEqual(ids(res) + ids(next_res), [offer.id for offer in offers])
+
+
+class FilterIndexTests(TestCase):
+    """Test every supported filter is answered from an index."""
+
+    def setUp(self):
+        self.user = create_user(email='user@example.com', password='test123')
+        if connection.vendor == 'postgresql':
+            # Tiny test tables are cheaper to scan, make the planner show
+            # which index it would use at scale.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def get_plan(self, view_class, params):
+        request = APIRequestFactory().get('/', params)
+        force_authenticate(request, self.user)
+        view = view_class()
+        view.setup(request)
+        view.request = view.initialize_request(request)
+        view.format_kwarg = None
+        view.initial(view.request)
+        queryset = view.paginator.get_page_queryset(view.filter_queryset(view.get_queryset()), view.request, view)
+        return queryset.explain()
+
+    def assertUsesIndex(self, view_class, params, index):
+        plan = self.get_plan(view_class, params)
+        self.assertIn(index, plan, 'Expected %s in the plan for %s:\n%s' % (index, params, plan))
+
+    def test_filters_use_indexes(self):
+        """Test the plan of each filtered list uses the filter's index."""
+        # SQLite can't match a bare boolean condition to an index column,
+        # it only narrows offers to the user's.
+        accepted_idx = 'offer_user_accepted_idx' if connection.vendor == 'postgresql' else 'offer_user_received_idx'
+        cases = [
+            (QuestionCreateListApiView, {'company_id': 1}, 'question_user_company_idx'),
+            (QuestionCreateListApiView, {'created_after': '2024-01-01'}, 'question_user_created_idx'),
+            (ApplicationCreateListApiView, {'company_id': 1}, 'application_user_company_idx'),
+            (ApplicationCreateListApiView, {'source': 'Referral'}, 'application_user_source_idx'),
+            (ApplicationCreateListApiView, {'created_before': '2024-01-01'}, 'application_user_created_idx'),
+            (InterviewCreateListApiView, {'result': 'Pending'}, 'interview_result_scheduled_idx'),
+            (InterviewCreateListApiView, {'round': 'HR'}, 'interview_round_scheduled_idx'),
+            (InterviewCreateListApiView, {'application_id': 1}, 'interview_app_scheduled_idx'),
+            (InterviewCreateListApiView, {'scheduled_after': '2024-01-01'}, 'interview_scheduled_idx'),
+            (OfferCreateListApiView, {'company_id': 1}, 'offer_user_company_idx'),
+            (OfferCreateListApiView, {'is_accepted': 'true'}, accepted_idx),
+            (OfferCreateListApiView, {'is_accepted': 'false'}, accepted_idx),
+            (OfferCreateListApiView, {'received_after': '2024-01-01'}, 'offer_user_received_idx'),
+        ]
+        for view_class, params, index in cases:
+            with self.subTest(view=view_class.__name__, params=params):
+                self.assertUsesIndex(view_class, params, index)
@@ -0,0 +1,99 @@
+"""
+Tests for the company funnel APIs.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Company, Application, Interview, Offer
+)
+
+
+FUNNEL_URL = reverse('api:list-funnel')
+APPLICATIONS_BULK_URL = reverse('api:bulk-application')
+INTERVIEWS_BULK_URL = reverse('api:bulk-interview')
+
+
+def detail_url(pk):
+    """Create and return a funnel detail URL."""
+    return reverse('api:detail-funnel', args=[pk])
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class FunnelApiTests(TestCase):
+    """Test funnel API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+        self.company = Company.objects.create(user_id=self.user, name='Samsung')
+
+    def test_staff_required(self):
+        """Test non staff users can't see the funnel."""
+        res = self.client.get(FUNNEL_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_list_funnel(self):
+        """Test listing the per company funnel."""
+        self.user.is_staff = True
+        self.user.save()
+        application = Application.objects.create(user_id=self.user, company_id=self.company, notes='Notes')
+        Interview.objects.create(application_id=application, notes='One', result='Passed', scheduled_at=timezone.now())
+        Offer.objects.create(user_id=self.user, company_id=self.company, received_at=timezone.now())
+
+        res = self.client.get(FUNNEL_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        row = res.data['results'][0]
+        self.assertEqual(row['company_name'], 'Samsung')
+        self.assertEqual(
+            [row['applications'], row['interviews'], row['interviews_passed'], row['offers'], row['offers_accepted']],
+            [1, 1, 1, 1, 0],
+        )
+
+    def test_bulk_endpoints_update_funnel(self):
+        """Test bulk created and updated rows are counted."""
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.post(APPLICATIONS_BULK_URL, [
+            {'company_id': self.company.id, 'notes': 'One'},
+            {'company_id': self.company.id, 'notes': 'Two'},
+        ], format='json')
+        application_id = res.data[0]['id']
+        res = self.client.post(INTERVIEWS_BULK_URL, [
+            {'application_id': application_id, 'notes': 'Round one', 'scheduled_at': timezone.now()},
+        ], format='json')
+        self.client.patch(INTERVIEWS_BULK_URL, [{'id': res.data[0]['id'], 'result': 'Passed'}], format='json')
+
+        res = self.client.get(detail_url(self.company.id))
+
+        self.assertEqual(res.data['applications'], 2)
+        self.assertEqual(res.data['interviews'], 1)
+        self.assertEqual(res.data['interviews_passed'], 1)
+
+    def test_bulk_moving_application_moves_interviews(self):
+        """Test a bulk changed company moves the application's interview counts."""
+        self.user.is_staff = True
+        self.user.save()
+        other = Company.objects.create(user_id=self.user, name='Nokia')
+        application = Application.objects.create(user_id=self.user, company_id=self.company, notes='Notes')
+        Interview.objects.create(application_id=application, notes='One', result='Passed', scheduled_at=timezone.now())
+
+        res = self.client.patch(APPLICATIONS_BULK_URL, [{'id': application.id, 'company_id': other.id}], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        old = self.client.get(detail_url(self.company.id)).data
+        new = self.client.get(detail_url(other.id)).data
+        self.assertEqual([old['applications'], old['interviews'], old['interviews_passed']], [0, 0, 0])
+        self.assertEqual([new['applications'], new['interviews'], new['interviews_passed']], [1, 1, 1])
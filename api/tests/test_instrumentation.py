@@ -0,0 +1,104 @@
+"""
+Tests for per-request SQL instrumentation.
+"""
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.instrumentation import QueryInstrumentationMiddleware
+from core.models import Company
+from core.querylog import fingerprint, record_queries
+
+
+QUESTIONS_URL = reverse('api:list-create-question')
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class QueryLogTests(TestCase):
+    """Test recording and fingerprinting queries."""
+
+    def test_fingerprint_ignores_parameters(self):
+        """Test queries differing only in IN list length share a fingerprint."""
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s)'),
+            fingerprint('SELECT *  FROM t\nWHERE id IN (%s, %s, %s)'),
+        )
+        self.assertNotEqual(fingerprint('SELECT * FROM t'), fingerprint('SELECT * FROM u'))
+
+    def test_nested_logs(self):
+        """Test an outer log also counts the queries of an inner one."""
+        with record_queries() as outer:
+            Company.objects.count()
+            with record_queries() as inner:
+                Company.objects.count()
+                Company.objects.count()
+
+        self.assertEqual((outer.count, inner.count), (3, 2))
+        self.assertEqual([count for _, count, _ in outer.duplicates()], [3])
+
+
+@override_settings(QUERY_SERVER_TIMING=True)
+class QueryInstrumentationMiddlewareTests(TestCase):
+    """Test query counts are reported per request."""
+
+    def setUp(self):
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_header(self):
+        """Test the response reports its queries in Server-Timing."""
+        with record_queries() as log:
+            res = self.client.get(QUESTIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertRegex(res['Server-Timing'], r'^db;dur=\d+\.\d;desc="%d queries"$' % log.count)
+
+    def test_duplicates_reported(self):
+        """Test repeated queries are reported with their fingerprint."""
+        def view(request):
+            for _ in range(3):
+                Company.objects.count()
+            return HttpResponse()
+
+        request = RequestFactory().get('/api/company')
+        with self.assertLogs('api.queries', 'INFO') as logs:
+            res = QueryInstrumentationMiddleware(view)(request)
+
+        self.assertRegex(res['Server-Timing'], r'desc="3 queries", db-duplicates;desc="2"$')
+        record = logs.records[0]
+        self.assertEqual((record.method, record.path, record.status, record.queries), ('GET', '/api/company', 200, 3))
+        self.assertEqual(len(record.duplicates), 1)
+        self.assertEqual(record.duplicates[0]['count'], 3)
+        self.assertIn('core_company', record.duplicates[0]['sql'])
+
+    @override_settings(QUERY_COUNT_WARNING=0)
+    def test_warning_over_threshold(self):
+        """Test requests over QUERY_COUNT_WARNING are logged as warnings."""
+        with self.assertLogs('api.queries', 'WARNING'):
+            self.client.get(QUESTIONS_URL)
+
+    @override_settings(QUERY_SERVER_TIMING=False)
+    def test_server_timing_disabled(self):
+        """Test the header can be turned off and the request is still logged."""
+        with self.assertLogs('api.queries', 'INFO'):
+            res = self.client.get(QUESTIONS_URL)
+
+        self.assertNotIn('Server-Timing', res)
+
+    async def test_async_view_queries_counted(self):
+        """Test queries the async views run in sync threads are counted."""
+        token = RefreshToken.for_user(self.user).access_token
+        res = await AsyncClient().get('/api/question', authorization='Bearer %s' % token)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertRegex(res['Server-Timing'], r'desc="[1-9]\d* queries"')
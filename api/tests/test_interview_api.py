@@ -16,6 +16,7 @@ from core.models import (
 from api.serializers import (
     InterviewSerializer
 )
+from api.tests.utils import QueryBudgetMixin
 
 
 INTERVIEWS_URL = reverse('api:list-create-interview')
@@ -65,7 +66,7 @@ class PublicInterviewAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateInterviewApiTests(TestCase):
+class PrivateInterviewApiTests(QueryBudgetMixin, TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
@@ -98,6 +99,19 @@ class PrivateInterviewApiTests(TestCase):
         self.assertEqual(interview.application_id, sample_application)
         self.assertEqual(interview.notes, payload['notes'])
 
+    def test_create_interview_on_other_users_application(self):
+        """Test an interview can't be added to another user's application."""
+        other_user = create_user(email='other@example.com', password='test123')
+        sample_company = create_company(user_id=other_user, name='Samsung')
+        application = create_application(user_id=other_user, notes='Theirs', company_id=sample_company)
+
+        payload = {'application_id': application.id, 'notes': 'Notes', 'scheduled_at': datetime.now()}
+        res = self.client.post(INTERVIEWS_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('application_id', res.data)
+        self.assertFalse(Interview.objects.exists())
+
     
     def test_retrieve_interviews(self):
         """Test retrieving a list of interviews."""
@@ -191,4 +205,15 @@ class PrivateInterviewApiTests(TestCase):
         self.assertFalse(Interview.objects.filter(id=interview.id).exists())
 
 
-    
\ No newline at end of file
+    def test_list_query_budget(self):
+        """Test listing interviews runs a fixed number of queries."""
+        company = create_company(user_id=self.user)
+        application = create_application(user_id=self.user, company_id=company)
+        for i in range(5):
+            create_interview(application_id=application, notes='Round %d' % i, scheduled_at=datetime.now())
+
+        with self.assertMaxQueries(2):
+            res = self.client.get(INTERVIEWS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 5)
@@ -0,0 +1,194 @@
+"""
+Tests for the protected media view.
+"""
+import os
+import tempfile
+from unittest import skipUnless
+from urllib.parse import quote
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.media import file_query
+from core.models import Company, CustomUser, Resume
+
+
+CONTENT = b'0123456789' * 10
+
+
+def media_url(name):
+    return '/media/' + name
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+def read(res):
+    return b''.join(res.streaming_content)
+
+
+@override_settings(MEDIA_PROCESSING_WORKERS=0, MEDIA_RENDITIONS={'thumbnail': (10, 10)})
+class ProtectedMediaApiTests(TestCase):
+    """Test serving uploaded files."""
+
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root.name)
+        self.settings_override.enable()
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.other = create_user(email='other@example.com', password='test123')
+        company = Company.objects.create(user_id=self.user, name='Samsung')
+        self.resume = Resume.objects.create(
+            user_id=self.user, company_id=company, resume=SimpleUploadedFile('cv.pdf', CONTENT),
+        )
+        self.url = media_url(self.resume.resume.name)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media_root.cleanup()
+
+    def test_auth_required(self):
+        """Test anonymous users can't fetch media."""
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_owner_can_fetch_resume(self):
+        """Test the owner gets the file with cache headers."""
+        self.client.force_authenticate(self.user)
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(read(res), CONTENT)
+        self.assertEqual(res['Content-Type'], 'application/pdf')
+        self.assertEqual(res['Accept-Ranges'], 'bytes')
+        self.assertIn('private', res['Cache-Control'])
+        self.assertIn('immutable', res['Cache-Control'])
+        self.assertIn('Last-Modified', res)
+
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_other_user_cannot_fetch_resume(self):
+        """Test other users get a 404, staff can fetch any resume."""
+        self.client.force_authenticate(self.other)
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.other.is_staff = True
+        self.other.save()
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_rendition_and_profile_image_access(self):
+        """Test renditions follow their row, profile images are visible to everyone signed in."""
+        thumbnail = default_storage.save('thumb.webp', ContentFile(b'thumbnail'))
+        Resume.objects.filter(pk=self.resume.pk).update(renditions={'thumbnail': thumbnail})
+        self.other.profile_image = SimpleUploadedFile('avatar.txt', b'avatar')
+        self.other.save()
+
+        self.client.force_authenticate(self.user)
+        res = self.client.get(media_url(thumbnail))
+        self.assertEqual(read(res), b'thumbnail')
+        res = self.client.get(media_url(self.other.profile_image.name))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(read(res), b'avatar')
+
+        self.client.force_authenticate(self.other)
+        res = self.client.get(media_url(thumbnail))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_range_requests(self):
+        """Test single byte ranges return partial content."""
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(res.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(res['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(res['Content-Length'], '10')
+        self.assertEqual(read(res), CONTENT[10:20])
+
+        res = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(read(res), CONTENT[-5:])
+
+        res = self.client.get(self.url, HTTP_RANGE='bytes=200-')
+        self.assertEqual(res.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(res['Content-Range'], 'bytes */100')
+
+        res = self.client.get(self.url, HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_path_traversal_rejected(self):
+        """Test paths outside MEDIA_ROOT are not served."""
+        self.client.force_authenticate(self.user)
+        res = self.client.get(media_url('../settings.py'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(MEDIA_SENDFILE_BACKEND='x-accel-redirect')
+    def test_x_accel_redirect(self):
+        """Test the transfer is handed to nginx when configured."""
+        self.client.force_authenticate(self.user)
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['X-Accel-Redirect'], '/protected-media/' + self.resume.resume.name)
+        self.assertEqual(res.content, b'')
+
+    @override_settings(MEDIA_SENDFILE_BACKEND='x-accel-redirect')
+    def test_x_accel_redirect_quoted(self):
+        """Test names nginx would misread are percent-encoded in the redirect."""
+        name = 'resumes/my cv?é.pdf'
+        path = os.path.join(self.media_root.name, name)
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as handle:
+            handle.write(CONTENT)
+        Resume.objects.filter(pk=self.resume.pk).update(resume=name)
+
+        self.client.force_authenticate(self.user)
+        res = self.client.get(media_url(quote(name)))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['X-Accel-Redirect'], '/protected-media/resumes/my%20cv%3F%C3%A9.pdf')
+
+    @override_settings(MEDIA_SENDFILE_BACKEND='x-sendfile')
+    def test_x_sendfile(self):
+        """Test the file path is handed to the server when configured."""
+        self.client.force_authenticate(self.user)
+        res = self.client.get(self.url)
+
+        self.assertEqual(res['X-Sendfile'], self.resume.resume.path)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'GIN indexes are only created on Postgres.')
+@override_settings(MEDIA_RENDITIONS={'display': (100, 100), 'thumbnail': (10, 10)})
+class MediaLookupIndexTests(TestCase):
+    """Test the ownership checks of downloads are answered from indexes."""
+
+    def setUp(self):
+        # Tiny test tables are cheaper to scan, make the planner show
+        # which index it would use at scale.
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def test_lookups_use_indexes(self):
+        """Test the file and rendition lookups use the file and GIN indexes."""
+        cases = [
+            (CustomUser, ('user_profile_image_idx', 'user_renditions_idx')),
+            (Resume, ('resume_file_idx', 'resume_renditions_idx')),
+        ]
+        for model, indexes in cases:
+            plan = model.objects.filter(file_query(model, 'blobs/ab/cd/abcd.webp')).explain()
+            for index in indexes:
+                with self.subTest(model=model.__name__, index=index):
+                    self.assertIn(index, plan, 'Expected %s in the plan:\n%s' % (index, plan))
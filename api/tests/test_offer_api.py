@@ -16,6 +16,7 @@ from core.models import (
 from api.serializers import (
     OfferSerializer
 )
+from api.tests.utils import QueryBudgetMixin
 
 
 OFFERS_URL = reverse('api:list-create-offer')
@@ -60,7 +61,7 @@ class PublicOfferAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateOfferApiTests(TestCase):
+class PrivateOfferApiTests(QueryBudgetMixin, TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
@@ -101,6 +102,30 @@ class PrivateOfferApiTests(TestCase):
         # self.assertEqual(res.data, serializer.data)
     
 
+    def test_offer_list_limited_to_user(self):
+        """Test list of offers is limited to authenticated user."""
+        other_user = create_user(email='other@example.com', password='test123')
+        sample_company = create_company(user_id=self.user, name='Samsung')
+        create_offer(user_id=other_user, company_id=sample_company, notes='Other Note', received_at=datetime.now())
+        offer = create_offer(user_id=self.user, company_id=sample_company, notes='My Note', received_at=datetime.now())
+
+        res = self.client.get(OFFERS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in res.data['results']], [offer.id])
+
+    
+    def test_list_offers_expand_company(self):
+        """Test company is inlined in the offer list with ?expand=company."""
+        sample_company = create_company(user_id=self.user, name='Samsung')
+        create_offer(user_id=self.user, company_id=sample_company, notes='Note One', received_at=datetime.now())
+
+        with self.assertNumQueries(1):
+            res = self.client.get(OFFERS_URL, {'expand': 'company'})
+
+        self.assertEqual(res.data['results'][0]['company']['name'], 'Samsung')
+
+    
     def test_get_offer_detail(self):
         """Test get offer detail."""
         company = create_company(user_id=self.user)
@@ -144,4 +169,17 @@ class PrivateOfferApiTests(TestCase):
         res = self.client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertFalse(Offer.objects.filter(id=offer.id).exists())
\ No newline at end of file
+        self.assertFalse(Offer.objects.filter(id=offer.id).exists())
+
+
+    def test_list_query_budget(self):
+        """Test listing offers with expands runs a fixed number of queries."""
+        company = create_company(user_id=self.user)
+        for i in range(5):
+            create_offer(user_id=self.user, company_id=company, ctc='10 LPA', received_at=datetime.now())
+
+        with self.assertMaxQueries(1):
+            res = self.client.get(OFFERS_URL, {'expand': 'company'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 5)
@@ -0,0 +1,91 @@
+"""
+Tests for cursor pagination on list APIs.
+"""
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Company, Application, Interview
+)
+
+
+APPLICATIONS_URL = reverse('api:list-create-application')
+INTERVIEWS_URL = reverse('api:list-create-interview')
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class PaginationApiTests(TestCase):
+    """Test paginated list responses."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+        self.company = Company.objects.create(user_id=self.user, name='Samsung')
+
+    def test_follow_cursor_through_all_pages(self):
+        """Test following next links returns every row exactly once."""
+        applications = [
+            Application.objects.create(user_id=self.user, company_id=self.company, notes='Note %s' % i)
+            for i in range(5)
+        ]
+
+        seen = []
+        url = APPLICATIONS_URL + '?page_size=2'
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(res.data['results']), 2)
+            seen.extend(item['id'] for item in res.data['results'])
+            url = res.data['next']
+
+        self.assertEqual(seen, [application.id for application in reversed(applications)])
+
+    def test_interviews_ordered_by_scheduled_at(self):
+        """Test interviews are listed latest scheduled first."""
+        application = Application.objects.create(user_id=self.user, company_id=self.company, notes='Note')
+        now = timezone.now()
+        later = Interview.objects.create(application_id=application, notes='Later', scheduled_at=now + timedelta(days=1))
+        earlier = Interview.objects.create(application_id=application, notes='Earlier', scheduled_at=now)
+
+        res = self.client.get(INTERVIEWS_URL)
+
+        self.assertEqual([item['id'] for item in res.data['results']], [later.id, earlier.id])
+
+    def test_count_only_when_requested(self):
+        """Test the total is included only when asked for."""
+        Application.objects.create(user_id=self.user, company_id=self.company, notes='Note')
+
+        res = self.client.get(APPLICATIONS_URL)
+        self.assertNotIn('count', res.data)
+
+        res = self.client.get(APPLICATIONS_URL, {'count': 'true'})
+        self.assertEqual(res.data['count'], 1)
+
+    @override_settings(API_MAX_PAGE_SIZE=2)
+    def test_page_size_is_capped(self):
+        """Test requesting a huge page size is capped."""
+        for i in range(3):
+            Application.objects.create(user_id=self.user, company_id=self.company, notes='Note %s' % i)
+
+        res = self.client.get(APPLICATIONS_URL, {'page_size': 1000})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertIsNotNone(res.data['next'])
+
+    def test_invalid_cursor(self):
+        """Test a garbled cursor returns 404."""
+        res = self.client.get(APPLICATIONS_URL, {'cursor': 'bz1hYmM='})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
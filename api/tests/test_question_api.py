@@ -15,6 +15,7 @@ from core.models import (
 from api.serializers import (
     QuestionSerializer
 )
+from api.tests.utils import QueryBudgetMixin
 
 
 QUESTIONS_URL = reverse('api:list-create-question')
@@ -59,7 +60,7 @@ class PublicQuestionAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivatequestionApiTests(TestCase):
+class PrivatequestionApiTests(QueryBudgetMixin, TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
@@ -96,6 +97,19 @@ class PrivatequestionApiTests(TestCase):
         # self.assertEqual(res.data, serializer.data)
 
     
+    def test_question_list_limited_to_user(self):
+        """Test list of questions is limited to authenticated user."""
+        other_user = create_user(email='other@example.com', password='test123')
+        sample_company = create_company(user_id=self.user, name='Samsung')
+        create_question(user_id=other_user, company_id=sample_company, content='Other Question')
+        question = create_question(user_id=self.user, company_id=sample_company, content='My Question')
+
+        res = self.client.get(QUESTIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in res.data['results']], [question.id])
+
+    
     def test_get_question_detail(self):
         """Test get question detail."""
         company = create_company(user_id=self.user)
@@ -149,7 +163,23 @@ class PrivatequestionApiTests(TestCase):
         self.assertFalse(Question.objects.filter(id=question.id).exists())
 
 
+    def test_list_query_budget(self):
+        """Test listing questions runs a fixed number of queries."""
+        company = create_company(user_id=self.user)
+        for i in range(5):
+            create_question(user_id=self.user, company_id=company, content='Question %d' % i)
+
+        with self.assertMaxQueries(2):
+            res = self.client.get(QUESTIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 5)
 
+    def test_create_query_budget(self):
+        """Test creating a question stays within its query budget."""
+        company = create_company(user_id=self.user)
 
+        with self.assertMaxQueries(2):
+            res = self.client.post(QUESTIONS_URL, {'content': 'Question', 'company_id': company.id})
 
-   
\ No newline at end of file
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
@@ -0,0 +1,156 @@
+"""
+Tests for routing reads to replica databases.
+"""
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.replicas import ReplicaPinningMiddleware
+from core.models import Company, Question
+from core.replicas import PrimaryReplicaRouter, is_pinned, pin, read_alias
+
+
+QUESTIONS_URL = reverse('api:list-create-question')
+COMPANIES_URL = reverse('api:list-create-company')
+
+
+def detail_url(pk):
+    """Create and return a question detail URL."""
+    return reverse('api:crud-question', args=[pk])
+
+
+def company_url(pk):
+    """Create and return a company detail URL."""
+    return reverse('api:crud-company', args=[pk])
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class ReplicaRoutingTests(TestCase):
+    """Test replica selection and read-your-writes pinning."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user(email='user@example.com', password='test123')
+
+    def test_primary_without_replicas(self):
+        """Test reads stay on the primary when no replica is configured."""
+        self.assertIsNone(read_alias(self.user))
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_pinned_after_write(self):
+        """Test a user's reads go to the primary after they write."""
+        self.assertEqual(read_alias(self.user), 'replica')
+
+        pin(self.user)
+
+        self.assertTrue(is_pinned(self.user))
+        self.assertIsNone(read_alias(self.user))
+        other = create_user(email='other@example.com', password='test123')
+        self.assertEqual(read_alias(other), 'replica')
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_middleware_pins_on_successful_write(self):
+        """Test only successful unsafe requests pin the user."""
+        factory = RequestFactory()
+
+        for method, status_code in [('get', 200), ('post', 400), ('post', 201)]:
+            request = getattr(factory, method)('/')
+            request.user = self.user
+            ReplicaPinningMiddleware(lambda request: HttpResponse(status=status_code))(request)
+            self.assertEqual(is_pinned(self.user), status_code == 201)
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_router_writes_to_primary(self):
+        """Test writes go to the primary, even for rows read from a replica."""
+        question = Question(content='Question')
+        question._state.db = 'replica'
+
+        self.assertEqual(PrimaryReplicaRouter().db_for_write(Question, instance=question), 'default')
+
+
+class RouterRelationTests(SimpleTestCase):
+    """Test relations between rows from different databases."""
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_allow_relation(self):
+        """Test rows of the primary and replicas can be related."""
+        router = PrimaryReplicaRouter()
+        primary, replica, other = Company(), Company(), Company()
+        primary._state.db, replica._state.db, other._state.db = 'default', 'replica', 'other'
+
+        self.assertTrue(router.allow_relation(primary, replica))
+        self.assertIsNone(router.allow_relation(primary, other))
+
+
+@skipUnless('replica' in settings.DATABASES, "Needs a 'replica' database alias.")
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaReadApiTests(TestCase):
+    """Test API reads against a separate replica database."""
+    # Read by the test runner even when the class is skipped.
+    databases = {'default', 'replica'} if 'replica' in settings.DATABASES else {'default'}
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.user.save(using='replica')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # The same company on both, with a question only the replica has.
+        self.company = Company.objects.create(user_id=self.user, name='Company')
+        self.company.save(using='replica')
+        self.replica_question = Question.objects.using('replica').create(
+            user_id=self.user, company_id=self.company, content='On the replica',
+        )
+
+    def test_get_reads_replica(self):
+        """Test list and detail GETs are served from the replica."""
+        res = self.client.get(QUESTIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['content'] for item in res.data['results']], ['On the replica'])
+
+        res = self.client.get(detail_url(self.replica_question.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_reads_own_writes(self):
+        """Test a user reads from the primary right after writing."""
+        res = self.client.post(QUESTIONS_URL, {'company_id': self.company.id, 'content': 'New'})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Question.objects.filter(content='New').exists())
+        self.assertFalse(Question.objects.using('replica').filter(content='New').exists())
+
+        res = self.client.get(detail_url(res.data['id']))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['content'], 'New')
+
+    def test_cached_company_filled_from_primary(self):
+        """Test a cache miss after a write caches the primary's rows, not the replica's."""
+        res = self.client.patch(company_url(self.company.id), {'name': 'Renamed'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(Company.objects.using('replica').get().name, 'Company')
+
+        other = create_user(email='other@example.com', password='test123')
+        client = APIClient()
+        client.force_authenticate(other)
+        for url in (company_url(self.company.id), COMPANIES_URL):
+            for cache_status in ('MISS', 'HIT'):
+                with self.subTest(url=url, cache=cache_status):
+                    res = client.get(url)
+                    self.assertEqual(res['X-Cache'], cache_status)
+                    data = res.data['results'][0] if url == COMPANIES_URL else res.data
+                    self.assertEqual(data['name'], 'Renamed')
@@ -3,9 +3,10 @@ Tests for application APIs.
 """
 import os
 import tempfile
+from unittest import mock
 from PIL import Image
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from rest_framework import status
@@ -77,6 +78,66 @@ class PrivateResumeApiTests(TestCase):
         resume = Resume.objects.get(id=res.data['id'])
         self.assertEqual(resume.user_id, self.user)
         self.assertTrue(os.path.exists(resume.resume.path))
-    
 
-   
\ No newline at end of file
+
+def upload_image(client, company, size=(2000, 1000)):
+    """Upload a JPEG resume with EXIF data and return the response."""
+    with tempfile.NamedTemporaryFile(suffix='.jpg') as image_file:
+        img = Image.new('RGB', size, color='white')
+        exif = Image.Exif()
+        exif[0x010f] = 'Camera Maker'
+        img.save(image_file, format='JPEG', exif=exif)
+        image_file.seek(0)
+        return client.post(RESUME_URL, {'resume': image_file, 'company_id': company.id}, format='multipart')
+
+
+class ResumeProcessingApiTests(TestCase):
+    """Test resumes are processed after upload."""
+
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root.name)
+        self.settings_override.enable()
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+        self.company = create_company(user_id=self.user)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media_root.cleanup()
+
+    @override_settings(MEDIA_PROCESSING_WORKERS=0)
+    def test_upload_creates_renditions(self):
+        """Test renditions and dimensions are recorded once the upload commits."""
+        with self.captureOnCommitCallbacks(execute=True):
+            res = upload_image(self.client, self.company)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        resume = Resume.objects.get(id=res.data['id'])
+        self.assertEqual((resume.width, resume.height), (2000, 1000))
+        self.assertEqual(resume.size, os.path.getsize(resume.resume.path))
+        self.assertIsNotNone(resume.processed_at)
+        self.assertEqual(set(resume.renditions), {'display', 'thumbnail'})
+
+        with Image.open(os.path.join(self.media_root.name, resume.renditions['thumbnail'])) as thumbnail:
+            self.assertEqual(thumbnail.format, 'WEBP')
+            self.assertEqual(thumbnail.size, (320, 160))
+            self.assertEqual(len(thumbnail.getexif()), 0)
+
+        res = self.client.get(RESUME_URL)
+        renditions = res.data['results'][0]['renditions']
+        self.assertTrue(renditions['thumbnail'].startswith('http://testserver/media/blobs/'))
+        self.assertEqual(res.data['results'][0]['width'], 2000)
+
+    def test_upload_is_handed_to_worker_pool(self):
+        """Test the upload response doesn't wait for processing."""
+        with mock.patch('core.media.get_executor') as get_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                res = upload_image(self.client, self.company)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        get_executor.return_value.submit.assert_called_once()
+        self.assertEqual(res.data['renditions'], {})
+        self.assertIsNone(Resume.objects.get(id=res.data['id']).processed_at)
+
@@ -0,0 +1,98 @@
+"""
+Tests for the full-text search APIs.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Company, Question, Application, Interview
+)
+
+
+QUESTION_SEARCH_URL = reverse('api:search-question')
+APPLICATION_SEARCH_URL = reverse('api:search-application')
+INTERVIEW_SEARCH_URL = reverse('api:search-interview')
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class PublicSearchAPITests(TestCase):
+    """Test unauthenticated API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        """Test auth is required to call API."""
+        res = self.client.get(QUESTION_SEARCH_URL, {'q': 'tree'})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateSearchApiTests(TestCase):
+    """Test authenticated API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.other_user = create_user(email='other@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+        self.samsung = Company.objects.create(user_id=self.user, name='Samsung')
+        self.nokia = Company.objects.create(user_id=self.user, name='Nokia')
+
+    def test_search_questions(self):
+        """Test questions from every user are searched, optionally per company."""
+        match = Question.objects.create(user_id=self.other_user, company_id=self.samsung, content='Invert a binary tree')
+        Question.objects.create(user_id=self.user, company_id=self.nokia, content='Balance a binary tree')
+        Question.objects.create(user_id=self.user, company_id=self.samsung, content='Design a parking lot')
+
+        res = self.client.get(QUESTION_SEARCH_URL, {'q': 'binary tree'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+        self.assertNotIn('search_vector', res.data[0])
+
+        res = self.client.get(QUESTION_SEARCH_URL, {'q': 'tree', 'company_id': self.samsung.id})
+        self.assertEqual([item['id'] for item in res.data], [match.id])
+
+    def test_search_requires_query(self):
+        """Test a missing query returns an error."""
+        res = self.client.get(QUESTION_SEARCH_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_limit(self):
+        """Test the number of results can be limited."""
+        for i in range(3):
+            Question.objects.create(user_id=self.user, company_id=self.samsung, content='Linked list %s' % i)
+
+        res = self.client.get(QUESTION_SEARCH_URL, {'q': 'linked', 'limit': 2})
+
+        self.assertEqual(len(res.data), 2)
+
+    def test_search_application_notes_owned(self):
+        """Test application notes search only covers the user's own rows."""
+        mine = Application.objects.create(user_id=self.user, company_id=self.samsung, notes='Referral from alumni')
+        Application.objects.create(user_id=self.other_user, company_id=self.samsung, notes='Referral from a friend')
+
+        res = self.client.get(APPLICATION_SEARCH_URL, {'q': 'referral'})
+
+        self.assertEqual([item['id'] for item in res.data], [mine.id])
+
+    def test_search_interview_notes_owned(self):
+        """Test interview notes search only covers the user's own rows."""
+        mine = Application.objects.create(user_id=self.user, company_id=self.samsung, notes='Notes')
+        theirs = Application.objects.create(user_id=self.other_user, company_id=self.samsung, notes='Notes')
+        interview = Interview.objects.create(application_id=mine, notes='Asked about caching', scheduled_at=timezone.now())
+        Interview.objects.create(application_id=theirs, notes='Asked about caching', scheduled_at=timezone.now())
+
+        res = self.client.get(INTERVIEW_SEARCH_URL, {'q': 'caching'})
+
+        self.assertEqual([item['id'] for item in res.data], [interview.id])
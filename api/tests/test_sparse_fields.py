@@ -0,0 +1,116 @@
+"""
+Tests for sparse fieldsets (?fields= and ?omit=).
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.tests.utils import QueryBudgetMixin
+from core.models import Company, Application, Interview, Question
+from core.querylog import record_queries
+
+
+QUESTIONS_URL = reverse('api:list-create-question')
+APPLICATIONS_URL = reverse('api:list-create-application')
+INTERVIEWS_URL = reverse('api:list-create-interview')
+
+
+def detail_url(application_id):
+    return reverse('api:crud-application', args=[application_id])
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+def selects(log, table):
+    """SELECT statements of ``log`` reading from ``table``."""
+    return [sql for _, sql, _ in log.queries if sql.startswith('SELECT') and 'FROM "%s"' % table in sql]
+
+
+class SparseFieldsApiTests(QueryBudgetMixin, TestCase):
+    """Test ?fields= and ?omit= on list and detail endpoints."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+        self.company = Company.objects.create(user_id=self.user, name='Samsung')
+        self.application = Application.objects.create(
+            user_id=self.user, company_id=self.company, notes='Long notes ' * 100, source='Referral',
+        )
+
+    def test_fields(self):
+        """Test only the requested fields are returned and the rest aren't read."""
+        Question.objects.create(user_id=self.user, company_id=self.company, content='Reverse a list')
+
+        with record_queries() as log:
+            res = self.client.get(QUESTIONS_URL, {'fields': 'id,company_id'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(res.data['results'][0]), {'id', 'company_id'})
+        page_query = selects(log, 'core_question')[-1]
+        self.assertNotIn('"content"', page_query)
+        self.assertNotIn('"search_vector"', page_query)
+
+    def test_omit(self):
+        """Test omitted fields are left out and their columns deferred."""
+        with record_queries() as log:
+            res = self.client.get(APPLICATIONS_URL, {'omit': 'notes'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        item = res.data['results'][0]
+        self.assertNotIn('notes', item)
+        self.assertEqual(item['source'], 'Referral')
+        self.assertNotIn('"notes"', selects(log, 'core_application')[-1])
+
+    def test_detail(self):
+        """Test sparse fieldsets on a detail endpoint."""
+        res = self.client.get(detail_url(self.application.id), {'fields': 'id,source'})
+
+        self.assertEqual(res.data, {'id': self.application.id, 'source': 'Referral'})
+
+    def test_with_expand(self):
+        """Test expanded relations are rendered in full and still joined."""
+        with self.assertMaxQueries(3):
+            res = self.client.get(APPLICATIONS_URL, {'fields': 'id,company', 'expand': 'company'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        item = res.data['results'][0]
+        self.assertEqual(set(item), {'id', 'company'})
+        self.assertEqual(item['company']['name'], 'Samsung')
+
+    def test_ordering_column_kept(self):
+        """Test cursor pages don't reload a deferred ordering column."""
+        now = timezone.now()
+        for i in range(3):
+            Interview.objects.create(application_id=self.application, notes='x', scheduled_at=now + timedelta(hours=i))
+
+        with self.assertMaxQueries(2):
+            res = self.client.get(INTERVIEWS_URL, {'fields': 'id', 'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(res.data['next'])
+
+    def test_unknown_field(self):
+        """Test unknown field names are rejected."""
+        res = self.client.get(APPLICATIONS_URL, {'fields': 'id,secret', 'omit': 'nothing'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', res.data)
+
+    def test_ignored_on_create(self):
+        """Test writes return the full object whatever the query string says."""
+        res = self.client.post(
+            APPLICATIONS_URL + '?fields=id', {'company_id': self.company.id, 'notes': 'New'}, format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['notes'], 'New')
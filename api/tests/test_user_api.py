@@ -1,12 +1,16 @@
 """
 Tests for the user API.
 """
+from unittest.mock import patch
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
 
 CREATE_USER_URL = reverse('api:signup')
@@ -40,6 +44,31 @@ class PublicUserApiTests(TestCase):
         self.assertNotIn('password', res.data)
 
     
+    def test_create_user_single_write_and_token_pair(self):
+        """Test registering inserts once and returns a matching token pair."""
+        payload = {
+            'email': 'test@example.com',
+            'password': 'testpassword',
+            'username': 'Test Name',
+        }
+        with CaptureQueriesContext(connection) as ctx, \
+                patch.object(RefreshToken, 'for_user', wraps=RefreshToken.for_user) as for_user:
+            res = self.client.post(CREATE_USER_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        writes = [
+            query['sql'] for query in ctx.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE'))
+        ]
+        self.assertEqual(len(writes), 1)
+        for_user.assert_called_once()
+        self.assertIsInstance(res.data['access'], str)
+        refresh = RefreshToken(res.data['refresh'])
+        access = AccessToken(res.data['access'])
+        self.assertEqual(refresh['user_id'], res.data['id'])
+        self.assertEqual(access['user_id'], res.data['id'])
+
+    
     def test_password_too_short_error(self):
         """Test an error is returned if password less than 5 chars."""
         payload = {
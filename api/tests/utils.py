@@ -0,0 +1,25 @@
+"""
+Helpers shared by the API test suites.
+"""
+from contextlib import contextmanager
+
+from core.querylog import record_queries
+
+
+class QueryBudgetMixin:
+    """Adds ``assertMaxQueries`` to a TestCase.
+
+    Unlike ``assertNumQueries`` it counts queries on every database and
+    leaves room below the budget, so a test only fails when an endpoint
+    gets slower.
+    """
+
+    @contextmanager
+    def assertMaxQueries(self, num):
+        with record_queries() as log:
+            yield log
+        if log.count > num:
+            self.fail('%d queries run, at most %d expected:\n%s' % (
+                log.count, num,
+                '\n'.join('%d. [%s] %s' % (i, alias, sql) for i, (alias, sql, _) in enumerate(log.queries, 1)),
+            ))
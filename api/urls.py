@@ -2,7 +2,10 @@ from django.urls import path
 from . views import ListCustomUsersApiView, CreateCustomUserApiView, CompanyCreateListApiView, CompanyUpdateDeleteRetrieveApiView \
     , QuestionCreateListApiView, QuestionUpdateDeleteRetrieveApiView, ApplicationCreateListApiView, ApplicationUpdateDeleteRetrieveApiView \
     , InterviewCreateListApiView, InterviewUpdateDeleteRetrieveApiView, OfferCreateListApiView, OfferUpdateDeleteRetrieveApiView \
-    , ResumeCreateListApiView
+    , ResumeCreateListApiView, QuestionBulkApiView, ApplicationBulkApiView, InterviewBulkApiView \
+    , CompanyFunnelListApiView, CompanyFunnelRetrieveApiView, QuestionSearchApiView, ApplicationSearchApiView \
+    , InterviewSearchApiView, CacheStatsApiView, ApplicationExportApiView, InterviewExportApiView, OfferExportApiView \
+    , InterviewCalendarApiView, InterviewCalendarFeedView
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -17,11 +20,25 @@ urlpatterns = [
     path('company/<int:pk>', CompanyUpdateDeleteRetrieveApiView.as_view(), name='crud-company'),
     path('question', QuestionCreateListApiView.as_view(), name='list-create-question'),
     path('question/<int:pk>', QuestionUpdateDeleteRetrieveApiView.as_view(), name='crud-question'),
+    path('question/bulk', QuestionBulkApiView.as_view(), name='bulk-question'),
+    path('question/search', QuestionSearchApiView.as_view(), name='search-question'),
     path('application', ApplicationCreateListApiView.as_view(), name='list-create-application'),
     path('application/<int:pk>', ApplicationUpdateDeleteRetrieveApiView.as_view(), name='crud-application'),
+    path('application/bulk', ApplicationBulkApiView.as_view(), name='bulk-application'),
+    path('application/search', ApplicationSearchApiView.as_view(), name='search-application'),
+    path('application/export.<str:fmt>', ApplicationExportApiView.as_view(), name='export-application'),
     path('interview', InterviewCreateListApiView.as_view(), name='list-create-interview'),
     path('interview/<int:pk>', InterviewUpdateDeleteRetrieveApiView.as_view(), name='crud-interview'),
+    path('interview/bulk', InterviewBulkApiView.as_view(), name='bulk-interview'),
+    path('interview/search', InterviewSearchApiView.as_view(), name='search-interview'),
+    path('interview/export.<str:fmt>', InterviewExportApiView.as_view(), name='export-interview'),
+    path('interview/calendar', InterviewCalendarApiView.as_view(), name='calendar-interview'),
+    path('interview/calendar/<str:token>.ics', InterviewCalendarFeedView.as_view(), name='calendar-feed'),
     path('offer', OfferCreateListApiView.as_view(), name='list-create-offer'),
     path('offer/<int:pk>', OfferUpdateDeleteRetrieveApiView.as_view(), name='crud-offer'),
+    path('offer/export.<str:fmt>', OfferExportApiView.as_view(), name='export-offer'),
     path('resume', ResumeCreateListApiView.as_view(), name='list-create-resume'),
+    path('funnel', CompanyFunnelListApiView.as_view(), name='list-funnel'),
+    path('funnel/<int:pk>', CompanyFunnelRetrieveApiView.as_view(), name='detail-funnel'),
+    path('cache/stats', CacheStatsApiView.as_view(), name='cache-stats'),
 ]
\ No newline at end of file
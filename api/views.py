@@ -1,10 +1,209 @@
-from rest_framework.generics import ListAPIView, CreateAPIView, ListCreateAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.generics import GenericAPIView, ListAPIView, CreateAPIView, ListCreateAPIView, RetrieveAPIView \
+    , RetrieveUpdateDestroyAPIView
 from . serializers import ListCustomUserSerializer, CustomUserSerializer, CustomTokenObtainPairSerializer, CompanySerializer \
-    , QuestionSerializer, ApplicationSerializer, InterviewSerializer, OfferSerializer, ResumeSerializer
-from django.shortcuts import get_object_or_404
-from rest_framework.permissions import IsAuthenticated
+    , QuestionSerializer, ApplicationSerializer, InterviewSerializer, OfferSerializer, ResumeSerializer \
+    , PrefetchedPrimaryKeyRelatedField, CompanyFunnelSerializer, CalendarInterviewSerializer
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from rest_framework.permissions import SAFE_METHODS, AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework_simplejwt.views import TokenObtainPairView
-from core.models import CustomUser, Company, Question, Application, Interview, Offer, Resume
+from core import funnel
+from .cache import CachedResponseMixin, stats
+from .compiled import CompiledListMixin
+from .conditional import ConditionalGetMixin
+from .filters import BooleanFilter, Filter, IntegerFilter, date_range, parse_timestamp
+from .media import IgnoreClientContentNegotiation
+from .replicas import ReplicaReadMixin
+from core.calendar import feed_queryset, feed_start, feed_token, feed_user, feed_version, ics_lines, upcoming_interviews
+from core.export import EXPORT_FORMATS, export_lines, export_queryset
+from core.search import search
+from core.models import CustomUser, Company, Question, Application, Interview, Offer, Resume, CompanyFunnel
+
+
+class OwnedListMixin:
+    """Limit a list to the requesting user's rows.
+
+    Staff may pass ``?scope=all`` to list every user's rows.
+    """
+    scope_query_param = 'scope'
+    owner_field = 'user_id'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if self.request.query_params.get(self.scope_query_param) == 'all':
+            if not user.is_staff:
+                raise PermissionDenied('Only staff can list all records.')
+            return queryset
+        return queryset.filter(**{self.owner_field: user})
+
+
+def read_columns(model, fields):
+    """Names of ``model``'s columns that the bound serializer ``fields`` read.
+
+    None if one of them reads the whole object (``source='*'``).
+    """
+    columns = set()
+    for field in fields:
+        if field.source == '*':
+            return None
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            continue
+        if model_field.concrete:
+            columns.add(model_field.name)
+    return columns
+
+
+class SparseFieldsMixin:
+    """Handle ``?fields=a,b`` and ``?omit=c,d`` on GET requests.
+
+    Only the selected serializer fields are rendered, and the selection is
+    pushed down to the queryset: ``?fields=`` loads just the columns the
+    rendered fields read with only(), ``?omit=`` defers the columns of the
+    omitted ones. Columns used for ordering and select_related joins stay
+    loaded, so cursors and expanded relations don't cost extra queries.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_sparse_fields(self):
+        """Return the ``(fields, omit)`` names requested, None for either if not given."""
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None, None
+        available = None
+        selection = []
+        for param in (self.fields_query_param, self.omit_query_param):
+            value = request.query_params.get(param)
+            if value is None:
+                selection.append(None)
+                continue
+            names = tuple(name for name in value.split(',') if name)
+            if available is None:
+                available = self.get_serializer_class()(context=self.get_serializer_context()).fields
+            unknown = set(names) - set(available)
+            if unknown:
+                raise ValidationError({param: ['Unknown fields: %s.' % ', '.join(sorted(unknown))]})
+            selection.append(names)
+        return tuple(selection)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields, omit = self.get_sparse_fields()
+        if fields is None and omit is None:
+            return queryset
+        model = queryset.model
+        all_fields = self.get_serializer_class()(context=self.get_serializer_context()).fields
+        needed = read_columns(model, [
+            field for name, field in all_fields.items()
+            if (fields is None or name in fields) and (omit is None or name not in omit)
+        ])
+        if needed is None:
+            return queryset
+        needed.add(model._meta.pk.name)
+        ordering = getattr(self, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        needed.update(field.lstrip('-') for field in ordering)
+        needed.update(getattr(self, 'ordering_fields', None) or ())
+        if isinstance(queryset.query.select_related, dict):
+            needed.update(queryset.query.select_related)
+        needed &= {field.name for field in model._meta.concrete_fields}
+        if fields is not None:
+            return queryset.only(*needed)
+        omitted = read_columns(model, [all_fields[name] for name in omit])
+        deferred = (omitted or set()) - needed
+        return queryset.defer(*deferred) if deferred else queryset
+
+    def get_serializer(self, *args, **kwargs):
+        fields, omit = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        if omit is not None:
+            kwargs.setdefault('omit', omit)
+        return super().get_serializer(*args, **kwargs)
+
+
+class SearchApiView(SparseFieldsMixin, ReplicaReadMixin, ListAPIView):
+    """Ranked full-text search, ``?q=`` is required.
+
+    Returns the best ``?limit=`` matches (default PAGE_SIZE, capped at
+    API_MAX_PAGE_SIZE) instead of a cursor, since rank isn't a stable
+    cursor position.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+    search_query_param = 'q'
+
+    def get_limit(self):
+        default = api_settings.PAGE_SIZE
+        try:
+            limit = int(self.request.query_params.get('limit', default))
+        except ValueError:
+            limit = default
+        return max(1, min(limit, getattr(settings, 'API_MAX_PAGE_SIZE', default)))
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        text = self.request.query_params.get(self.search_query_param, '').strip()
+        if not text:
+            raise ValidationError({self.search_query_param: ['This query parameter is required.']})
+        return search(queryset, text)[:self.get_limit()]
+
+
+class ExpandMixin:
+    """Handle ``?expand=a,b`` for serializers with ``expandable_fields``.
+
+    Single-valued relations are joined with select_related and many-valued
+    ones loaded with prefetch_related, so the query count stays fixed however
+    many rows are returned.
+    """
+    expand_query_param = 'expand'
+
+    def get_expand(self):
+        request = getattr(self, 'request', None)
+        if request is None:
+            return ()
+        value = request.query_params.get(self.expand_query_param, '')
+        expand = tuple(name for name in value.split(',') if name)
+        unknown = set(expand) - set(self.get_serializer_class().expandable_fields)
+        if unknown:
+            raise ValidationError({self.expand_query_param: [
+                'Cannot expand: %s.' % ', '.join(sorted(unknown))
+            ]})
+        return expand
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        expandable = self.get_serializer_class().expandable_fields
+        for name in self.get_expand():
+            _, kwargs = expandable[name]
+            if kwargs.get('many'):
+                queryset = queryset.prefetch_related(kwargs['source'])
+            else:
+                queryset = queryset.select_related(kwargs['source'])
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        return context
 
 
 class CreateCustomUserApiView(CreateAPIView):
@@ -16,14 +215,20 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 
-class ListCustomUsersApiView(ListAPIView):
+class ListCustomUsersApiView(ConditionalGetMixin, CompiledListMixin, SparseFieldsMixin, ReplicaReadMixin, ListAPIView):
     serializer_class = ListCustomUserSerializer
     queryset = CustomUser.objects.all()
+    ordering = ('-id',)
 
 
-class CompanyCreateListApiView(ListCreateAPIView):
+# The cached company views read from the primary: a miss right after a
+# write would otherwise cache the lagging replica's rows for
+# API_CACHE_TIMEOUT, for every user.
+class CompanyCreateListApiView(CachedResponseMixin, ConditionalGetMixin, CompiledListMixin, SparseFieldsMixin, ListCreateAPIView):
     serializer_class = CompanySerializer
     queryset = Company.objects.all()
+    ordering = ('-created_at', '-id')
+    cache_namespace = 'company'
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
@@ -31,85 +236,431 @@ class CompanyCreateListApiView(ListCreateAPIView):
         serializer.save(user_id=request.user)
 
 
-class CompanyUpdateDeleteRetrieveApiView(RetrieveUpdateDestroyAPIView):
+class CompanyUpdateDeleteRetrieveApiView(CachedResponseMixin, ConditionalGetMixin, SparseFieldsMixin, RetrieveUpdateDestroyAPIView):
     serializer_class = CompanySerializer
     queryset = Company.objects.all()
     permission_classes = [IsAuthenticated]
+    cache_namespace = 'company'
 
 
-class QuestionCreateListApiView(ListCreateAPIView):
+class QuestionCreateListApiView(ConditionalGetMixin, CompiledListMixin, SparseFieldsMixin, OwnedListMixin, ReplicaReadMixin, ListCreateAPIView):
     serializer_class = QuestionSerializer
     queryset = Question.objects.all()
+    ordering = ('-created_at', '-id')
+    ordering_fields = ('created_at', 'id')
+    filter_fields = {
+        'company_id': IntegerFilter('company_id'),
+        **date_range('created', 'created_at'),
+    }
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
         request = serializer.context['request']
-        company = get_object_or_404(Company, id=serializer.validated_data['company_id'].id)
-        serializer.save(user_id=request.user, company_id=company)
+        serializer.save(user_id=request.user)
 
 
-class QuestionUpdateDeleteRetrieveApiView(RetrieveUpdateDestroyAPIView):
+class QuestionUpdateDeleteRetrieveApiView(ConditionalGetMixin, SparseFieldsMixin, ReplicaReadMixin, RetrieveUpdateDestroyAPIView):
     serializer_class = QuestionSerializer
     queryset = Question.objects.all()
     permission_classes = [IsAuthenticated]
 
 
-class ApplicationCreateListApiView(ListCreateAPIView):
+class ApplicationCreateListApiView(ConditionalGetMixin, CompiledListMixin, SparseFieldsMixin, ExpandMixin, OwnedListMixin, ReplicaReadMixin, ListCreateAPIView):
     serializer_class = ApplicationSerializer
     queryset = Application.objects.all()
+    ordering = ('-created_at', '-id')
+    ordering_fields = ('created_at', 'id')
+    filter_fields = {
+        'company_id': IntegerFilter('company_id'),
+        'source': Filter('source'),
+        **date_range('created', 'created_at'),
+    }
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
         request = serializer.context['request']
-        company = get_object_or_404(Company, id=serializer.validated_data['company_id'].id)
-        serializer.save(user_id=request.user, company_id=company)
+        serializer.save(user_id=request.user)
 
 
-class ApplicationUpdateDeleteRetrieveApiView(RetrieveUpdateDestroyAPIView):
+class ApplicationUpdateDeleteRetrieveApiView(ConditionalGetMixin, SparseFieldsMixin, ExpandMixin, ReplicaReadMixin, RetrieveUpdateDestroyAPIView):
     serializer_class = ApplicationSerializer
     queryset = Application.objects.all()
     permission_classes = [IsAuthenticated]
 
 
-class InterviewCreateListApiView(ListCreateAPIView):
+class InterviewCreateListApiView(ConditionalGetMixin, CompiledListMixin, SparseFieldsMixin, ReplicaReadMixin, ListCreateAPIView):
     serializer_class = InterviewSerializer
     queryset = Interview.objects.all()
+    ordering = ('-scheduled_at', '-id')
+    ordering_fields = ('scheduled_at', 'id')
+    filter_fields = {
+        'application_id': IntegerFilter('application_id'),
+        'company_id': IntegerFilter('application_id__company_id'),
+        'result': Filter('result'),
+        'round': Filter('round'),
+        **date_range('scheduled', 'scheduled_at'),
+    }
     permission_classes = [IsAuthenticated]
 
-    def perform_create(self, serializer):
-        application = get_object_or_404(Application, id=serializer.validated_data['application_id'].id)
-        serializer.save(application_id=application)
-
 
-class InterviewUpdateDeleteRetrieveApiView(RetrieveUpdateDestroyAPIView):
+class InterviewUpdateDeleteRetrieveApiView(ConditionalGetMixin, SparseFieldsMixin, ReplicaReadMixin, RetrieveUpdateDestroyAPIView):
     serializer_class = InterviewSerializer
     queryset = Interview.objects.all()
     permission_classes = [IsAuthenticated]
 
 
-class OfferCreateListApiView(ListCreateAPIView):
+class InterviewCalendarApiView(SparseFieldsMixin, ReplicaReadMixin, ListAPIView):
+    """The user's interviews in the next ``?days=`` days, soonest first.
+
+    The response also carries the URL of the user's iCalendar feed.
+    """
+    serializer_class = CalendarInterviewSerializer
+    queryset = Interview.objects.select_related('application_id__company_id')
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    def get_days(self):
+        value = self.request.query_params.get('days')
+        if value is None:
+            return settings.CALENDAR_DAYS
+        if not value.isdigit() or not 1 <= int(value) <= settings.CALENDAR_MAX_DAYS:
+            raise ValidationError({'days': ['Enter a whole number from 1 to %d.' % settings.CALENDAR_MAX_DAYS]})
+        return int(value)
+
+    def get_queryset(self):
+        now = timezone.now()
+        end = now + timedelta(days=self.get_days())
+        return upcoming_interviews(self.request.user, now, end, super().get_queryset())
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        feed_url = request.build_absolute_uri(reverse('api:calendar-feed', args=[feed_token(request.user)]))
+        return Response({'feed_url': feed_url, 'results': serializer.data})
+
+
+class InterviewCalendarFeedView(ReplicaReadMixin, GenericAPIView):
+    """Stream a user's interviews as an iCalendar (.ics) feed.
+
+    Authenticated by the token in the URL, as calendar apps can't send a
+    token header. The ETag covers the feed's rows, so polling an unchanged
+    feed costs one aggregate query and returns a 304.
+    """
+    queryset = Interview.objects.all()
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    content_negotiation_class = IgnoreClientContentNegotiation
+    pagination_class = None
+
+    def get(self, request, token, *args, **kwargs):
+        user = feed_user(token)
+        if user is None:
+            raise Http404
+        start = feed_start()
+        queryset = feed_queryset(user, start, self.get_queryset())
+        version = feed_version(queryset)
+        raw = '|'.join(str(part) for part in (
+            user.pk, start.date(), version['count'], version['updated_at'], version['company_updated_at'],
+        ))
+        etag = quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = StreamingHttpResponse(
+                ics_lines(queryset, request.get_host()), content_type='text/calendar; charset=utf-8',
+            )
+            response['Content-Disposition'] = 'inline; filename="interviews.ics"'
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class OfferCreateListApiView(ConditionalGetMixin, CompiledListMixin, SparseFieldsMixin, ExpandMixin, OwnedListMixin, ReplicaReadMixin, ListCreateAPIView):
     serializer_class = OfferSerializer
     queryset = Offer.objects.all()
+    ordering = ('-received_at', '-id')
+    ordering_fields = ('received_at', 'id')
+    filter_fields = {
+        'company_id': IntegerFilter('company_id'),
+        'is_accepted': BooleanFilter('is_accepted'),
+        **date_range('received', 'received_at'),
+    }
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
         request = serializer.context['request']
-        company = get_object_or_404(Company, id=serializer.validated_data['company_id'].id)
-        serializer.save(user_id=request.user, company_id=company)
+        serializer.save(user_id=request.user)
 
 
-class OfferUpdateDeleteRetrieveApiView(RetrieveUpdateDestroyAPIView):
+class OfferUpdateDeleteRetrieveApiView(ConditionalGetMixin, SparseFieldsMixin, ExpandMixin, ReplicaReadMixin, RetrieveUpdateDestroyAPIView):
     serializer_class = OfferSerializer
     queryset = Offer.objects.all()
     permission_classes = [IsAuthenticated]
 
 
-class ResumeCreateListApiView(ListCreateAPIView):
+class ResumeCreateListApiView(ConditionalGetMixin, CompiledListMixin, SparseFieldsMixin, OwnedListMixin, ReplicaReadMixin, ListCreateAPIView):
     serializer_class = ResumeSerializer
     queryset = Resume.objects.all()
+    ordering = ('-id',)
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
         request = serializer.context['request']
-        company = get_object_or_404(Company, id=serializer.validated_data['company_id'].id)
-        serializer.save(user_id=request.user, company_id=company)
\ No newline at end of file
+        serializer.save(user_id=request.user)
+
+
+def _to_pk(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class BulkApiView(GenericAPIView):
+    """Create (POST), update (PATCH) or delete (DELETE) many rows at once.
+
+    The body is a JSON array. Foreign keys referenced by the items are loaded
+    with one IN query per related model, every item is validated before
+    anything is written and the write happens in a single transaction.
+    Validation errors come back as a list aligned with the request items.
+    Non-staff users can only update or delete their own rows.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+    owner_field = 'user_id'
+    set_owner = True
+    max_batch_size = 500
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(**{self.owner_field: self.request.user})
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['prefetched'] = getattr(self, 'prefetched', {})
+        return context
+
+    def get_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({'non_field_errors': ['Expected a non-empty list of items.']})
+        if len(items) > self.max_batch_size:
+            raise ValidationError({'non_field_errors': [
+                'At most %d items can be sent in one request.' % self.max_batch_size
+            ]})
+        return items
+
+    def prefetch_related_objects(self, items):
+        """Load every referenced foreign key object, one query per model."""
+        prefetched = {}
+        for name, field in self.get_serializer().fields.items():
+            if field.read_only or not isinstance(field, PrefetchedPrimaryKeyRelatedField):
+                continue
+            pks = {_to_pk(item.get(name)) for item in items if isinstance(item, dict)}
+            pks.discard(None)
+            queryset = field.get_queryset()
+            prefetched[queryset.model] = queryset.in_bulk(pks)
+        self.prefetched = prefetched
+
+    def check_item_errors(self, serializers, errors=None):
+        errors = errors or [{} for _ in serializers]
+        for index, serializer in enumerate(serializers):
+            if serializer is not None and not serializer.is_valid():
+                errors[index] = serializer.errors
+        if any(errors):
+            raise ValidationError(errors)
+
+    def post(self, request, *args, **kwargs):
+        items = self.get_items(request)
+        self.prefetch_related_objects(items)
+        serializers = [self.get_serializer(data=item) for item in items]
+        self.check_item_errors(serializers)
+
+        model = self.get_queryset().model
+        extra = {'user_id': request.user} if self.set_owner else {}
+        with transaction.atomic():
+            instances = model.objects.bulk_create([
+                model(**serializer.validated_data, **extra) for serializer in serializers
+            ])
+            funnel.record_created(instances)
+        return Response(self.get_serializer(instances, many=True).data, status=status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        items = self.get_items(request)
+        self.prefetch_related_objects(items)
+        pks = [_to_pk(item.get('id')) if isinstance(item, dict) else None for item in items]
+        instances = self.get_queryset().in_bulk([pk for pk in pks if pk is not None])
+
+        serializers = []
+        errors = []
+        for item, pk in zip(items, pks):
+            if pk not in instances:
+                serializers.append(None)
+                errors.append({'id': ['Not found.']})
+                continue
+            serializers.append(self.get_serializer(instances[pk], data=item, partial=True))
+            errors.append({})
+        self.check_item_errors(serializers, errors)
+
+        fields = set()
+        for serializer in serializers:
+            for attr, value in serializer.validated_data.items():
+                setattr(serializer.instance, attr, value)
+                fields.add(attr)
+        updated = [serializer.instance for serializer in serializers]
+        if fields:
+            # bulk_update doesn't apply auto_now, set the timestamp ourselves.
+            now = timezone.now()
+            for instance in updated:
+                instance.updated_at = now
+            fields.add('updated_at')
+            with transaction.atomic():
+                self.get_queryset().model.objects.bulk_update(updated, fields)
+                funnel.record_changes(updated)
+        return Response(self.get_serializer(updated, many=True).data)
+
+    def delete(self, request, *args, **kwargs):
+        items = self.get_items(request)
+        pks = [_to_pk(item) for item in items]
+        found = set(self.get_queryset().filter(pk__in=[pk for pk in pks if pk is not None])
+                    .values_list('pk', flat=True))
+        errors = [{} if pk in found else {'id': ['Not found.']} for pk in pks]
+        if any(errors):
+            raise ValidationError(errors)
+
+        with transaction.atomic():
+            self.get_queryset().filter(pk__in=found).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class QuestionBulkApiView(BulkApiView):
+    serializer_class = QuestionSerializer
+    queryset = Question.objects.all()
+
+
+class ApplicationBulkApiView(BulkApiView):
+    serializer_class = ApplicationSerializer
+    queryset = Application.objects.all()
+
+
+class InterviewBulkApiView(BulkApiView):
+    serializer_class = InterviewSerializer
+    queryset = Interview.objects.all()
+    owner_field = 'application_id__user_id'
+    set_owner = False
+
+
+class CompanyFunnelListApiView(ConditionalGetMixin, CompiledListMixin, SparseFieldsMixin, ReplicaReadMixin, ListAPIView):
+    serializer_class = CompanyFunnelSerializer
+    queryset = CompanyFunnel.objects.select_related('company_id')
+    permission_classes = [IsAdminUser]
+    ordering = ('company_id',)
+
+
+class CompanyFunnelRetrieveApiView(ConditionalGetMixin, SparseFieldsMixin, ReplicaReadMixin, RetrieveAPIView):
+    serializer_class = CompanyFunnelSerializer
+    queryset = CompanyFunnel.objects.select_related('company_id')
+    permission_classes = [IsAdminUser]
+
+
+class QuestionSearchApiView(SearchApiView):
+    serializer_class = QuestionSerializer
+    queryset = Question.objects.all()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        company_id = self.request.query_params.get('company_id')
+        if company_id is not None:
+            if not company_id.isdigit():
+                raise ValidationError({'company_id': ['A valid integer is required.']})
+            queryset = queryset.filter(company_id=company_id)
+        return queryset
+
+
+class ApplicationSearchApiView(OwnedListMixin, SearchApiView):
+    serializer_class = ApplicationSerializer
+    queryset = Application.objects.all()
+
+
+class InterviewSearchApiView(OwnedListMixin, SearchApiView):
+    serializer_class = InterviewSerializer
+    queryset = Interview.objects.all()
+    owner_field = 'application_id__user_id'
+
+
+class CacheStatsApiView(APIView):
+    permission_classes = [IsAdminUser]
+    cache_namespaces = ('company',)
+
+    def get(self, request):
+        return Response({namespace: stats(namespace) for namespace in self.cache_namespaces})
+
+
+class ExportApiView(ReplicaReadMixin, GenericAPIView):
+    """Stream rows as ``.csv`` or ``.ndjson``.
+
+    Accepts ``company_id`` and a ``since``/``until`` range (ISO date or
+    datetime) on the export's date column. Non-staff users only export
+    their own rows.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+    owner_field = 'user_id'
+    export_kind = None
+    content_types = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(**{self.owner_field: self.request.user})
+
+    def get_date_param(self, name):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
+        parsed = parse_timestamp(value)
+        if parsed is None:
+            raise ValidationError({name: ['Enter a valid ISO date or datetime.']})
+        return parsed
+
+    def get(self, request, fmt, *args, **kwargs):
+        if fmt not in EXPORT_FORMATS:
+            raise Http404
+        company_id = request.query_params.get('company_id')
+        if company_id is not None and not company_id.isdigit():
+            raise ValidationError({'company_id': ['A valid integer is required.']})
+
+        rows = export_queryset(
+            self.export_kind,
+            queryset=self.get_queryset(),
+            company_id=company_id,
+            since=self.get_date_param('since'),
+            until=self.get_date_param('until'),
+        )
+        response = StreamingHttpResponse(
+            export_lines(self.export_kind, rows, fmt),
+            content_type=self.content_types[fmt],
+        )
+        response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (self.export_kind, fmt)
+        return response
+
+
+class ApplicationExportApiView(ExportApiView):
+    queryset = Application.objects.all()
+    export_kind = 'applications'
+
+
+class InterviewExportApiView(ExportApiView):
+    queryset = Interview.objects.all()
+    export_kind = 'interviews'
+    owner_field = 'application_id__user_id'
+
+
+class OfferExportApiView(ExportApiView):
+    queryset = Offer.objects.all()
+    export_kind = 'offers'
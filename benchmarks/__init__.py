@@ -0,0 +1,8 @@
+"""
+Benchmarks for the placement management API.
+
+Each module is a script run from the project root, e.g.
+``python -m benchmarks.register``. They build a throwaway test database
+from the configured settings, so point DJANGO_SETTINGS_MODULE at the
+database you want to measure.
+"""
@@ -0,0 +1,85 @@
+"""
+Read endpoint throughput through the WSGI handler (sync views, one thread
+per client) and the ASGI handler (async views, one event loop).
+
+    python -m benchmarks.async_reads --requests 2000 --concurrency 64
+
+Both paths run in process against the same seeded test database, without
+a network server, so the numbers compare request handling only. Clients
+alternate between a list page and a detail.
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.utils import setup, test_database, run_concurrently, print_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--rows', type=int, default=500, help='Questions seeded for the user.')
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+    from asgiref.sync import sync_to_async
+    from django.contrib.auth import get_user_model
+    from django.db import connections
+    from django.test import AsyncClient, Client
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from core.models import Company, Question
+
+    per_client = max(1, args.requests // args.concurrency)
+
+    with test_database():
+        user = get_user_model().objects.create_user(email='bench@example.com', password='benchmark-password')
+        company = Company.objects.create(user_id=user, name='Benchmark')
+        Question.objects.bulk_create(
+            [Question(user_id=user, company_id=company, content='Question %d' % i) for i in range(args.rows)],
+            batch_size=1000,
+        )
+        question_id = Question.objects.values_list('id', flat=True).first()
+        authorization = 'Bearer %s' % RefreshToken.for_user(user).access_token
+        urls = ['/api/question?page_size=%d' % args.page_size, '/api/question/%d' % question_id]
+
+        latencies = []
+
+        def wsgi_client(index):
+            client = Client(HTTP_AUTHORIZATION=authorization)
+            for i in range(per_client):
+                started = time.perf_counter()
+                res = client.get(urls[i % len(urls)])
+                latencies.append(time.perf_counter() - started)
+                assert res.status_code == 200, res.content
+
+        elapsed = run_concurrently(wsgi_client, args.concurrency)
+        print_latencies('WSGI sync views x%d threads' % args.concurrency, latencies, elapsed)
+
+        latencies = []
+
+        async def asgi_client(index):
+            client = AsyncClient()
+            for i in range(per_client):
+                started = time.perf_counter()
+                res = await client.get(urls[i % len(urls)], authorization=authorization)
+                latencies.append(time.perf_counter() - started)
+                assert res.status_code == 200, res.content
+
+        async def run_asgi():
+            started = time.perf_counter()
+            try:
+                await asyncio.gather(*(asgi_client(i) for i in range(args.concurrency)))
+                return time.perf_counter() - started
+            finally:
+                # The async ORM ran its queries in asgiref's sync thread.
+                await sync_to_async(connections.close_all)()
+
+        elapsed = asyncio.run(run_asgi())
+        print_latencies('ASGI async views x%d tasks' % args.concurrency, latencies, elapsed)
+
+
+if __name__ == '__main__':
+    main()
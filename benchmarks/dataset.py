@@ -0,0 +1,154 @@
+"""
+Synthetic placement season for the benchmarks.
+
+``seed(scale)`` fills the database with SEASON rows times ``scale`` using
+bulk_create. Users and companies are drawn from a Zipf-like distribution
+with exponent ``skew``, so a few students apply everywhere and a few
+companies get most applications, as in a real season. 0 makes them
+uniform. Timestamps are spread over the SEASON_DAYS before now.
+"""
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+
+SEASON = {
+    'users': 50_000,
+    'companies': 5_000,
+    'questions': 200_000,
+    'applications': 1_000_000,
+    'interviews': 2_000_000,
+    'offers': 50_000,
+}
+SEASON_DAYS = 180
+PASSWORD = 'benchmark-password'
+
+WORDS = (
+    'binary tree graph dynamic programming array string hash map heap stack queue sorting '
+    'recursion system design database index cache api latency concurrency thread process'
+).split()
+SOURCES = ['Campus', 'Referral', 'LinkedIn', 'Careers page', None]
+ROUNDS = ['Online test', 'Technical 1', 'Technical 2', 'Managerial', 'HR']
+RESULTS = ['Passed', 'Failed', 'Pending', None]
+
+
+def zipf_weights(count, skew):
+    """Cumulative weights of ranks 1..count for random.choices."""
+    return list(accumulate(1 / (rank ** skew) for rank in range(1, count + 1)))
+
+
+@contextmanager
+def plain_timestamps(*models):
+    """Let bulk_create store the given created_at values instead of now."""
+    fields = [field for model in models for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now_add', False) or getattr(field, 'auto_now', False)]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def insert(model, rows, batch_size):
+    """bulk_create ``rows`` (an iterable) in batches of ``batch_size``."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+def seed(scale=0.01, skew=1.0, seed=0, batch_size=5000, stdout=None):
+    """Create a season of ``scale`` size and return the row counts."""
+    from core import funnel
+    from core.models import Application, Company, CustomUser, Interview, Offer, Question
+
+    rng = random.Random(seed)
+    counts = {name: max(1, int(size * scale)) for name, size in SEASON.items()}
+    now = timezone.now()
+
+    def moment():
+        return now - timedelta(seconds=rng.randrange(SEASON_DAYS * 24 * 60 * 60))
+
+    def text(words):
+        return ' '.join(rng.choices(WORDS, k=words))
+
+    def log(message):
+        if stdout is not None:
+            stdout.write(message + '\n')
+
+    password = make_password(PASSWORD)
+    models = (CustomUser, Company, Question, Application, Interview, Offer)
+    with plain_timestamps(*models), transaction.atomic():
+        insert(CustomUser, (
+            CustomUser(
+                email='student%d@example.com' % i, username='student%d' % i, password=password,
+                firstName='Student', lastName=str(i), updated_at=moment(),
+            )
+            for i in range(counts['users'])
+        ), batch_size)
+        user_ids = list(CustomUser.objects.order_by('pk').values_list('pk', flat=True))
+        user_weights = zipf_weights(len(user_ids), skew)
+        log('%d users' % len(user_ids))
+
+        insert(Company, (
+            Company(name='Company %d' % i, user_id_id=rng.choice(user_ids), created_at=moment(), updated_at=now)
+            for i in range(counts['companies'])
+        ), batch_size)
+        company_ids = list(Company.objects.order_by('pk').values_list('pk', flat=True))
+        company_weights = zipf_weights(len(company_ids), skew)
+        log('%d companies' % len(company_ids))
+
+        def pairs(count):
+            users = rng.choices(user_ids, cum_weights=user_weights, k=count)
+            companies = rng.choices(company_ids, cum_weights=company_weights, k=count)
+            return zip(users, companies)
+
+        insert(Question, (
+            Question(user_id_id=user, company_id_id=company, content=text(12), created_at=moment(), updated_at=now)
+            for user, company in pairs(counts['questions'])
+        ), batch_size)
+        log('%d questions' % counts['questions'])
+
+        insert(Application, (
+            Application(
+                user_id_id=user, company_id_id=company, notes=text(8), source=rng.choice(SOURCES),
+                created_at=moment(), updated_at=now,
+            )
+            for user, company in pairs(counts['applications'])
+        ), batch_size)
+        application_ids = list(Application.objects.order_by('pk').values_list('pk', flat=True))
+        log('%d applications' % len(application_ids))
+
+        insert(Interview, (
+            Interview(
+                application_id_id=application, notes=text(6), round=rng.choice(ROUNDS),
+                result=rng.choice(RESULTS), scheduled_at=moment(), updated_at=now,
+            )
+            for application in rng.choices(application_ids, k=counts['interviews'])
+        ), batch_size)
+        del application_ids
+        log('%d interviews' % counts['interviews'])
+
+        insert(Offer, (
+            Offer(
+                user_id_id=user, company_id_id=company, ctc='%d LPA' % rng.randrange(3, 60),
+                received_at=moment(), is_accepted=rng.random() < 0.6, updated_at=now,
+            )
+            for user, company in pairs(counts['offers'])
+        ), batch_size)
+        log('%d offers' % counts['offers'])
+
+    funnel.rebuild()
+    return counts
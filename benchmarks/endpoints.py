@@ -0,0 +1,275 @@
+"""
+Latency of every API route against a synthetic placement season.
+
+    python -m benchmarks.endpoints --scale 0.01 --requests 50
+    python -m benchmarks.endpoints --scale 1 --keepdb --save-baseline baseline.json
+    python -m benchmarks.endpoints --scale 1 --keepdb --baseline baseline.json
+
+The test database is seeded by benchmarks.dataset; --scale 1 is 50k users,
+5k companies, 1M applications and 2M interviews. Each route in api/urls.py
+is then driven through the test client as the busiest student, and the
+p50/p95/p99 latency, the most queries a request ran and the process' peak
+RSS after the route are printed.
+
+--save-baseline stores the results. With --baseline the run exits with
+status 1 when a route's p95 grew by more than --tolerance (plus --slack-ms
+for very fast routes), when it runs more queries, or when the peak RSS grew
+by more than --tolerance. It also fails when a route in api/urls.py has no
+scenario below, so new routes get benchmarked too. Baselines only compare
+between runs on the same machine and database with the same --scale and
+--skew.
+"""
+import argparse
+import json
+import resource
+import sys
+import time
+
+from benchmarks.utils import percentile, setup, test_database
+
+
+class Scenario:
+    """``method`` requests to ``path``, the URL of route ``name``.
+
+    ``data`` is a payload, or a callable returning the i-th request's.
+    ``share`` scales the number of requests, for routes too slow to run
+    --requests times.
+    """
+
+    def __init__(self, name, method, path, data=None, client='user', share=1.0):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.client = client
+        self.share = share
+
+    @property
+    def label(self):
+        return '%s %s' % (self.method.upper(), self.name)
+
+    def payload(self, i):
+        return self.data(i) if callable(self.data) else self.data
+
+
+def scenarios(user, refresh):
+    """Return the scenarios run as ``user``, who owns the objects used."""
+    from django.urls import reverse
+
+    from benchmarks.dataset import PASSWORD
+    from core.calendar import feed_token
+    from core.models import Application, Interview, Offer, Question
+
+    question = Question.objects.filter(user_id=user).latest('pk')
+    application = Application.objects.filter(user_id=user).latest('pk')
+    interview = Interview.objects.filter(application_id__user_id=user).latest('pk')
+    offer = Offer.objects.filter(user_id=user).latest('pk')
+    company = application.company_id_id
+
+    def url(name, *args):
+        return reverse('api:%s' % name, args=args)
+
+    def note(i):
+        return {'company_id': company, 'notes': 'Benchmark note %d' % i}
+
+    return [
+        Scenario('signup', 'post', url('signup'), lambda i: {
+            'email': 'signup%d@benchmark.example.com' % i, 'password': PASSWORD,
+        }, client='anonymous'),
+        Scenario('signin', 'post', url('signin'), {'email': user.email, 'password': PASSWORD}, client='anonymous'),
+        Scenario('refresh', 'post', url('refresh'), {'refresh': refresh}, client='anonymous'),
+        Scenario('list-users', 'get', url('list-users')),
+        Scenario('list-create-company', 'get', url('list-create-company')),
+        Scenario('list-create-company', 'post', url('list-create-company'), lambda i: {'name': 'Benchmark %d' % i}),
+        Scenario('crud-company', 'get', url('crud-company', company)),
+        Scenario('crud-company', 'patch', url('crud-company', company), lambda i: {'name': 'Company %d' % i}),
+        Scenario('list-create-question', 'get', url('list-create-question')),
+        Scenario('list-create-question', 'post', url('list-create-question'), lambda i: {
+            'company_id': company, 'content': 'Benchmark question %d' % i,
+        }),
+        Scenario('crud-question', 'get', url('crud-question', question.pk)),
+        Scenario('crud-question', 'patch', url('crud-question', question.pk), lambda i: {
+            'content': 'Edited question %d' % i,
+        }),
+        Scenario('bulk-question', 'post', url('bulk-question'), lambda i: [
+            {'company_id': company, 'content': 'Bulk question %d.%d' % (i, j)} for j in range(20)
+        ]),
+        Scenario('search-question', 'get', url('search-question') + '?q=binary+tree'),
+        Scenario('list-create-application', 'get', url('list-create-application') + '?expand=company,interviews'),
+        Scenario('list-create-application', 'post', url('list-create-application'), note),
+        Scenario('crud-application', 'get', url('crud-application', application.pk) + '?expand=company,interviews'),
+        Scenario('crud-application', 'patch', url('crud-application', application.pk), lambda i: {
+            'notes': 'Edited note %d' % i,
+        }),
+        Scenario('bulk-application', 'post', url('bulk-application'), lambda i: [note(i) for _ in range(20)]),
+        Scenario('search-application', 'get', url('search-application') + '?q=database'),
+        Scenario('export-application', 'get', url('export-application', 'csv'), share=0.1),
+        Scenario('list-create-interview', 'get', url('list-create-interview')),
+        Scenario('list-create-interview', 'post', url('list-create-interview'), lambda i: {
+            'application_id': application.pk, 'notes': 'Benchmark round %d' % i,
+            'scheduled_at': '2024-01-01T10:00:00Z',
+        }),
+        Scenario('crud-interview', 'get', url('crud-interview', interview.pk)),
+        Scenario('crud-interview', 'patch', url('crud-interview', interview.pk), lambda i: {
+            'result': 'Passed' if i % 2 else 'Failed',
+        }),
+        Scenario('bulk-interview', 'post', url('bulk-interview'), lambda i: [{
+            'application_id': application.pk, 'notes': 'Bulk round %d.%d' % (i, j),
+            'scheduled_at': '2024-01-01T10:00:00Z',
+        } for j in range(20)]),
+        Scenario('calendar-interview', 'get', url('calendar-interview')),
+        Scenario('calendar-feed', 'get', url('calendar-feed', feed_token(user)), client='anonymous'),
+        Scenario('search-interview', 'get', url('search-interview') + '?q=system+design'),
+        Scenario('export-interview', 'get', url('export-interview', 'ndjson'), share=0.1),
+        Scenario('list-create-offer', 'get', url('list-create-offer') + '?expand=company'),
+        Scenario('list-create-offer', 'post', url('list-create-offer'), lambda i: {
+            'company_id': company, 'ctc': '%d LPA' % i, 'received_at': '2024-01-01T10:00:00Z',
+        }),
+        Scenario('crud-offer', 'get', url('crud-offer', offer.pk)),
+        Scenario('crud-offer', 'patch', url('crud-offer', offer.pk), lambda i: {'is_accepted': bool(i % 2)}),
+        Scenario('export-offer', 'get', url('export-offer', 'csv'), share=0.1),
+        Scenario('list-create-resume', 'get', url('list-create-resume')),
+        Scenario('list-funnel', 'get', url('list-funnel'), client='staff'),
+        Scenario('detail-funnel', 'get', url('detail-funnel', company), client='staff'),
+        Scenario('cache-stats', 'get', url('cache-stats'), client='staff'),
+    ]
+
+
+def missing_routes(scenario_list):
+    from api.urls import urlpatterns
+
+    return sorted({pattern.name for pattern in urlpatterns} - {scenario.name for scenario in scenario_list})
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(client, scenario, requests):
+    """Run ``scenario`` and return its latency percentiles and query count."""
+    from core.querylog import record_queries
+
+    def request(i):
+        data = scenario.payload(i)
+        kwargs = {} if data is None else {'data': json.dumps(data), 'content_type': 'application/json'}
+        with record_queries() as log:
+            started = time.perf_counter()
+            res = getattr(client, scenario.method)(scenario.path, **kwargs)
+            if res.streaming:
+                b''.join(res.streaming_content)
+            elapsed = time.perf_counter() - started
+        if res.status_code >= 400:
+            raise SystemExit('%s returned %d: %s' % (scenario.label, res.status_code, res.content[:500]))
+        return elapsed, log.count
+
+    request(0)
+    latencies, queries = [], []
+    for i in range(1, max(1, int(requests * scenario.share)) + 1):
+        elapsed, count = request(i)
+        latencies.append(elapsed)
+        queries.append(count)
+    return {
+        'requests': len(latencies),
+        'p50': percentile(latencies, 50) * 1000,
+        'p95': percentile(latencies, 95) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+        'queries': max(queries),
+        'rss_mb': peak_rss_mb(),
+    }
+
+
+def compare(results, baseline, tolerance, slack_ms):
+    """Return a message for each regression against ``baseline``."""
+    regressions = []
+    for label, result in results['routes'].items():
+        base = baseline['routes'].get(label)
+        if base is None:
+            continue
+        if result['p95'] > base['p95'] * (1 + tolerance) + slack_ms:
+            regressions.append('%s: p95 %.1fms, baseline %.1fms' % (label, result['p95'], base['p95']))
+        if result['queries'] > base['queries']:
+            regressions.append('%s: %d queries, baseline %d' % (label, result['queries'], base['queries']))
+    if results['rss_mb'] > baseline['rss_mb'] * (1 + tolerance):
+        regressions.append('peak RSS %.0fMB, baseline %.0fMB' % (results['rss_mb'], baseline['rss_mb']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=0.01, help='Fraction of a full season to seed.')
+    parser.add_argument('--skew', type=float, default=1.0, help='Zipf exponent of user and company activity.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--requests', type=int, default=50, help='Measured requests per route.')
+    parser.add_argument('--keepdb', action='store_true', help='Keep the seeded database for the next run.')
+    parser.add_argument('--baseline', help='Fail on regressions against this baseline file.')
+    parser.add_argument('--save-baseline', help='Write the results to this baseline file.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative slowdown.')
+    parser.add_argument('--slack-ms', type=float, default=2.0, help='Allowed absolute slowdown.')
+    args = parser.parse_args()
+
+    setup()
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count
+    from django.test import Client
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from benchmarks.dataset import seed
+
+    with test_database(keepdb=args.keepdb):
+        User = get_user_model()
+        if not User.objects.filter(email__endswith='@example.com').exists():
+            started = time.perf_counter()
+            counts = seed(args.scale, args.skew, args.seed, stdout=sys.stdout)
+            print('Seeded %s in %.1fs' % (', '.join('%d %s' % (n, name) for name, n in counts.items()),
+                                            time.perf_counter() - started))
+
+        user = User.objects.annotate(count=Count('user_applications')).order_by('-count').first()
+        staff, _ = User.objects.get_or_create(email='staff@benchmark.example.com', defaults={'is_staff': True})
+        refresh = RefreshToken.for_user(user)
+        clients = {
+            'anonymous': Client(),
+            'user': Client(HTTP_AUTHORIZATION='Bearer %s' % refresh.access_token),
+            'staff': Client(HTTP_AUTHORIZATION='Bearer %s' % RefreshToken.for_user(staff).access_token),
+        }
+
+        scenario_list = scenarios(user, str(refresh))
+        missing = missing_routes(scenario_list)
+        if missing:
+            raise SystemExit('Routes without a benchmark scenario: %s' % ', '.join(missing))
+
+        results = {
+            'scale': args.scale,
+            'skew': args.skew,
+            'requests': args.requests,
+            'routes': {},
+        }
+        print('%-34s %8s %8s %8s %8s %8s' % ('route', 'p50 ms', 'p95 ms', 'p99 ms', 'queries', 'RSS MB'))
+        for scenario in scenario_list:
+            result = run(clients[scenario.client], scenario, args.requests)
+            results['routes'][scenario.label] = result
+            print('%-34s %8.1f %8.1f %8.1f %8d %8.0f' % (
+                scenario.label, result['p50'], result['p95'], result['p99'], result['queries'], result['rss_mb'],
+            ))
+        results['rss_mb'] = peak_rss_mb()
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+        print('Baseline written to %s' % args.save_baseline)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        if (baseline['scale'], baseline['skew']) != (args.scale, args.skew):
+            print('Warning: baseline was run with --scale %s --skew %s' % (baseline['scale'], baseline['skew']))
+        regressions = compare(results, baseline, args.tolerance, args.slack_ms)
+        for regression in regressions:
+            print('REGRESSION %s' % regression)
+        if regressions:
+            sys.exit(1)
+        print('No regressions against %s' % args.baseline)
+
+
+if __name__ == '__main__':
+    main()
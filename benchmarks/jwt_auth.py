@@ -0,0 +1,62 @@
+"""
+Per-request cost of JWT authentication with and without the user cache.
+
+    python -m benchmarks.jwt_auth --requests 2000
+
+Runs the same question detail GET with simplejwt's JWTAuthentication,
+which loads the user on every request, and with CachedJWTAuthentication,
+and prints the queries per request and the latencies of each.
+"""
+import argparse
+import time
+from unittest import mock
+
+from benchmarks.utils import setup, test_database, print_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup()
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.views import APIView
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from api.authentication import CachedJWTAuthentication
+    from core.models import Company, Question
+
+    with test_database():
+        user = get_user_model().objects.create_user(email='bench@example.com', password='benchmark-password')
+        company = Company.objects.create(user_id=user, name='Benchmark')
+        question = Question.objects.create(user_id=user, company_id=company, content='Question')
+        client = Client(HTTP_AUTHORIZATION='Bearer %s' % RefreshToken.for_user(user).access_token)
+        url = '/api/question/%d' % question.id
+
+        for authentication in (JWTAuthentication, CachedJWTAuthentication):
+            cache.clear()
+            with mock.patch.object(APIView, 'authentication_classes', [authentication]):
+                client.get(url)
+                with CaptureQueriesContext(connection) as ctx:
+                    res = client.get(url)
+                assert res.status_code == 200, res.content
+                print('%s: %d queries per request' % (authentication.__name__, len(ctx.captured_queries)))
+
+                latencies = []
+                started = time.perf_counter()
+                for _ in range(args.requests):
+                    request_started = time.perf_counter()
+                    res = client.get(url)
+                    latencies.append(time.perf_counter() - request_started)
+                    assert res.status_code == 200, res.content
+                print_latencies(authentication.__name__, latencies, time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Registration throughput under a concurrent sign-up burst.
+
+    python -m benchmarks.register --users 400 --concurrency 16
+"""
+import argparse
+import time
+
+from benchmarks.utils import setup, test_database, run_concurrently, print_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    setup()
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    url = reverse('api:signup')
+    per_thread = args.users // args.concurrency
+    latencies = []
+
+    def register(thread_index):
+        client = Client()
+        for i in range(per_thread):
+            payload = {
+                'email': 'bench-%s-%s@example.com' % (thread_index, i),
+                'username': 'bench-%s-%s' % (thread_index, i),
+                'password': 'benchmark-password',
+            }
+            started = time.perf_counter()
+            res = client.post(url, payload)
+            latencies.append(time.perf_counter() - started)
+            assert res.status_code == 201, res.content
+
+    with test_database():
+        with CaptureQueriesContext(connection) as ctx:
+            res = Client().post(url, {'email': 'warmup@example.com', 'password': 'benchmark-password'})
+        assert res.status_code == 201, res.content
+        print('queries per registration: %d' % len(ctx.captured_queries))
+
+        elapsed = run_concurrently(register, args.concurrency)
+        print_latencies('register x%d threads' % args.concurrency, latencies, elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Rows per second of the compiled serializers against DRF's.
+
+    python -m benchmarks.serializers --rows 20000 --repeat 5
+
+Seeds a small synthetic season, then for the application and interview
+serializers times reading ``--rows`` rows and turning them into JSON two
+ways: model instances through the ModelSerializer, and ``values()`` rows
+through the compiled serializer. Checks the JSON is byte-identical and
+prints the best of ``--repeat`` runs for each.
+"""
+import argparse
+import time
+
+from benchmarks.utils import setup, test_database
+
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    setup()
+    from rest_framework.renderers import JSONRenderer
+
+    from api.compiled import compile_serializer
+    from api.serializers import ApplicationSerializer, InterviewSerializer
+    from benchmarks.dataset import SEASON, seed
+    from core.models import Application, Interview
+
+    renderer = JSONRenderer()
+    with test_database(keepdb=args.keepdb):
+        if not Interview.objects.exists():
+            seed(scale=max(args.rows / SEASON['applications'], 0.001))
+
+        for model, serializer_class in ((Application, ApplicationSerializer), (Interview, InterviewSerializer)):
+            queryset = model.objects.order_by('id')[:args.rows]
+            compiled = compile_serializer(serializer_class(context={}))
+            rows = queryset.values(*compiled.columns)
+
+            def drf():
+                return renderer.render(serializer_class(list(queryset), many=True).data)
+
+            def fast():
+                return renderer.render(compiled.dump(list(rows)))
+
+            assert drf() == fast(), 'compiled JSON differs for %s' % serializer_class.__name__
+            count = len(rows)
+            drf_time = best_time(drf, args.repeat)
+            fast_time = best_time(fast, args.repeat)
+            print('%s, %d rows:' % (serializer_class.__name__, count))
+            print('  ModelSerializer  %9.0f rows/s' % (count / drf_time))
+            print('  compiled         %9.0f rows/s  (%.1fx)' % (count / fast_time, drf_time / fast_time))
+
+
+if __name__ == '__main__':
+    main()
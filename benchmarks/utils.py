@@ -0,0 +1,73 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def setup():
+    """Configure Django for a standalone script."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'placement_management.settings')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(verbosity=0, keepdb=False):
+    """Run the block against a fresh test database, like the test runner.
+
+    With ``keepdb`` the database and its rows are kept for the next run.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity, keepdb=keepdb)
+        teardown_test_environment()
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples (nearest rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_concurrently(worker, concurrency):
+    """Call ``worker(index)`` in ``concurrency`` threads and wait for all.
+
+    Each thread closes its own database connection when it finishes.
+    """
+    from django.db import connections
+
+    def target(index):
+        try:
+            worker(index)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def print_latencies(title, samples, elapsed):
+    """Print throughput and latency percentiles in milliseconds."""
+    print('%s: %d requests in %.2fs, %.1f req/s' % (title, len(samples), elapsed, len(samples) / elapsed))
+    print('  p50 %.1fms  p95 %.1fms  p99 %.1fms' % (
+        percentile(samples, 50) * 1000,
+        percentile(samples, 95) * 1000,
+        percentile(samples, 99) * 1000,
+    ))
@@ -1,12 +1,135 @@
 from django.contrib import admin
-from . models import CustomUser, Company, Application, Resume, Offer, Interview, Question
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from . db import estimated_count
+from . funnel import PASSED_RESULT
+from . models import CustomUser, Company, Application, Resume, Offer, Interview, Question, CompanyFunnel, MediaBlob
 
 
-# Register your models here.
-admin.site.register(CustomUser)
-admin.site.register(Company)
-admin.site.register(Application)
-admin.site.register(Resume)
-admin.site.register(Offer)
-admin.site.register(Interview)
-admin.site.register(Question)
\ No newline at end of file
+class EstimatedCountPaginator(Paginator):
+    """Paginator that trusts Postgres row estimates for large tables.
+
+    Falls back to an exact count for small results and non-Postgres
+    databases, so page numbers are exact in tests.
+    """
+
+    @cached_property
+    def count(self):
+        return estimated_count(self.object_list)
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist settings for tables that grow every season."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class CompanyColumnMixin:
+    """Show the company name without going through ``Company.__str__``,
+    which would load the company's user for every row."""
+
+    @admin.display(description='Company', ordering='company_id__name')
+    def company(self, obj):
+        return obj.company_id.name if obj.company_id else None
+
+
+class InterviewResultFilter(admin.SimpleListFilter):
+    """Filter on fixed result groups. ``list_filter = ('result',)`` would
+    offer every distinct free-text result, read with a DISTINCT over the
+    whole table on each changelist load."""
+    title = 'result'
+    parameter_name = 'result'
+
+    def lookups(self, request, model_admin):
+        return (
+            ('passed', 'Passed'),
+            ('other', 'Other result'),
+            ('none', 'No result'),
+        )
+
+    def queryset(self, request, queryset):
+        no_result = Q(result__isnull=True) | Q(result='')
+        if self.value() == 'passed':
+            return queryset.filter(result__iexact=PASSED_RESULT)
+        if self.value() == 'other':
+            return queryset.exclude(no_result).exclude(result__iexact=PASSED_RESULT)
+        if self.value() == 'none':
+            return queryset.filter(no_result)
+        return queryset
+
+
+@admin.register(CustomUser)
+class CustomUserAdmin(admin.ModelAdmin):
+    list_display = ('email', 'username', 'firstName', 'lastName', 'is_staff', 'is_active')
+    search_fields = ('email', 'username')
+
+
+@admin.register(Company)
+class CompanyAdmin(admin.ModelAdmin):
+    list_display = ('name', 'user_id', 'created_at')
+    list_select_related = ('user_id',)
+    search_fields = ('name',)
+    ordering = ('-created_at', '-id')
+    autocomplete_fields = ('user_id',)
+
+    def get_queryset(self, request):
+        # Company.__str__ reads the user's email, autocomplete results included.
+        return super().get_queryset(request).select_related('user_id')
+
+
+@admin.register(Question)
+class QuestionAdmin(CompanyColumnMixin, LargeTableAdmin):
+    list_display = ('id', 'user_id', 'company', 'created_at')
+    date_hierarchy = 'created_at'
+    list_select_related = ('user_id', 'company_id')
+    autocomplete_fields = ('user_id', 'company_id')
+
+
+@admin.register(Application)
+class ApplicationAdmin(CompanyColumnMixin, LargeTableAdmin):
+    list_display = ('id', 'user_id', 'company', 'source', 'created_at')
+    date_hierarchy = 'created_at'
+    list_select_related = ('user_id', 'company_id')
+    autocomplete_fields = ('user_id', 'company_id')
+
+
+@admin.register(Interview)
+class InterviewAdmin(LargeTableAdmin):
+    list_display = ('id', 'application', 'round', 'result', 'scheduled_at')
+    list_filter = (InterviewResultFilter,)
+    date_hierarchy = 'scheduled_at'
+    list_select_related = ('application_id__user_id', 'application_id__company_id')
+    raw_id_fields = ('application_id',)
+
+    @admin.display(description='Application', ordering='application_id')
+    def application(self, obj):
+        return str(obj.application_id)
+
+
+@admin.register(Offer)
+class OfferAdmin(CompanyColumnMixin, admin.ModelAdmin):
+    list_display = ('id', 'user_id', 'company', 'ctc', 'received_at', 'is_accepted')
+    list_select_related = ('user_id', 'company_id')
+    autocomplete_fields = ('user_id', 'company_id')
+
+
+@admin.register(Resume)
+class ResumeAdmin(CompanyColumnMixin, admin.ModelAdmin):
+    list_display = ('id', 'user_id', 'company', 'resume', 'width', 'height', 'processed_at')
+    list_select_related = ('user_id', 'company_id')
+    autocomplete_fields = ('user_id', 'company_id')
+    readonly_fields = ('width', 'height', 'size', 'renditions', 'processed_at')
+
+
+@admin.register(CompanyFunnel)
+class CompanyFunnelAdmin(CompanyColumnMixin, admin.ModelAdmin):
+    list_display = ('company', 'applications', 'interviews', 'interviews_passed', 'offers', 'offers_accepted', 'updated_at')
+    list_select_related = ('company_id',)
+    readonly_fields = ('company_id', 'applications', 'interviews', 'interviews_passed', 'offers', 'offers_accepted')
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'references', 'created_at')
+    readonly_fields = ('name', 'size', 'references', 'created_at')
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.core.checks import Tags, register
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from . import signals, user_cache  # noqa: F401
+        register(user_cache.check_shared_cache, Tags.caches, deploy=True)
+        from .search import install_search_triggers
+        post_migrate.connect(install_search_triggers, sender=self)
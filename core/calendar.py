@@ -0,0 +1,139 @@
+"""
+Interview calendar: upcoming interviews and a per-user iCalendar feed.
+
+Interviews have no user column, so both read through the application,
+``application_id__user_id``, with a range on ``scheduled_at``. That is
+answered from application_user_created_idx and interview_app_scheduled_idx.
+
+Calendar apps can't send a token header, so the feed URL carries its own
+token (see ``feed_token``). It changes when the user's password does,
+which revokes old feed URLs.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.http import base36_to_int, int_to_base36
+
+from .models import Interview
+
+
+FEED_COLUMNS = (
+    'id', 'round', 'result', 'scheduled_at', 'notes', 'updated_at', 'application_id__company_id__name',
+)
+
+
+def upcoming_interviews(user, start, end, queryset=None):
+    """Return ``user``'s interviews scheduled in [start, end), soonest first."""
+    if queryset is None:
+        queryset = Interview.objects.all()
+    return queryset.filter(
+        application_id__user_id=user, scheduled_at__gte=start, scheduled_at__lt=end,
+    ).order_by('scheduled_at', 'id')
+
+
+def feed_start(now=None):
+    """Start of the feed window, midnight CALENDAR_FEED_PAST_DAYS days ago.
+
+    Moving once a day keeps the feed's ETag stable in between.
+    """
+    today = timezone.localdate(now)
+    start = datetime.combine(today - timedelta(days=settings.CALENDAR_FEED_PAST_DAYS), time.min)
+    return timezone.make_aware(start)
+
+
+def feed_queryset(user, start, queryset=None):
+    """Return ``user``'s interviews scheduled since ``start``."""
+    if queryset is None:
+        queryset = Interview.objects.all()
+    return queryset.filter(application_id__user_id=user, scheduled_at__gte=start)
+
+
+def feed_version(queryset):
+    """Count and latest changes of the feed's rows, for its ETag.
+
+    The count covers deletions, the company's ``updated_at`` covers
+    renamed companies, which show in the event titles.
+    """
+    return queryset.order_by().aggregate(
+        count=Count('pk'),
+        updated_at=Max('updated_at'),
+        company_updated_at=Max('application_id__company_id__updated_at'),
+    )
+
+
+def _token_hash(user):
+    return salted_hmac('core.calendar.feed', '%s%s' % (user.pk, user.password)).hexdigest()[:20]
+
+
+def feed_token(user):
+    """Return the token in ``user``'s feed URL."""
+    return '%s-%s' % (int_to_base36(user.pk), _token_hash(user))
+
+
+def feed_user(token):
+    """Return the active user ``token`` belongs to, None if it's invalid."""
+    try:
+        user_b36, token_hash = token.split('-')
+        user = get_user_model()._default_manager.get(pk=base36_to_int(user_b36))
+    except (ValueError, get_user_model().DoesNotExist):
+        return None
+    if not user.is_active or not constant_time_compare(token_hash, _token_hash(user)):
+        return None
+    return user
+
+
+def _escape(value):
+    return (
+        str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Split ``line`` into lines of at most 75 octets, as RFC 5545 requires."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        # Don't split a multi-byte character.
+        while limit < len(encoded) and (encoded[limit] & 0xC0) == 0x80:
+            limit -= 1
+        parts.append(encoded[:limit].decode('utf-8'))
+        encoded = encoded[limit:]
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _timestamp(value):
+    return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def ics_lines(queryset, host, chunk_size=2000):
+    """Yield the feed's interviews as iCalendar lines.
+
+    Events last CALENDAR_EVENT_MINUTES, the model has no end time.
+    """
+    duration = timedelta(minutes=settings.CALENDAR_EVENT_MINUTES)
+    yield 'BEGIN:VCALENDAR\r\n'
+    yield 'VERSION:2.0\r\n'
+    yield 'PRODID:-//Placement Management//Interviews//EN\r\n'
+    yield 'X-WR-CALNAME:Interviews\r\n'
+    rows = queryset.order_by('scheduled_at', 'id').values_list(*FEED_COLUMNS).iterator(chunk_size=chunk_size)
+    for pk, stage, result, scheduled_at, notes, updated_at, company in rows:
+        summary = '%s - %s' % (stage, company) if stage else company
+        yield 'BEGIN:VEVENT\r\n'
+        yield _fold('UID:interview-%s@%s' % (pk, host))
+        yield 'DTSTAMP:%s\r\n' % _timestamp(updated_at)
+        yield 'DTSTART:%s\r\n' % _timestamp(scheduled_at)
+        yield 'DTEND:%s\r\n' % _timestamp(scheduled_at + duration)
+        yield _fold('SUMMARY:%s' % _escape(summary))
+        description = 'Result: %s\n\n%s' % (result, notes) if result else notes
+        if description:
+            yield _fold('DESCRIPTION:%s' % _escape(description))
+        yield 'END:VEVENT\r\n'
+    yield 'END:VCALENDAR\r\n'
@@ -0,0 +1,60 @@
+"""
+Database helpers shared by the API and the admin.
+"""
+import json
+
+from django.db import connections
+
+
+# Below this many rows an exact COUNT(*) is cheap enough to be worth running.
+EXACT_COUNT_THRESHOLD = 1000
+
+
+def table_row_estimate(model, using='default'):
+    """Return ``pg_class.reltuples`` for a model's table, or None if unknown."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 (or 0 on older servers) until the table is analyzed.
+    if row is None or row[0] <= 0:
+        return None
+    return row[0]
+
+
+def estimated_count(queryset):
+    """Return the planner's row estimate for a queryset.
+
+    On Postgres an unfiltered queryset uses the table statistics and a
+    filtered one the EXPLAIN row estimate, instead of running COUNT(*).
+    Small results and other database backends get an exact count.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    if not queryset.query.where:
+        estimate = table_row_estimate(queryset.model, using=queryset.db)
+    else:
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+
+    if estimate is None or estimate < EXACT_COUNT_THRESHOLD:
+        return queryset.count()
+    return estimate
+
+
+async def afetch(queryset, chunk_size=2000):
+    """Evaluate a queryset from async code and return the rows as a list."""
+    if queryset._prefetch_related_lookups:
+        # aiterator() doesn't support prefetch_related before Django 5.0,
+        # async iteration fetches everything in one sync call instead.
+        return [obj async for obj in queryset]
+    return [obj async for obj in queryset.aiterator(chunk_size=chunk_size)]
@@ -0,0 +1,118 @@
+"""
+Streaming export of applications, interviews and offers.
+
+Rows are read with ``values_list`` (joins included) through
+``QuerySet.iterator`` and rendered one line at a time, so memory use stays
+flat however many rows are exported. Used by the export API endpoints and
+the ``export_placement_data`` management command.
+"""
+import csv
+import json
+from datetime import date, datetime
+
+from .models import Application, Interview, Offer
+
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+EXPORTS = {
+    'applications': {
+        'model': Application,
+        'date_field': 'created_at',
+        'company_field': 'company_id',
+        'columns': (
+            ('id', 'id'),
+            ('user_email', 'user_id__email'),
+            ('company_id', 'company_id'),
+            ('company', 'company_id__name'),
+            ('source', 'source'),
+            ('notes', 'notes'),
+            ('created_at', 'created_at'),
+            ('updated_at', 'updated_at'),
+        ),
+    },
+    'interviews': {
+        'model': Interview,
+        'date_field': 'scheduled_at',
+        'company_field': 'application_id__company_id',
+        'columns': (
+            ('id', 'id'),
+            ('application_id', 'application_id'),
+            ('user_email', 'application_id__user_id__email'),
+            ('company_id', 'application_id__company_id'),
+            ('company', 'application_id__company_id__name'),
+            ('round', 'round'),
+            ('result', 'result'),
+            ('scheduled_at', 'scheduled_at'),
+            ('notes', 'notes'),
+            ('updated_at', 'updated_at'),
+        ),
+    },
+    'offers': {
+        'model': Offer,
+        'date_field': 'received_at',
+        'company_field': 'company_id',
+        'columns': (
+            ('id', 'id'),
+            ('user_email', 'user_id__email'),
+            ('company_id', 'company_id'),
+            ('company', 'company_id__name'),
+            ('ctc', 'ctc'),
+            ('is_accepted', 'is_accepted'),
+            ('received_at', 'received_at'),
+            ('notes', 'notes'),
+            ('updated_at', 'updated_at'),
+        ),
+    },
+}
+
+
+class Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def export_queryset(kind, queryset=None, company_id=None, since=None, until=None):
+    """Return a ``values_list`` queryset of export rows, ordered by id.
+
+    ``since`` and ``until`` filter the kind's date field (inclusive start,
+    exclusive end).
+    """
+    spec = EXPORTS[kind]
+    if queryset is None:
+        queryset = spec['model'].objects.all()
+    if company_id is not None:
+        queryset = queryset.filter(**{spec['company_field']: company_id})
+    if since is not None:
+        queryset = queryset.filter(**{spec['date_field'] + '__gte': since})
+    if until is not None:
+        queryset = queryset.filter(**{spec['date_field'] + '__lt': until})
+    return queryset.order_by('id').values_list(*[lookup for _, lookup in spec['columns']])
+
+
+# Spreadsheets run cells starting with these as formulas.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _to_text(value, escape_formulas=False):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if escape_formulas and isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def export_lines(kind, queryset, fmt, chunk_size=2000):
+    """Yield the export as CSV or NDJSON lines."""
+    header = [name for name, _ in EXPORTS[kind]['columns']]
+    rows = queryset.iterator(chunk_size=chunk_size)
+    if fmt == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow([_to_text(value, escape_formulas=True) for value in row])
+    else:
+        for row in rows:
+            yield json.dumps(dict(zip(header, map(_to_text, row)))) + '\n'
@@ -0,0 +1,223 @@
+"""
+Incremental maintenance of the per-company placement funnel.
+
+Every Application, Interview and Offer contributes counters to its
+company's CompanyFunnel row. The signal handlers in core.signals call into
+this module on save and delete. Code that writes with bulk_create or
+bulk_update, which don't send signals, should call record_created or
+record_changes itself. rebuild() recomputes everything from scratch.
+
+Rows loaded with their funnel columns deferred, e.g. through only(), don't
+snapshot on load; their stored state is read by load_snapshot before they
+are saved or deleted. Bulk writers of such rows must call it first.
+"""
+from collections import Counter, defaultdict
+
+from django.db import router, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Company, Application, Interview, Offer, CompanyFunnel
+
+
+FUNNEL_FIELDS = ('applications', 'interviews', 'interviews_passed', 'offers', 'offers_accepted')
+
+# Interview.result is free text, this is the value counted as passed.
+PASSED_RESULT = 'passed'
+
+# Columns funnel_state reads, by model.
+STATE_COLUMNS = (
+    (Application, ('company_id_id',)),
+    (Interview, ('application_id_id', 'result')),
+    (Offer, ('company_id_id', 'is_accepted')),
+)
+
+# Snapshot of a row loaded with some of its STATE_COLUMNS deferred.
+UNLOADED = object()
+
+
+def is_passed(result):
+    return (result or '').lower() == PASSED_RESULT
+
+
+def funnel_state(instance):
+    """Return the raw column values a row's funnel counters depend on.
+
+    Only attributes already on the instance are read, so this is cheap
+    enough to snapshot every time a row is loaded.
+    """
+    if isinstance(instance, Application):
+        return ('company', instance.company_id_id, {'applications': 1})
+    if isinstance(instance, Interview):
+        counters = {'interviews': 1}
+        if is_passed(instance.result):
+            counters['interviews_passed'] = 1
+        return ('application', instance.application_id_id, counters)
+    if isinstance(instance, Offer):
+        counters = {'offers': 1}
+        if instance.is_accepted:
+            counters['offers_accepted'] = 1
+        return ('company', instance.company_id_id, counters)
+    return None
+
+
+def snapshot(instance):
+    for model, columns in STATE_COLUMNS:
+        if isinstance(instance, model):
+            # Reading a deferred column here would cost a query per row.
+            if any(column not in instance.__dict__ for column in columns):
+                instance._funnel_state = UNLOADED
+                return
+            break
+    instance._funnel_state = funnel_state(instance)
+
+
+def load_snapshot(instance):
+    """Read the stored state of a row loaded with its funnel columns deferred.
+
+    Called before such a row is saved or deleted, as its old state is gone
+    afterwards.
+    """
+    if getattr(instance, '_funnel_state', None) is not UNLOADED:
+        return
+    model = type(instance)
+    stored = model._base_manager.using(router.db_for_write(model, instance=instance)).filter(pk=instance.pk).first()
+    instance._funnel_state = stored._funnel_state if stored is not None else None
+
+
+def apply_changes(changes):
+    """Apply ``(old_state, new_state)`` pairs to the funnel table.
+
+    Either side may be None for a created or deleted row. Interviews are
+    mapped to companies with one query, and each touched company gets a
+    single UPDATE.
+    """
+    application_ids = {
+        state[1] for pair in changes for state in pair
+        if state is not None and state[0] == 'application'
+    }
+    application_companies = dict(
+        Application.objects.filter(pk__in=application_ids).values_list('pk', 'company_id')
+    ) if application_ids else {}
+
+    deltas = defaultdict(Counter)
+    for old_state, new_state in changes:
+        for state, sign in ((old_state, -1), (new_state, 1)):
+            if state is None:
+                continue
+            kind, key, counters = state
+            company_id = application_companies.get(key) if kind == 'application' else key
+            if company_id is None:
+                continue
+            for field, value in counters.items():
+                deltas[company_id][field] += sign * value
+
+    deltas = {company_id: counter for company_id, counter in deltas.items() if any(counter.values())}
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        # Only rows gaining counts are created; a delete caused by the
+        # company itself being deleted must not recreate its funnel row.
+        missing = [company_id for company_id, counter in deltas.items() if any(v > 0 for v in counter.values())]
+        CompanyFunnel.objects.bulk_create(
+            [CompanyFunnel(company_id_id=company_id) for company_id in missing],
+            ignore_conflicts=True,
+        )
+        now = timezone.now()
+        for company_id, counter in deltas.items():
+            updates = {field: F(field) + value for field, value in counter.items() if value}
+            CompanyFunnel.objects.filter(pk=company_id).update(updated_at=now, **updates)
+
+
+def record_created(instances):
+    """Count rows inserted without post_save, e.g. through bulk_create."""
+    changes = [(None, funnel_state(instance)) for instance in instances]
+    apply_changes(changes)
+    for instance in instances:
+        snapshot(instance)
+
+
+def interview_moves(moved):
+    """Return the changes moving the interviews of applications that changed company.
+
+    ``moved`` maps an application's pk to its old and new company.
+    """
+    if not moved:
+        return []
+    rows = Interview.objects.filter(application_id__in=moved).values('application_id').annotate(
+        interviews=Count('pk'), interviews_passed=Count('pk', filter=Q(result__iexact=PASSED_RESULT)),
+    ).order_by()
+    changes = []
+    for row in rows:
+        old_company, new_company = moved[row['application_id']]
+        counters = {'interviews': row['interviews'], 'interviews_passed': row['interviews_passed']}
+        changes.append((('company', old_company, counters), ('company', new_company, counters)))
+    return changes
+
+
+def record_changes(instances):
+    """Count rows updated without post_save, e.g. through bulk_update."""
+    changes = []
+    moved = {}
+    for instance in instances:
+        old_state = getattr(instance, '_funnel_state', None)
+        new_state = funnel_state(instance)
+        if old_state != new_state:
+            changes.append((old_state, new_state))
+            if isinstance(instance, Application) and old_state is not None:
+                moved[instance.pk] = (old_state[1], new_state[1])
+        instance._funnel_state = new_state
+    apply_changes(changes + interview_moves(moved))
+
+
+def record_deleted(instance):
+    apply_changes([(getattr(instance, '_funnel_state', None) or funnel_state(instance), None)])
+
+
+def rebuild(chunk_size=500, stdout=None):
+    """Recompute every company's funnel, ``chunk_size`` companies at a time."""
+    company_ids = Company.objects.order_by('pk').values_list('pk', flat=True)
+    total = 0
+    chunk = []
+    for company_id in company_ids.iterator(chunk_size=chunk_size):
+        chunk.append(company_id)
+        if len(chunk) == chunk_size:
+            total += _rebuild_chunk(chunk)
+            chunk = []
+            if stdout is not None:
+                stdout.write('%d companies rebuilt...' % total)
+    if chunk:
+        total += _rebuild_chunk(chunk)
+    return total
+
+
+def _rebuild_chunk(company_ids):
+    rows = {company_id: CompanyFunnel(company_id_id=company_id) for company_id in company_ids}
+
+    for company_id, count in (
+        Application.objects.filter(company_id__in=company_ids)
+        .values_list('company_id').annotate(total=Count('pk')).order_by()
+    ):
+        rows[company_id].applications = count
+
+    for company_id, count, passed in (
+        Interview.objects.filter(application_id__company_id__in=company_ids)
+        .values_list('application_id__company_id')
+        .annotate(total=Count('pk'), passed=Count('pk', filter=Q(result__iexact=PASSED_RESULT))).order_by()
+    ):
+        rows[company_id].interviews = count
+        rows[company_id].interviews_passed = passed
+
+    for company_id, count, accepted in (
+        Offer.objects.filter(company_id__in=company_ids)
+        .values_list('company_id')
+        .annotate(total=Count('pk'), accepted=Count('pk', filter=Q(is_accepted=True))).order_by()
+    ):
+        rows[company_id].offers = count
+        rows[company_id].offers_accepted = accepted
+
+    with transaction.atomic():
+        CompanyFunnel.objects.filter(company_id__in=company_ids).delete()
+        CompanyFunnel.objects.bulk_create(rows.values())
+    return len(rows)
@@ -0,0 +1,17 @@
+"""
+Postgres index types that degrade to plain indexes elsewhere.
+
+The test suite runs on SQLite, which has no GIN indexes; there the same
+columns get a regular index so the schema can still be created.
+"""
+from django.contrib.postgres.indexes import GinIndex
+from django.db.models import Index
+
+
+class PortableGinIndex(GinIndex):
+    """GIN index that is created as a plain index off Postgres."""
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return Index.create_sql(self, model, schema_editor, using=using, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
@@ -0,0 +1,107 @@
+"""
+Move existing uploads into the content-addressed blob store.
+
+    python manage.py dedupe_media --dry-run
+    python manage.py dedupe_media
+
+Every file referenced by a FileField (and every stored rendition) that
+isn't a blob yet is hashed, linked into ``blobs/`` unless an identical blob
+exists already, and the rows pointing at it are rewritten. The original
+file is removed once its rows are updated, so the command can be stopped
+and rerun safely. Files no rows refer to are left alone.
+"""
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.db.models import Count
+
+from core.media import MEDIA_FIELDS
+from core.storage import file_digest, is_blob
+
+
+class Command(BaseCommand):
+    help = 'Deduplicate uploaded files into the content-addressed blob store.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how much space would be saved.')
+
+    def handle(self, *args, **options):
+        storage = default_storage
+        if not getattr(storage, 'reference_counted', False):
+            raise CommandError('DEFAULT_FILE_STORAGE must be core.storage.ContentAddressedStorage.')
+
+        references = self.collect_references()
+        adopted = missing = reclaimed = 0
+        seen = set()
+        for name, (count, file_fields, rendition_rows) in sorted(references.items()):
+            if not storage.exists(name):
+                missing += 1
+                self.stderr.write('Missing file %s' % name)
+                continue
+            if options['dry_run']:
+                key = storage.blob_name(file_digest(storage.path(name)), name)
+                if key in seen or storage.exists(key):
+                    reclaimed += storage.size(name)
+                seen.add(key)
+                adopted += 1
+                continue
+
+            size = storage.size(name)
+            with transaction.atomic():
+                blob, created = storage.adopt(name, references=count)
+                for model, field_name in file_fields:
+                    model._base_manager.filter(**{field_name: name}).update(**{field_name: blob})
+                for model, field_name, pk in rendition_rows:
+                    renditions = model._base_manager.filter(pk=pk).values_list(field_name, flat=True).first() or {}
+                    renditions = {key: blob if path == name else path for key, path in renditions.items()}
+                    model._base_manager.filter(pk=pk).update(**{field_name: renditions})
+            storage.delete(name)
+            adopted += 1
+            if not created:
+                reclaimed += size
+            if options['verbosity'] > 1:
+                self.stdout.write('%s -> %s' % (name, blob))
+
+        self.stdout.write(self.style.SUCCESS('%s %d files, %d bytes %s, %d missing.' % (
+            'Would move' if options['dry_run'] else 'Moved',
+            adopted,
+            reclaimed,
+            'reclaimable' if options['dry_run'] else 'reclaimed',
+            missing,
+        )))
+
+    def collect_references(self):
+        """Map each non-blob file name to its reference count and users.
+
+        Values are ``(count, {(model, file field)}, [(model, renditions
+        field, pk)])``.
+        """
+        references = defaultdict(lambda: [0, set(), []])
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if not isinstance(field, models.FileField):
+                    continue
+                rows = (
+                    model._base_manager.exclude(**{field.name: ''}).exclude(**{field.name: None})
+                    .values_list(field.name).annotate(count=Count('pk')).order_by()
+                )
+                for name, count in rows:
+                    if not is_blob(name):
+                        references[name][0] += count
+                        references[name][1].add((model, field.name))
+
+        for label, (_, prefix) in MEDIA_FIELDS.items():
+            model = apps.get_model(label)
+            field_name = prefix + 'renditions'
+            rows = model._base_manager.exclude(**{prefix + 'processed_at': None}).values_list('pk', field_name)
+            for pk, renditions in rows.iterator():
+                # Each rendition saved holds a reference, even when two of
+                # a row's renditions came out identical.
+                for name in (renditions or {}).values():
+                    if not is_blob(name):
+                        references[name][0] += 1
+                        references[name][2].append((model, field_name, pk))
+        return references
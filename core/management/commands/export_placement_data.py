@@ -0,0 +1,67 @@
+"""
+Stream applications, interviews or offers to a CSV or NDJSON file.
+
+    python manage.py export_placement_data applications --output applications.csv
+    python manage.py export_placement_data interviews --format ndjson --since 2023-01-01
+    python manage.py export_placement_data offers --company 12 --until 2023-06-30
+
+Rows are read in chunks of --chunk-size through a server-side cursor where
+the database supports one, so memory use doesn't grow with the table.
+"""
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.filters import parse_timestamp
+from core.export import EXPORT_FORMATS, EXPORTS, export_lines, export_queryset
+
+
+def parse_when(value):
+    parsed = parse_timestamp(value)
+    if parsed is None:
+        raise CommandError('Invalid date %r, expected YYYY-MM-DD or an ISO datetime.' % value)
+    return parsed
+
+
+class Command(BaseCommand):
+    help = 'Export applications, interviews or offers as CSV or NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('--format', choices=EXPORT_FORMATS, help='Defaults to the output extension, else csv.')
+        parser.add_argument('--company', type=int, help='Only export rows for this company id.')
+        parser.add_argument('--since', help='Inclusive start date or datetime.')
+        parser.add_argument('--until', help='Exclusive end date or datetime.')
+        parser.add_argument('--output', help='File to write, defaults to stdout.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+        output = options['output']
+        fmt = options['format'] or ('ndjson' if output and output.endswith(('.ndjson', '.jsonl')) else 'csv')
+
+        rows = export_queryset(
+            options['kind'],
+            company_id=options['company'],
+            since=parse_when(options['since']) if options['since'] else None,
+            until=parse_when(options['until']) if options['until'] else None,
+        )
+        lines = export_lines(options['kind'], rows, fmt, chunk_size=options['chunk_size'])
+
+        if output is None:
+            # Write straight to the underlying stream, OutputWrapper would
+            # add a newline after every line.
+            stream = getattr(self.stdout, '_out', sys.stdout)
+            for line in lines:
+                stream.write(line)
+            return
+
+        count = 0
+        with open(output, 'w', newline='', encoding='utf-8') as handle:
+            for line in lines:
+                handle.write(line)
+                count += 1
+        if fmt == 'csv':
+            count -= 1
+        self.stderr.write(self.style.SUCCESS('Exported %d %s to %s' % (count, options['kind'], output)))
@@ -0,0 +1,289 @@
+"""
+Import students, companies or applications from a CSV or NDJSON file.
+
+    python manage.py import_placement_data students.csv --kind students
+    python manage.py import_placement_data companies.csv --kind companies --owner office@example.com
+    python manage.py import_placement_data applications.ndjson --kind applications
+
+Expected columns:
+
+* students: email, username, firstName, lastName, password
+* companies: name, user_email (falls back to --owner)
+* applications: user_email, company, notes, source
+
+The file is read in chunks of --batch-size rows, each chunk is written with
+a single bulk_create, and student passwords are hashed in a process pool.
+Rows that can't be imported are written with the reason to a rejects file.
+A chunk that hits a unique constraint, because a matching row was added
+after the chunk was checked, is retried row by row and only the colliding
+rows are rejected.
+"""
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from api.cache import invalidate
+from core import funnel
+from core.models import CustomUser, Company, Application
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+def read_rows(path, fmt):
+    """Yield ``(row, error)`` pairs from a CSV or NDJSON file."""
+    with open(path, newline='', encoding='utf-8') as handle:
+        if fmt == 'csv':
+            for row in csv.DictReader(handle):
+                yield row, None
+            return
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield {'line': line}, 'Invalid JSON.'
+                continue
+            if isinstance(row, dict):
+                yield row, None
+            else:
+                yield {'line': line}, 'Expected a JSON object.'
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def clean(value):
+    """Strip a cell and turn empty strings into None."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+class Command(BaseCommand):
+    help = 'Import students, companies or applications from a CSV or NDJSON file.'
+
+    models = {
+        'students': CustomUser,
+        'companies': Company,
+        'applications': Application,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or NDJSON file to import.')
+        parser.add_argument('--kind', required=True, choices=sorted(self.models))
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Processes used to hash student passwords.',
+        )
+        parser.add_argument('--owner', help='Email of the user companies are added under.')
+        parser.add_argument('--rejects', help='Rejected rows file, defaults to <path>.rejected.ndjson.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError('File not found: %s' % path)
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        fmt = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+        kind = options['kind']
+        model = self.models[kind]
+        build = getattr(self, 'build_%s' % kind)
+        self.options = options
+        self.seen = set()
+        self.company_ids = None
+        self.rejects_path = options['rejects'] or path + '.rejected.ndjson'
+        self.rejects_file = None
+
+        pool = None
+        if kind == 'students' and options['workers'] > 1:
+            pool = ProcessPoolExecutor(
+                options['workers'],
+                initializer=_init_worker,
+                initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'placement_management.settings'),),
+            )
+        self.pool = pool
+
+        created = rejected = 0
+        started = time.perf_counter()
+        try:
+            for chunk in chunked(read_rows(path, fmt), options['batch_size']):
+                rows = []
+                for row, error in chunk:
+                    if error:
+                        self.reject(row, error)
+                        rejected += 1
+                    else:
+                        rows.append(row)
+
+                accepted, rejects = build(rows)
+                try:
+                    self.insert(model, [instance for _, instance in accepted])
+                    created += len(accepted)
+                except IntegrityError:
+                    for row, instance in accepted:
+                        # Cleared in case an earlier batch of the failed chunk set it.
+                        instance.pk = None
+                        try:
+                            self.insert(model, [instance])
+                            created += 1
+                        except IntegrityError:
+                            rejects.append((row, 'Conflicts with a row added during the import.'))
+                for row, error in rejects:
+                    self.reject(row, error)
+                rejected += len(rejects)
+                if options['verbosity'] > 1:
+                    self.stdout.write('%d rows imported...' % created)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            if self.rejects_file is not None:
+                self.rejects_file.close()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            'Imported %d %s in %.2fs (%.0f rows/sec), rejected %d.' % (
+                created, kind, elapsed, (created + rejected) / elapsed if elapsed else 0, rejected,
+            )
+        ))
+        if rejected:
+            self.stdout.write('Rejected rows written to %s' % self.rejects_path)
+
+    def insert(self, model, instances):
+        with transaction.atomic():
+            model.objects.bulk_create(instances, batch_size=self.options['batch_size'])
+            funnel.record_created(instances)
+            if model is Company and instances:
+                # bulk_create doesn't send the post_save that drops cached company responses.
+                transaction.on_commit(lambda: invalidate('company'))
+
+    def reject(self, row, error):
+        if self.rejects_file is None:
+            self.rejects_file = open(self.rejects_path, 'w', encoding='utf-8')
+        self.rejects_file.write(json.dumps({'row': row, 'error': error}) + '\n')
+
+    def hash_passwords(self, passwords):
+        if self.pool is None:
+            return [make_password(password) for password in passwords]
+        chunksize = max(1, len(passwords) // (self.options['workers'] * 4))
+        return list(self.pool.map(make_password, passwords, chunksize=chunksize))
+
+    def user_ids(self, emails):
+        """Map normalized emails to user ids with one query."""
+        return dict(CustomUser.objects.filter(email__in=emails).values_list('email', 'id'))
+
+    def build_students(self, rows):
+        accepted = []
+        rejects = []
+        for row in rows:
+            email = clean(row.get('email'))
+            if not email:
+                rejects.append((row, 'Missing email.'))
+                continue
+            email = CustomUser.objects.normalize_email(email)
+            username = clean(row.get('username'))
+            if email in self.seen or (username and ('username', username) in self.seen):
+                rejects.append((row, 'Duplicate row in file.'))
+                continue
+            self.seen.add(email)
+            if username:
+                self.seen.add(('username', username))
+            accepted.append((row, email, username))
+
+        existing_emails = set(CustomUser.objects.filter(
+            email__in=[email for _, email, _ in accepted],
+        ).values_list('email', flat=True))
+        existing_usernames = set(CustomUser.objects.filter(
+            username__in=[username for _, _, username in accepted if username],
+        ).values_list('username', flat=True))
+
+        new = []
+        for row, email, username in accepted:
+            if email in existing_emails:
+                rejects.append((row, 'A user with this email already exists.'))
+            elif username in existing_usernames:
+                rejects.append((row, 'A user with this username already exists.'))
+            else:
+                new.append((row, email, username))
+
+        passwords = self.hash_passwords([clean(row.get('password')) for row, _, _ in new])
+        users = [
+            (row, CustomUser(
+                email=email,
+                username=username,
+                firstName=clean(row.get('firstName')),
+                lastName=clean(row.get('lastName')),
+                password=password,
+            ))
+            for (row, email, username), password in zip(new, passwords)
+        ]
+        return users, rejects
+
+    def build_companies(self, rows):
+        owner = self.options['owner']
+        emails = {
+            CustomUser.objects.normalize_email(clean(row.get('user_email')) or owner or '')
+            for row in rows
+        }
+        user_ids = self.user_ids(emails)
+
+        companies = []
+        rejects = []
+        for row in rows:
+            name = clean(row.get('name'))
+            email = CustomUser.objects.normalize_email(clean(row.get('user_email')) or owner or '')
+            if not name:
+                rejects.append((row, 'Missing name.'))
+            elif email not in user_ids:
+                rejects.append((row, 'Unknown user %r.' % email))
+            else:
+                companies.append((row, Company(name=name, user_id_id=user_ids[email])))
+        return companies, rejects
+
+    def build_applications(self, rows):
+        if self.company_ids is None:
+            # Names aren't unique, the most recently added company wins.
+            self.company_ids = dict(Company.objects.order_by('id').values_list('name', 'id'))
+        user_ids = self.user_ids({
+            CustomUser.objects.normalize_email(clean(row.get('user_email')) or '') for row in rows
+        })
+
+        applications = []
+        rejects = []
+        for row in rows:
+            email = CustomUser.objects.normalize_email(clean(row.get('user_email')) or '')
+            company = clean(row.get('company'))
+            if email not in user_ids:
+                rejects.append((row, 'Unknown user %r.' % email))
+            elif company not in self.company_ids:
+                rejects.append((row, 'Unknown company %r.' % company))
+            else:
+                applications.append((row, Application(
+                    user_id_id=user_ids[email],
+                    company_id_id=self.company_ids[company],
+                    notes=row.get('notes') or '',
+                    source=clean(row.get('source')),
+                )))
+        return applications, rejects
@@ -0,0 +1,40 @@
+"""
+Process resumes and profile images that haven't been processed yet.
+
+    python manage.py process_media
+    python manage.py process_media --all
+
+Uploads are normally processed in the background right after they're
+saved. Use this after changing MEDIA_RENDITIONS, or to catch up on files
+whose job was lost, e.g. because the process restarted. Files are processed
+inline, one at a time.
+"""
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from core import media
+
+
+class Command(BaseCommand):
+    help = 'Record dimensions and write renditions for uploaded images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Reprocess files that were already processed.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = 0
+        for label, (field_name, prefix) in media.MEDIA_FIELDS.items():
+            queryset = apps.get_model(label).objects.exclude(**{field_name: ''}).exclude(**{field_name: None})
+            if not options['all']:
+                queryset = queryset.filter(**{prefix + 'processed_at': None})
+            for pk in queryset.order_by('pk').values_list('pk', flat=True).iterator():
+                if media.process(label, pk):
+                    total += 1
+                    if options['verbosity'] > 1:
+                        self.stdout.write('Processed %s %s' % (label, pk))
+        self.stdout.write(self.style.SUCCESS(
+            'Processed %d files in %.2fs.' % (total, time.perf_counter() - started)
+        ))
@@ -0,0 +1,214 @@
+"""
+Background processing of uploaded images.
+
+Saving a Resume or a user's profile image schedules a job for when the
+transaction commits. Jobs run on a small thread pool, so the upload request
+returns as soon as the original is stored; the request still validates
+and writes the original itself. Each job records the original's
+dimensions and size and writes the renditions listed in MEDIA_RENDITIONS.
+Renditions are re-encoded from pixel data only, which drops EXIF, XMP and
+ICC metadata such as GPS tags. EXIF orientation is applied first so they
+still display the right way up. An original carrying EXIF, XMP or text
+metadata is replaced the same way, in its own format and keeping its ICC
+profile.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from . import user_cache
+
+
+logger = logging.getLogger(__name__)
+
+# Model label -> (file field, prefix of the columns results are stored in).
+MEDIA_FIELDS = {
+    'core.Resume': ('resume', ''),
+    'core.CustomUser': ('profile_image', 'profile_image_'),
+}
+
+# Image.info keys of metadata other than EXIF and PNG text.
+METADATA_KEYS = ('xmp', 'XML:com.adobe.xmp', 'comment', 'photoshop')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                settings.MEDIA_PROCESSING_WORKERS, thread_name_prefix='media',
+            )
+        return _executor
+
+
+def _file_name(instance):
+    field_name, _ = MEDIA_FIELDS[instance._meta.label]
+    # Read the raw attribute, so a deferred field doesn't cost a query.
+    value = instance.__dict__.get(field_name)
+    return getattr(value, 'name', value) or None
+
+
+def snapshot(instance):
+    instance._media_name = _file_name(instance)
+
+
+def has_new_file(instance):
+    name = _file_name(instance)
+    return bool(name) and name != getattr(instance, '_media_name', None)
+
+
+def schedule(instance):
+    """Process ``instance``'s file once the current transaction commits."""
+    label, pk = instance._meta.label, instance.pk
+    instance._media_name = _file_name(instance)
+
+    def submit():
+        if settings.MEDIA_PROCESSING_WORKERS > 0:
+            get_executor().submit(run, label, pk)
+        else:
+            process(label, pk)
+
+    transaction.on_commit(submit)
+
+
+def release(instance, names):
+    """Drop references to files no longer used by ``instance`` on commit.
+
+    Only done for reference counted storage, plain storage keeps files
+    around as Django does by default.
+    """
+    field_name, _ = MEDIA_FIELDS[instance._meta.label]
+    storage = instance._meta.get_field(field_name).storage
+    names = [name for name in names if name]
+    if names and getattr(storage, 'reference_counted', False):
+        transaction.on_commit(lambda: [storage.delete(name) for name in names])
+
+
+def release_all(instance):
+    """Release a deleted row's file and renditions."""
+    _, prefix = MEDIA_FIELDS[instance._meta.label]
+    renditions = instance.__dict__.get(prefix + 'renditions') or {}
+    release(instance, [getattr(instance, '_media_name', None)] + list(renditions.values()))
+
+
+def run(label, pk):
+    """Pool entry point, logs failures and releases the thread's connections."""
+    try:
+        process(label, pk)
+    except Exception:
+        logger.exception('Processing media for %s %s failed.', label, pk)
+    finally:
+        connections.close_all()
+
+
+def process(label, pk):
+    """Record size and dimensions of a row's file and write its renditions.
+
+    Files Pillow can't read are marked processed without renditions. The
+    results are only stored if the file wasn't replaced in the meantime.
+    """
+    model = apps.get_model(label)
+    field_name, prefix = MEDIA_FIELDS[label]
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or not getattr(instance, field_name):
+        return False
+    field = getattr(instance, field_name)
+
+    width = height = None
+    renditions = {}
+    stripped = None
+    try:
+        with field.open('rb'):
+            original = Image.open(field)
+            original.load()
+    except (OSError, Image.DecompressionBombError):
+        logger.info('%s %s has no readable image, skipping renditions.', label, pk)
+    else:
+        image = ImageOps.exif_transpose(original)
+        width, height = image.size
+        if has_metadata(original):
+            stripped = save_stripped(field, original, image)
+        for name, box in settings.MEDIA_RENDITIONS.items():
+            renditions[name] = save_rendition(field, name, image, box)
+
+    name = stripped or field.name
+    now = timezone.now()
+    updated = model.objects.filter(pk=pk, **{field_name: field.name}).update(**{
+        field_name: name,
+        prefix + 'width': width,
+        prefix + 'height': height,
+        prefix + 'size': field.storage.size(name),
+        prefix + 'renditions': renditions,
+        prefix + 'processed_at': now,
+        'updated_at': now,
+    })
+    if updated and model is get_user_model():
+        # update() skips the signal that drops the cached row.
+        user_cache.invalidate(pk)
+    stale = getattr(instance, prefix + 'renditions') if updated else renditions
+    stale = list((stale or {}).values())
+    if stripped:
+        # The original with its metadata, or the copy if the file was replaced.
+        stale.append(field.name if updated else stripped)
+    for path in stale:
+        field.storage.delete(path)
+    return bool(updated)
+
+
+def has_metadata(image):
+    """Whether ``image`` as read carries EXIF, XMP or text metadata."""
+    return (
+        bool(image.getexif())
+        or any(key in image.info for key in METADATA_KEYS)
+        or bool(getattr(image, 'text', None))
+    )
+
+
+def save_stripped(field, original, image):
+    """Write ``image``, the oriented pixels of ``original``, without metadata.
+
+    Saved in the original's format next to it, returns the storage path or
+    None if the format can't be written. Animated images are left alone, as
+    only their first frame is loaded.
+    """
+    if getattr(original, 'is_animated', False):
+        return None
+    options = {'quality': settings.MEDIA_ORIGINAL_QUALITY}
+    if original.info.get('icc_profile'):
+        options['icc_profile'] = original.info['icc_profile']
+    if 'transparency' in original.info:
+        options['transparency'] = original.info['transparency']
+    buffer = BytesIO()
+    try:
+        image.save(buffer, format=original.format, **options)
+    except (KeyError, OSError, ValueError):
+        logger.warning('Could not strip metadata from %s.', field.name)
+        return None
+    return field.storage.save(field.name, ContentFile(buffer.getvalue()))
+
+
+def save_rendition(field, name, image, box):
+    """Write a downscaled copy of ``image`` and return its storage path."""
+    fmt = settings.MEDIA_RENDITION_FORMAT
+    copy = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+    copy.thumbnail(box, Image.Resampling.LANCZOS)
+    buffer = BytesIO()
+    copy.save(buffer, format=fmt, quality=settings.MEDIA_RENDITION_QUALITY)
+
+    directory, filename = os.path.split(field.name)
+    stem = os.path.splitext(filename)[0]
+    path = os.path.join(directory, 'renditions', '%s_%s.%s' % (stem, name, fmt.lower()))
+    return field.storage.save(path, ContentFile(buffer.getvalue()))
@@ -1,6 +1,9 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.contrib.auth.models import BaseUserManager, AbstractBaseUser, PermissionsMixin
 from placement_management.settings import AUTH_USER_MODEL
+from core.indexes import PortableGinIndex
+from core.search import SearchVectorIndex
 
 
 class CustomUserManager(BaseUserManager):
@@ -31,9 +34,15 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     firstName = models.CharField("First Name", max_length=100, blank=True, null=True)
     lastName = models.CharField("Last Name", max_length=100, blank=True, null=True)
     profile_image = models.FileField(upload_to='profile_image', blank=True, null=True)
+    profile_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    profile_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    profile_image_size = models.PositiveBigIntegerField("Profile Image Size (bytes)", null=True, blank=True, editable=False)
+    profile_image_renditions = models.JSONField(default=dict, blank=True, editable=False)
+    profile_image_processed_at = models.DateTimeField(null=True, blank=True, editable=False)
     is_active = models.BooleanField('Active', default=True)
     is_staff = models.BooleanField('Staff', default=False)
     is_superuser = models.BooleanField('Super User', default=False)
+    updated_at = models.DateTimeField(auto_now=True)
     objects = CustomUserManager()
     USERNAME_FIELD = 'email'
 
@@ -43,13 +52,19 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     class Meta:
         '''Doc string for meta'''
         verbose_name_plural = "User"
+        indexes = [
+            models.Index(fields=['updated_at'], name='user_updated_idx'),
+            # Media downloads look the file up by name, see api/media.py.
+            models.Index(fields=['profile_image'], name='user_profile_image_idx'),
+            PortableGinIndex(fields=['profile_image_renditions'], name='user_renditions_idx'),
+        ]
 
 
 class Company(models.Model):
     name = models.CharField(max_length=255)
     user_id = models.ForeignKey(AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='companies_added')
-    created_at = models.DateTimeField(auto_now=True)
-    updated_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
 
     def __str__(self):
@@ -57,19 +72,32 @@ class Company(models.Model):
 
     class Meta:
         verbose_name_plural = "Companies"
+        indexes = [
+            models.Index(fields=['created_at'], name='company_created_idx'),
+            models.Index(fields=['updated_at'], name='company_updated_idx'),
+        ]
 
 
 class Question(models.Model):
     user_id = models.ForeignKey(AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='questions_posted')
     company_id = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='company_user_questions')
     content = models.TextField("Question Text")
-    created_at = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return '(%s, %s)' % (self.user_id.email, self.company_id.name)
 
     class Meta:
         verbose_name_plural = "User Company Questions"
+        indexes = [
+            models.Index(fields=['user_id', 'created_at'], name='question_user_created_idx'),
+            models.Index(fields=['user_id', 'company_id', 'created_at'], name='question_user_company_idx'),
+            models.Index(fields=['created_at'], name='question_created_idx'),
+            models.Index(fields=['user_id', 'updated_at'], name='question_user_updated_idx'),
+            SearchVectorIndex(fields=['search_vector'], name='question_search_idx'),
+        ]
 
 
 class Application(models.Model):
@@ -77,13 +105,23 @@ class Application(models.Model):
     company_id = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='company_user_applications')
     notes = models.TextField("Additional Notes")
     source = models.CharField("Source", max_length=255, null=True, blank=True)
-    created_at = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return '(%s, %s)' % (self.user_id.email, self.company_id.name)
 
     class Meta:
         verbose_name_plural = "User Company Applications"
+        indexes = [
+            models.Index(fields=['user_id', 'created_at'], name='application_user_created_idx'),
+            models.Index(fields=['user_id', 'company_id', 'created_at'], name='application_user_company_idx'),
+            models.Index(fields=['user_id', 'source', 'created_at'], name='application_user_source_idx'),
+            models.Index(fields=['created_at'], name='application_created_idx'),
+            models.Index(fields=['user_id', 'updated_at'], name='application_user_updated_idx'),
+            SearchVectorIndex(fields=['search_vector'], name='application_search_idx'),
+        ]
 
 class Interview(models.Model):
     application_id = models.ForeignKey(Application, on_delete=models.CASCADE)
@@ -91,12 +129,22 @@ class Interview(models.Model):
     round = models.CharField("Interview Round/Stage", max_length=255, null=True, blank=True)
     scheduled_at = models.DateTimeField()
     result = models.CharField("Interview Result", max_length=50, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return '(%s, %s)' % (self.application_id, self.result)
 
     class Meta:
         verbose_name_plural = "Interviews"
+        indexes = [
+            models.Index(fields=['scheduled_at'], name='interview_scheduled_idx'),
+            models.Index(fields=['result', 'scheduled_at'], name='interview_result_scheduled_idx'),
+            models.Index(fields=['round', 'scheduled_at'], name='interview_round_scheduled_idx'),
+            models.Index(fields=['application_id', 'scheduled_at'], name='interview_app_scheduled_idx'),
+            models.Index(fields=['updated_at'], name='interview_updated_idx'),
+            SearchVectorIndex(fields=['search_vector'], name='interview_search_idx'),
+        ]
 
 class Offer(models.Model):
     user_id = models.ForeignKey(AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -105,18 +153,33 @@ class Offer(models.Model):
     ctc = models.CharField("CTC Break UP", max_length=255, null=True, blank=True)
     received_at = models.DateTimeField()
     is_accepted = models.BooleanField("Offer Accepted", default=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return '(%s, %s)' % (self.user_id, self.company_id)
 
     class Meta:
         verbose_name_plural = "Offers"
+        indexes = [
+            models.Index(fields=['user_id', 'received_at'], name='offer_user_received_idx'),
+            models.Index(fields=['user_id', 'company_id', 'received_at'], name='offer_user_company_idx'),
+            models.Index(fields=['user_id', 'updated_at'], name='offer_user_updated_idx'),
+            # Postgres matches the bare boolean condition of ?is_accepted= to
+            # the column; SQLite can't and narrows by user only.
+            models.Index(fields=['user_id', 'is_accepted', 'received_at'], name='offer_user_accepted_idx'),
+        ]
 
 
 class Resume(models.Model):
     user_id = models.ForeignKey(AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='user_resumes')
     company_id = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='company_resumes')
     resume = models.ImageField("Resume", upload_to='resumes')
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    size = models.PositiveBigIntegerField("Size (bytes)", null=True, blank=True, editable=False)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    processed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
     
 
     def __str__(self):
@@ -124,10 +187,38 @@ class Resume(models.Model):
 
     class Meta:
         verbose_name_plural = "Resumes"
+        indexes = [
+            models.Index(fields=['user_id', 'id'], name='resume_user_id_idx'),
+            models.Index(fields=['user_id', 'updated_at'], name='resume_user_updated_idx'),
+            models.Index(fields=['resume'], name='resume_file_idx'),
+            PortableGinIndex(fields=['renditions'], name='resume_renditions_idx'),
+        ]
+
+
+class CompanyFunnel(models.Model):
+    company_id = models.OneToOneField(Company, on_delete=models.CASCADE, primary_key=True, related_name='funnel')
+    applications = models.IntegerField("Applications", default=0)
+    interviews = models.IntegerField("Interviews", default=0)
+    interviews_passed = models.IntegerField("Interviews Passed", default=0)
+    offers = models.IntegerField("Offers", default=0)
+    offers_accepted = models.IntegerField("Offers Accepted", default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
+    def __str__(self):
+        return 'Funnel for company %s' % self.company_id_id
 
+    class Meta:
+        verbose_name_plural = "Company Funnels"
 
 
+class MediaBlob(models.Model):
+    name = models.CharField(max_length=255, primary_key=True)
+    size = models.PositiveBigIntegerField("Size (bytes)")
+    references = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
 
+    def __str__(self):
+        return self.name
 
-
+    class Meta:
+        verbose_name_plural = "Media Blobs"
@@ -0,0 +1,99 @@
+"""
+Recording of the SQL queries run in a block of code.
+
+    with record_queries() as log:
+        ...
+    log.count, log.duration, log.duplicates()
+
+Queries are caught by an execute wrapper installed on every database
+connection, so recording works with DEBUG off and on every alias. The
+active log is kept in a context variable, which asgiref copies into the
+threads async code runs the ORM in, so queries of async views are counted
+too. Blocks can be nested, an outer log also gets the queries of the
+inner ones.
+"""
+import hashlib
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+
+# The logs of the record_queries() blocks being run, innermost last.
+_active_logs = ContextVar('query_logs', default=())
+
+# Collapse runs of placeholders and literals so "IN (%s, %s)" and
+# "IN (%s, %s, %s)" get the same fingerprint.
+PLACEHOLDER_LIST_RE = re.compile(r'\(\s*(?:%s|\?|\d+)(?:\s*,\s*(?:%s|\?|\d+))*\s*\)')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Return a short hash identifying queries that differ only in parameters."""
+    normalized = WHITESPACE_RE.sub(' ', PLACEHOLDER_LIST_RE.sub('(...)', sql)).strip()
+    return hashlib.md5(normalized.encode(), usedforsecurity=False).hexdigest()[:12]
+
+
+class QueryLog:
+    def __init__(self):
+        self.queries = []
+
+    def add(self, alias, sql, duration):
+        self.queries.append((alias, sql, duration))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        """Total time spent in the database, in seconds."""
+        return sum(duration for _, _, duration in self.queries)
+
+    def duplicates(self):
+        """Return ``[(fingerprint, count, sql)]`` of queries run more than once."""
+        counts = Counter()
+        examples = {}
+        for _, sql, _ in self.queries:
+            key = fingerprint(sql)
+            counts[key] += 1
+            examples.setdefault(key, sql)
+        return [(key, count, examples[key]) for key, count in counts.most_common() if count > 1]
+
+
+def record_query(execute, sql, params, many, context):
+    logs = _active_logs.get()
+    if not logs:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        for log in logs:
+            log.add(context['connection'].alias, sql, duration)
+
+
+def install(connection, **kwargs):
+    """Add the recording wrapper to ``connection``, once."""
+    if record_query not in connection.execute_wrappers:
+        # First, as connection.execute_wrapper() pops the last wrapper when
+        # its block ends, even if the connection was opened inside it.
+        connection.execute_wrappers.insert(0, record_query)
+
+
+@contextmanager
+def record_queries():
+    # Connections opened before the connection_created handler was
+    # connected don't have the wrapper yet.
+    for connection in connections.all():
+        install(connection)
+    log = QueryLog()
+    token = _active_logs.set(_active_logs.get() + (log,))
+    try:
+        yield log
+    finally:
+        _active_logs.reset(token)
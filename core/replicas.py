@@ -0,0 +1,66 @@
+"""
+Primary/replica database routing.
+
+Writes always go to the primary (``default``). Reads stay on the primary
+unless a view opts in with api.replicas.ReplicaReadMixin, which sends the
+queries of safe requests to one of settings.DATABASE_REPLICAS. After a user
+writes, their reads are pinned to the primary for REPLICA_PIN_SECONDS so
+they see their own changes despite replication lag. Pins live in Django's
+cache, which needs to be shared between workers for them to hold across
+processes.
+"""
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+
+def _pin_key(user):
+    return 'replica:pin:%s' % user.pk
+
+
+def pin(user):
+    """Keep ``user``'s reads on the primary for a while."""
+    if settings.DATABASE_REPLICAS and user is not None and user.is_authenticated:
+        cache.set(_pin_key(user), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user):
+    return user is not None and user.is_authenticated and bool(cache.get(_pin_key(user)))
+
+
+def read_alias(user=None):
+    """Return the replica alias to read from for ``user``, None for the primary."""
+    replicas = settings.DATABASE_REPLICAS
+    if not replicas or is_pinned(user):
+        return None
+    return random.choice(replicas)
+
+
+class PrimaryReplicaRouter:
+    """Send writes to the primary and let reads follow the queryset.
+
+    Rows read from a replica keep pointing there for related lookups, but
+    saving them goes to the primary. Rows of other databases are saved
+    where they came from.
+    """
+
+    def db_for_write(self, model, **hints):
+        instance = hints.get('instance')
+        db = getattr(getattr(instance, '_state', None), 'db', None)
+        if db and db not in settings.DATABASE_REPLICAS:
+            return db
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas get their schema from the primary.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,75 @@
+"""
+Full-text search over question content and application/interview notes.
+
+On Postgres each searchable model has a ``search_vector`` tsvector column
+with a GIN index. A trigger installed after migrate keeps it current for
+every write, including bulk_create and queryset updates. Other databases
+fall back to case-insensitive substring matching so the test suite runs
+on SQLite.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F
+
+from .indexes import PortableGinIndex
+
+
+SEARCH_CONFIG = 'english'
+
+# Model label -> text column the search vector is built from.
+SEARCH_COLUMNS = {
+    'core.Question': 'content',
+    'core.Application': 'notes',
+    'core.Interview': 'notes',
+}
+
+TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('{config}', coalesce(NEW.{column}, ''));
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table};
+CREATE TRIGGER {table}_search_vector_trigger BEFORE INSERT OR UPDATE OF {column} ON {table}
+    FOR EACH ROW EXECUTE PROCEDURE {table}_search_vector_update();
+UPDATE {table} SET search_vector = to_tsvector('{config}', coalesce({column}, ''))
+    WHERE search_vector IS NULL;
+"""
+
+
+class SearchVectorIndex(PortableGinIndex):
+    """GIN index on a search vector column."""
+
+
+def install_search_triggers(sender, using='default', apps=None, **kwargs):
+    """post_migrate handler that (re)creates the search vector triggers."""
+    connection = connections[using]
+    if connection.vendor != 'postgresql' or apps is None:
+        return
+    with connection.cursor() as cursor:
+        for label, column in SEARCH_COLUMNS.items():
+            try:
+                model = apps.get_model(label)
+            except LookupError:
+                continue
+            cursor.execute(TRIGGER_SQL.format(
+                table=model._meta.db_table,
+                column=column,
+                config=SEARCH_CONFIG,
+            ))
+
+
+def search(queryset, text):
+    """Return ``queryset`` filtered to rows matching ``text``, best first."""
+    column = SEARCH_COLUMNS[queryset.model._meta.label]
+    if connections[queryset.db].vendor == 'postgresql':
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F('search_vector'), query))
+            .order_by('-rank', '-id')
+        )
+    for term in text.split():
+        queryset = queryset.filter(**{column + '__icontains': term})
+    return queryset.order_by('-id')
@@ -0,0 +1,63 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete
+
+from . import funnel, media, querylog, user_cache
+from .models import CustomUser, Application, Interview, Offer, Resume
+
+
+def snapshot_funnel_state(sender, instance, **kwargs):
+    funnel.snapshot(instance)
+
+
+def load_funnel_state(sender, instance, **kwargs):
+    funnel.load_snapshot(instance)
+
+
+def update_funnel_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        funnel.record_created([instance])
+    else:
+        funnel.record_changes([instance])
+
+
+def update_funnel_on_delete(sender, instance, **kwargs):
+    funnel.record_deleted(instance)
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+def snapshot_media(sender, instance, **kwargs):
+    media.snapshot(instance)
+
+
+def schedule_media_processing(sender, instance, raw=False, **kwargs):
+    if not raw and media.has_new_file(instance):
+        previous = instance._media_name
+        media.schedule(instance)
+        media.release(instance, [previous])
+
+
+def release_media(sender, instance, **kwargs):
+    media.release_all(instance)
+
+
+for model in (Application, Interview, Offer):
+    post_init.connect(snapshot_funnel_state, sender=model)
+    pre_save.connect(load_funnel_state, sender=model)
+    pre_delete.connect(load_funnel_state, sender=model)
+    post_save.connect(update_funnel_on_save, sender=model)
+    post_delete.connect(update_funnel_on_delete, sender=model)
+
+for model in (CustomUser, Resume):
+    post_init.connect(snapshot_media, sender=model)
+    post_save.connect(schedule_media_processing, sender=model)
+    post_delete.connect(release_media, sender=model)
+
+post_save.connect(invalidate_cached_user, sender=CustomUser)
+post_delete.connect(invalidate_cached_user, sender=CustomUser)
+
+connection_created.connect(querylog.install)
@@ -0,0 +1,135 @@
+"""
+Content-addressed, deduplicating file storage.
+
+Files are stored under ``blobs/`` by the SHA-256 digest of their content,
+so identical uploads share one file on disk. The digest is computed while
+the upload is streamed to a temporary file, never holding it in memory.
+Every save of a blob adds a reference in MediaBlob and every delete drops
+one; the file is removed when the last reference goes.
+
+Enable it with::
+
+    DEFAULT_FILE_STORAGE = 'core.storage.ContentAddressedStorage'
+
+and run ``manage.py dedupe_media`` once to move existing files in.
+"""
+import hashlib
+import os
+import posixpath
+import shutil
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+
+BLOB_DIR = 'blobs'
+CHUNK_SIZE = 64 * 1024
+
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(BLOB_DIR + '/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files after their SHA-256 digest.
+
+    The original name only contributes its extension, so served files keep
+    a sensible content type. Names that aren't blobs (files saved before
+    the switch) are read and deleted as plain files.
+    """
+    reference_counted = True
+
+    def blob_name(self, digest, name):
+        extension = os.path.splitext(name)[1].lower()
+        return posixpath.join(BLOB_DIR, digest[:2], digest[2:4], digest + extension)
+
+    def get_available_name(self, name, max_length=None):
+        # The name is replaced by the digest in _save, no need to probe the disk.
+        return name
+
+    def _save(self, name, content):
+        temp_dir = os.path.join(self.location, BLOB_DIR, 'tmp')
+        os.makedirs(temp_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=temp_dir)
+        try:
+            hasher = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, 'wb') as handle:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    hasher.update(chunk)
+                    handle.write(chunk)
+                    size += len(chunk)
+            os.chmod(temp_path, self.file_permissions_mode or 0o644)
+            blob = self.blob_name(hasher.hexdigest(), name)
+            self.add_reference(blob, size, lambda path: os.replace(temp_path, path))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return blob
+
+    def add_reference(self, blob, size, place, references=1):
+        """Count ``references`` more uses of ``blob``.
+
+        ``place(path)`` is called to put the content in place when the blob
+        file doesn't exist yet. Returns True if it was called.
+        """
+        from .models import MediaBlob
+
+        path = self.path(blob)
+        with transaction.atomic():
+            # Locks the row, or the one inserted if there was none, so a
+            # concurrent delete can't remove the file between the existence
+            # check and the increment.
+            MediaBlob.objects.select_for_update().get_or_create(name=blob, defaults={'size': size})
+            created = not os.path.exists(path)
+            if created:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                place(path)
+            MediaBlob.objects.filter(name=blob).update(references=F('references') + references)
+        return created
+
+    def adopt(self, name, references=1):
+        """Move the plain file ``name`` into the blob store.
+
+        Returns ``(blob, created)``. The original file is left in place for
+        the caller to remove once the rows pointing at it are updated.
+        """
+        source = self.path(name)
+        blob = self.blob_name(file_digest(source), name)
+
+        def place(path):
+            try:
+                os.link(source, path)
+            except OSError:
+                shutil.copyfile(source, path)
+
+        created = self.add_reference(blob, os.path.getsize(source), place, references)
+        return blob, created
+
+    def delete(self, name):
+        if not is_blob(name):
+            return super().delete(name)
+        from .models import MediaBlob
+
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                # Nothing to lock, the file may belong to an add_reference
+                # that hasn't committed its row yet.
+                return
+            if blob.references > 1:
+                MediaBlob.objects.filter(name=name).update(references=F('references') - 1)
+                return
+            blob.delete()
+            super().delete(name)
@@ -1,10 +1,28 @@
 """
 Tests for the Django admin modifications.
 """
-from django.test import TestCase
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+from PIL import Image
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from django.test import Client
+from rest_framework.test import APIClient
+
+from core.admin import EstimatedCountPaginator
+from core.management.commands.import_placement_data import Command
+from core.models import Company, Question, Application, Interview, Offer, Resume, CompanyFunnel, MediaBlob
 
 
 class AdminSiteTests(TestCase):
@@ -73,3 +91,598 @@ class AdminSiteTests(TestCase):
         """Test that creating a user without an email raises a ValueError."""
         with self.assertRaises(ValueError):
             get_user_model().objects.create_user('', 'test123')
+
+
+class AdminChangelistQueryTests(TestCase):
+    """Tests that admin changelists don't run a query per row."""
+
+    def setUp(self):
+        self.client = Client()
+        self.admin_user = get_user_model().objects.create_superuser(
+            email='admin@example.com',
+            password='testpass123',
+        )
+        self.client.force_login(self.admin_user)
+
+    def add_rows(self, count):
+        """Create users each with one row of every core model."""
+        start = get_user_model().objects.count()
+        for i in range(start, start + count):
+            user = get_user_model().objects.create_user(email='user%s@example.com' % i, password='testpass123')
+            company = Company.objects.create(user_id=user, name='Company %s' % i)
+            Question.objects.create(user_id=user, company_id=company, content='Question')
+            application = Application.objects.create(user_id=user, company_id=company, notes='Notes')
+            Interview.objects.create(application_id=application, notes='Notes', scheduled_at=timezone.now())
+            Offer.objects.create(user_id=user, company_id=company, received_at=timezone.now())
+            Resume.objects.create(user_id=user, company_id=company, resume='resumes/resume.jpg')
+
+    def changelist_queries(self, model_name):
+        url = reverse('admin:core_%s_changelist' % model_name)
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def assert_constant_queries(self, model_name):
+        self.add_rows(2)
+        few = self.changelist_queries(model_name)
+        self.add_rows(8)
+        many = self.changelist_queries(model_name)
+        self.assertEqual(few, many)
+
+    def test_company_changelist_queries(self):
+        """Test the company changelist query count is independent of rows."""
+        self.assert_constant_queries('company')
+
+    def test_company_changelist_newest_first(self):
+        """Test the company changelist lists the newest companies first."""
+        self.add_rows(3)
+        Company.objects.filter(name='Company 2').update(created_at=timezone.now() + timedelta(days=1))
+
+        res = self.client.get(reverse('admin:core_company_changelist'))
+
+        names = [company.name for company in res.context['cl'].result_list]
+        self.assertEqual(names, ['Company 2', 'Company 3', 'Company 1'])
+
+    def test_question_changelist_queries(self):
+        """Test the question changelist query count is independent of rows."""
+        self.assert_constant_queries('question')
+
+    def test_application_changelist_queries(self):
+        """Test the application changelist query count is independent of rows."""
+        self.assert_constant_queries('application')
+
+    def test_interview_changelist_queries(self):
+        """Test the interview changelist query count is independent of rows."""
+        self.assert_constant_queries('interview')
+
+    def test_offer_changelist_queries(self):
+        """Test the offer changelist query count is independent of rows."""
+        self.assert_constant_queries('offer')
+
+    def test_resume_changelist_queries(self):
+        """Test the resume changelist query count is independent of rows."""
+        self.assert_constant_queries('resume')
+
+    def test_company_autocomplete(self):
+        """Test company autocomplete used by the FK widgets."""
+        self.add_rows(2)
+        url = reverse('admin:autocomplete')
+        res = self.client.get(url, {
+            'term': 'Company',
+            'app_label': 'core',
+            'model_name': 'application',
+            'field_name': 'company_id',
+        })
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.json()['results']), 2)
+
+    def test_interview_changelist_filters(self):
+        """Test the interview changelist filters by result and date."""
+        self.add_rows(2)
+        Interview.objects.filter(id=Interview.objects.first().id).update(result='Passed')
+        now = timezone.now()
+        url = reverse('admin:core_interview_changelist')
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url, {
+                'result': 'passed',
+                'scheduled_at__year': now.year,
+                'scheduled_at__month': now.month,
+            })
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.context['cl'].result_count, 1)
+        # Only the date_hierarchy runs a DISTINCT, the result choices are fixed.
+        distinct = [query['sql'] for query in ctx.captured_queries if 'DISTINCT' in query['sql']]
+        self.assertTrue(all('scheduled_at' in sql for sql in distinct))
+
+        res = self.client.get(url, {'result': 'none'})
+        self.assertEqual(res.context['cl'].result_count, 1)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    """Tests for the admin paginator."""
+
+    def test_exact_count_on_sqlite(self):
+        """Test the paginator falls back to an exact count off Postgres."""
+        user = get_user_model().objects.create_user(email='user@example.com', password='testpass123')
+        for i in range(3):
+            Company.objects.create(user_id=user, name='Company %s' % i)
+
+        paginator = EstimatedCountPaginator(Company.objects.order_by('id'), 2)
+
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.num_pages, 2)
+
+
+class ImportPlacementDataTests(TestCase):
+    """Tests for the import_placement_data command."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.owner = get_user_model().objects.create_user(email='office@example.com', password='testpass123')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w') as handle:
+            handle.write(content)
+        return path
+
+    def run_import(self, path, kind, *args):
+        out = StringIO()
+        call_command('import_placement_data', path, '--kind', kind, '--batch-size', '2', *args, stdout=out)
+        return out.getvalue()
+
+    def test_import_students_csv(self):
+        """Test students are created with hashed passwords."""
+        path = self.write('students.csv', (
+            'email,username,firstName,lastName,password\n'
+            'one@example.com,one,One,Student,secret-one\n'
+            'two@example.com,,Two,Student,secret-two\n'
+            'three@example.com,three,Three,Student,\n'
+        ))
+
+        output = self.run_import(path, 'students', '--workers', '1')
+
+        self.assertIn('Imported 3 students', output)
+        user = get_user_model().objects.get(email='one@example.com')
+        self.assertTrue(user.check_password('secret-one'))
+        self.assertIsNone(get_user_model().objects.get(email='two@example.com').username)
+        self.assertFalse(get_user_model().objects.get(email='three@example.com').has_usable_password())
+
+    def test_import_students_process_pool(self):
+        """Test passwords hashed in worker processes are valid."""
+        path = self.write('students.ndjson', ''.join(
+            json.dumps({'email': 'user%s@example.com' % i, 'password': 'secret-%s' % i}) + '\n'
+            for i in range(5)
+        ))
+
+        self.run_import(path, 'students', '--workers', '2')
+
+        user = get_user_model().objects.get(email='user4@example.com')
+        self.assertTrue(user.check_password('secret-4'))
+
+    def test_import_students_rejects(self):
+        """Test duplicate and invalid rows are written to the rejects file."""
+        path = self.write('students.ndjson', (
+            '{"email": "office@example.com"}\n'
+            '{"email": "new@example.com"}\n'
+            '{"email": "new@example.com"}\n'
+            'not json\n'
+            '{"username": "no-email"}\n'
+        ))
+
+        output = self.run_import(path, 'students', '--workers', '1')
+
+        self.assertIn('Imported 1 students', output)
+        self.assertIn('rejected 4', output)
+        with open(path + '.rejected.ndjson') as handle:
+            errors = [json.loads(line)['error'] for line in handle]
+        self.assertEqual(len(errors), 4)
+        self.assertIn('A user with this email already exists.', errors)
+        self.assertIn('Duplicate row in file.', errors)
+
+    def test_import_students_conflict_added_during_import(self):
+        """Test a row colliding with one added after the checks is rejected, not fatal."""
+        path = self.write('students.ndjson', (
+            '{"email": "one@example.com"}\n'
+            '{"email": "taken@example.com"}\n'
+        ))
+        hash_passwords = Command.hash_passwords
+
+        def add_user_then_hash(command, passwords):
+            get_user_model().objects.create_user(email='taken@example.com', password='testpass123')
+            return hash_passwords(command, passwords)
+
+        with mock.patch.object(Command, 'hash_passwords', add_user_then_hash):
+            output = self.run_import(path, 'students', '--workers', '1')
+
+        self.assertIn('Imported 1 students', output)
+        self.assertIn('rejected 1', output)
+        self.assertTrue(get_user_model().objects.filter(email='one@example.com').exists())
+        with open(path + '.rejected.ndjson') as handle:
+            reject = json.loads(handle.readline())
+        self.assertEqual(reject['row'], {'email': 'taken@example.com'})
+        self.assertEqual(reject['error'], 'Conflicts with a row added during the import.')
+
+    def test_import_companies_and_applications(self):
+        """Test companies and applications resolve users and companies by name."""
+        companies = self.write('companies.csv', 'name,user_email\nSamsung,\nNokia,office@EXAMPLE.COM\n')
+        self.run_import(companies, 'companies', '--owner', 'office@example.com')
+        self.assertEqual(Company.objects.filter(user_id=self.owner).count(), 2)
+
+        applications = self.write('applications.csv', (
+            'user_email,company,notes,source\n'
+            'office@example.com,Samsung,Applied online,Campus\n'
+            'office@example.com,Unknown,Applied online,Campus\n'
+            'missing@example.com,Nokia,Applied online,Campus\n'
+        ))
+        output = self.run_import(applications, 'applications')
+
+        self.assertIn('Imported 1 applications', output)
+        self.assertIn('rejected 2', output)
+        application = Application.objects.get()
+        self.assertEqual(application.company_id.name, 'Samsung')
+        self.assertEqual(application.source, 'Campus')
+
+    def test_import_companies_invalidates_cached_list(self):
+        """Test the cached company list picks up imported companies."""
+        cache.clear()
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        self.assertEqual(client.get(reverse('api:list-create-company')).data['results'], [])
+
+        companies = self.write('companies.csv', 'name,user_email\nSamsung,\n')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.run_import(companies, 'companies', '--owner', 'office@example.com')
+
+        res = client.get(reverse('api:list-create-company'))
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual([company['name'] for company in res.data['results']], ['Samsung'])
+
+
+class CompanyFunnelTests(TestCase):
+    """Tests for the incrementally maintained company funnel."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='user@example.com', password='testpass123')
+        self.company = Company.objects.create(user_id=self.user, name='Samsung')
+
+    def funnel(self, company=None):
+        row = CompanyFunnel.objects.get(company_id=company or self.company)
+        return [row.applications, row.interviews, row.interviews_passed, row.offers, row.offers_accepted]
+
+    def test_counts_follow_saves_and_deletes(self):
+        """Test creating, updating and deleting rows keeps the funnel current."""
+        application = Application.objects.create(user_id=self.user, company_id=self.company, notes='Notes')
+        first = Interview.objects.create(application_id=application, notes='One', scheduled_at=timezone.now())
+        Interview.objects.create(application_id=application, notes='Two', result='Passed', scheduled_at=timezone.now())
+        offer = Offer.objects.create(user_id=self.user, company_id=self.company, received_at=timezone.now())
+        self.assertEqual(self.funnel(), [1, 2, 1, 1, 0])
+
+        first.result = 'Passed'
+        first.save()
+        offer.is_accepted = True
+        offer.save()
+        self.assertEqual(self.funnel(), [1, 2, 2, 1, 1])
+
+        application.delete()
+        self.assertEqual(self.funnel(), [0, 0, 0, 1, 1])
+
+    def test_moving_application_to_other_company(self):
+        """Test changing an application's company moves its counts."""
+        other = Company.objects.create(user_id=self.user, name='Nokia')
+        application = Application.objects.create(user_id=self.user, company_id=self.company, notes='Notes')
+        Interview.objects.create(application_id=application, notes='One', scheduled_at=timezone.now())
+        Interview.objects.create(application_id=application, notes='Two', scheduled_at=timezone.now(), result='Passed')
+
+        application = Application.objects.get(id=application.id)
+        application.company_id = other
+        application.save()
+
+        self.assertEqual(self.funnel(), [0, 0, 0, 0, 0])
+        self.assertEqual(self.funnel(other), [1, 2, 1, 0, 0])
+
+        Interview.objects.get(notes='Two').delete()
+        self.assertEqual(self.funnel(), [0, 0, 0, 0, 0])
+        self.assertEqual(self.funnel(other), [1, 1, 0, 0, 0])
+
+    def test_rows_loaded_with_deferred_columns(self):
+        """Test rows loaded with only() don't load columns and still count changes."""
+        application = Application.objects.create(user_id=self.user, company_id=self.company, notes='Notes')
+        Interview.objects.create(application_id=application, notes='One', scheduled_at=timezone.now())
+
+        with self.assertNumQueries(1):
+            interview = Interview.objects.only('id', 'notes').get()
+        interview.result = 'Passed'
+        interview.save()
+        self.assertEqual(self.funnel(), [1, 1, 1, 0, 0])
+
+        Interview.objects.only('id').get().delete()
+        self.assertEqual(self.funnel(), [1, 0, 0, 0, 0])
+
+    def test_deleting_company(self):
+        """Test deleting a company removes its funnel row."""
+        application = Application.objects.create(user_id=self.user, company_id=self.company, notes='Notes')
+        Interview.objects.create(application_id=application, notes='One', scheduled_at=timezone.now())
+
+        self.company.delete()
+
+        self.assertFalse(CompanyFunnel.objects.exists())
+
+    def test_rebuild_command(self):
+        """Test rebuild_funnel recomputes rows written without signals."""
+        application = Application.objects.create(user_id=self.user, company_id=self.company, notes='Notes')
+        Interview.objects.bulk_create([
+            Interview(application_id=application, notes='One', result='passed', scheduled_at=timezone.now()),
+            Interview(application_id=application, notes='Two', result='Failed', scheduled_at=timezone.now()),
+        ])
+        Offer.objects.bulk_create([
+            Offer(user_id=self.user, company_id=self.company, is_accepted=True, received_at=timezone.now()),
+        ])
+        CompanyFunnel.objects.all().delete()
+        other = Company.objects.create(user_id=self.user, name='Nokia')
+
+        out = StringIO()
+        call_command('rebuild_funnel', '--chunk-size', '1', stdout=out)
+
+        self.assertIn('Rebuilt funnel for 2 companies', out.getvalue())
+        self.assertEqual(self.funnel(), [1, 2, 1, 1, 1])
+        self.assertEqual(self.funnel(other), [0, 0, 0, 0, 0])
+
+
+
+class ExportPlacementDataTests(TestCase):
+    """Tests for the export_placement_data command."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.user = get_user_model().objects.create_user(email='user@example.com', password='testpass123')
+        self.company = Company.objects.create(user_id=self.user, name='Samsung')
+        self.other = Company.objects.create(user_id=self.user, name='Nokia')
+        Application.objects.create(user_id=self.user, company_id=self.company, notes='First')
+        Application.objects.create(user_id=self.user, company_id=self.other, notes='Second')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_export_to_stdout(self):
+        """Test the CSV export is written to stdout by default."""
+        out = StringIO()
+        call_command('export_placement_data', 'applications', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith('id,user_email,company_id,company'))
+
+    def test_export_to_file_filtered(self):
+        """Test exporting to an NDJSON file filtered by company."""
+        path = os.path.join(self.tmpdir.name, 'applications.ndjson')
+        err = StringIO()
+        call_command(
+            'export_placement_data', 'applications', '--output', path,
+            '--company', str(self.other.id), '--chunk-size', '1', stderr=err,
+        )
+
+        with open(path) as handle:
+            rows = [json.loads(line) for line in handle]
+        self.assertEqual([row['notes'] for row in rows], ['Second'])
+        self.assertIn('Exported 1 applications', err.getvalue())
+
+
+@override_settings(MEDIA_PROCESSING_WORKERS=0)
+class MediaProcessingTests(TestCase):
+    """Tests for background media processing."""
+
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root.name)
+        self.settings_override.enable()
+        self.user = get_user_model().objects.create_user(email='user@example.com', password='testpass123')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media_root.cleanup()
+
+    def image_file(self, name, size=(400, 400), mode='RGBA'):
+        buffer = BytesIO()
+        Image.new(mode, size).save(buffer, format='PNG')
+        return SimpleUploadedFile(name, buffer.getvalue())
+
+    def test_profile_image_processed(self):
+        """Test a new profile image gets renditions, replacing it cleans up the old ones."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile_image = self.image_file('avatar.png')
+            self.user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_image_width, 400)
+        old_thumbnail = os.path.join(self.media_root.name, self.user.profile_image_renditions['thumbnail'])
+        self.assertTrue(os.path.exists(old_thumbnail))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile_image = self.image_file('avatar2.png', size=(100, 50))
+            self.user.save()
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.profile_image_width, self.user.profile_image_height), (100, 50))
+        self.assertFalse(os.path.exists(old_thumbnail))
+
+    def test_original_metadata_stripped(self):
+        """Test an original with EXIF is replaced by an upright copy without it."""
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        exif[0x010f] = 'Camera'
+        exif[0x8825] = {1: 'N', 2: (12.0, 58.0, 0.0)}
+        buffer = BytesIO()
+        Image.new('RGB', (40, 20), 'red').save(buffer, format='JPEG', exif=exif.tobytes())
+        company = Company.objects.create(user_id=self.user, name='Samsung')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resume = Resume.objects.create(
+                user_id=self.user, company_id=company, resume=SimpleUploadedFile('cv.jpg', buffer.getvalue()),
+            )
+        uploaded = resume.resume.name
+        resume.refresh_from_db()
+
+        self.assertNotEqual(resume.resume.name, uploaded)
+        self.assertFalse(resume.resume.storage.exists(uploaded))
+        with resume.resume.open('rb'):
+            image = Image.open(resume.resume)
+            self.assertEqual(image.format, 'JPEG')
+            self.assertEqual(image.size, (20, 40))
+            self.assertEqual(dict(image.getexif()), {})
+        self.assertEqual((resume.width, resume.height), (20, 40))
+        self.assertEqual(resume.size, resume.resume.size)
+
+    def test_unrelated_save_not_reprocessed(self):
+        """Test saving a user without changing the image schedules nothing."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile_image = self.image_file('avatar.png')
+            self.user.save()
+        user = get_user_model().objects.get(pk=self.user.pk)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            user.firstName = 'Test'
+            user.save()
+        self.assertEqual(callbacks, [])
+
+    def test_non_image_profile_file(self):
+        """Test a file Pillow can't read is marked processed without renditions."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile_image = SimpleUploadedFile('notes.txt', b'not an image')
+            self.user.save()
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.profile_image_processed_at)
+        self.assertIsNone(self.user.profile_image_width)
+        self.assertEqual(self.user.profile_image_renditions, {})
+
+    def test_process_media_command(self):
+        """Test the command processes files whose job never ran."""
+        self.user.profile_image = self.image_file('avatar.png', mode='P')
+        self.user.save()
+        company = Company.objects.create(user_id=self.user, name='Samsung')
+        resume = Resume.objects.create(user_id=self.user, company_id=company, resume=self.image_file('cv.png'))
+
+        out = StringIO()
+        call_command('process_media', stdout=out)
+
+        self.assertIn('Processed 2 files', out.getvalue())
+        resume.refresh_from_db()
+        self.assertEqual(resume.width, 400)
+        call_command('process_media', stdout=out)
+        self.assertIn('Processed 0 files', out.getvalue())
+
+
+@override_settings(MEDIA_PROCESSING_WORKERS=0, MEDIA_RENDITIONS={})
+class ContentAddressedStorageTests(TestCase):
+    """Tests for the deduplicating storage backend."""
+
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root.name)
+        self.settings_override.enable()
+        self.user = get_user_model().objects.create_user(email='user@example.com', password='testpass123')
+        self.company = Company.objects.create(user_id=self.user, name='Samsung')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media_root.cleanup()
+
+    def create_resume(self, name='cv.png', content=b'same content'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Resume.objects.create(
+                user_id=self.user, company_id=self.company, resume=SimpleUploadedFile(name, content),
+            )
+
+    def test_identical_uploads_share_a_blob(self):
+        """Test identical files are stored once and counted per reference."""
+        first = self.create_resume('first.PNG')
+        second = self.create_resume('second.png')
+        other = self.create_resume('other.png', b'other content')
+
+        self.assertEqual(first.resume.name, second.resume.name)
+        self.assertNotEqual(first.resume.name, other.resume.name)
+        self.assertTrue(first.resume.name.startswith('blobs/'))
+        self.assertTrue(first.resume.name.endswith('.png'))
+        self.assertEqual(MediaBlob.objects.get(name=first.resume.name).references, 2)
+        self.assertEqual(first.resume.read(), b'same content')
+
+    def test_delete_releases_references(self):
+        """Test the blob file is removed with its last reference."""
+        first = self.create_resume()
+        second = self.create_resume()
+        path = first.resume.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(MediaBlob.objects.get(name=second.resume.name).references, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(MediaBlob.objects.exists())
+
+    def test_delete_without_row_keeps_file(self):
+        """Test a blob file is only removed together with its locked row."""
+        resume = self.create_resume()
+        path = resume.resume.path
+        MediaBlob.objects.all().delete()
+
+        resume.resume.storage.delete(resume.resume.name)
+
+        self.assertTrue(os.path.exists(path))
+
+    def test_add_reference_recreates_missing_row(self):
+        """Test adding a reference to a blob without a row creates the row."""
+        resume = self.create_resume()
+        MediaBlob.objects.all().delete()
+
+        second = self.create_resume()
+
+        self.assertEqual(second.resume.name, resume.resume.name)
+        self.assertEqual(MediaBlob.objects.get(name=resume.resume.name).references, 1)
+
+    def test_replacing_file_releases_old_blob(self):
+        """Test replacing an upload drops the reference to the old one."""
+        resume = self.create_resume()
+        old_path = resume.resume.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resume.resume = SimpleUploadedFile('new.png', b'new content')
+            resume.save()
+
+        self.assertFalse(os.path.exists(old_path))
+        self.assertEqual(MediaBlob.objects.get().name, resume.resume.name)
+
+    def test_dedupe_media_command(self):
+        """Test existing files are moved into the blob store in place."""
+        paths = []
+        for index, name in enumerate(['resumes/a.png', 'resumes/b.png', 'resumes/c.png']):
+            path = os.path.join(self.media_root.name, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as handle:
+                handle.write(b'unique' if index == 2 else b'duplicate')
+            paths.append(path)
+            resume = Resume.objects.create(
+                user_id=self.user, company_id=self.company, resume=SimpleUploadedFile('x.png', b'x'),
+            )
+            Resume.objects.filter(pk=resume.pk).update(resume=name)
+        MediaBlob.objects.all().delete()
+
+        out = StringIO()
+        call_command('dedupe_media', '--dry-run', stdout=out)
+        self.assertIn('Would move 3 files, 9 bytes reclaimable', out.getvalue())
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+
+        call_command('dedupe_media', stdout=out)
+        self.assertIn('Moved 3 files, 9 bytes reclaimed', out.getvalue())
+        self.assertFalse(any(os.path.exists(path) for path in paths))
+        names = list(Resume.objects.order_by('pk').values_list('resume', flat=True))
+        self.assertEqual(names[0], names[1])
+        self.assertEqual(MediaBlob.objects.get(name=names[0]).references, 2)
+        self.assertEqual(Resume.objects.get(resume=names[2]).resume.read(), b'unique')
+
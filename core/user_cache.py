@@ -0,0 +1,55 @@
+"""
+Short-lived cache of user rows for token authentication.
+
+api.authentication.CachedJWTAuthentication reads the user from here instead
+of querying CustomUser on every request. Saving or deleting a user drops
+the entry, so deactivations and permission changes apply on the next
+request. Changes made with ``QuerySet.update()`` must call ``invalidate``
+themselves, otherwise they show after USER_CACHE_SECONDS. So does a row
+cached by a concurrent request before the change commits.
+
+Entries are dropped only from the cache of the process that saved the user,
+so with a per-process backend such as LocMemCache other workers keep
+authenticating a deactivated user for up to USER_CACHE_SECONDS. Deployments
+with more than one worker need a shared cache; ``manage.py check --deploy``
+warns about LocMemCache while the user cache is enabled.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.core.checks import Warning
+
+
+def _key(user_id):
+    return 'user:%s' % user_id
+
+
+def get(user_id):
+    return cache.get(_key(user_id))
+
+
+async def aget(user_id):
+    return await cache.aget(_key(user_id))
+
+
+def store(user):
+    cache.set(_key(user.pk), user, settings.USER_CACHE_SECONDS)
+
+
+async def astore(user):
+    await cache.aset(_key(user.pk), user, settings.USER_CACHE_SECONDS)
+
+
+def invalidate(user_id):
+    cache.delete(_key(user_id))
+
+
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.USER_CACHE_SECONDS and backend == 'django.core.cache.backends.locmem.LocMemCache':
+        return [Warning(
+            'The user cache is enabled but the default cache is per-process.',
+            hint='Use a shared cache backend such as Redis, or set USER_CACHE_SECONDS = 0, '
+                 'so that deactivating a user applies to every worker.',
+            id='core.W001',
+        )]
+    return []
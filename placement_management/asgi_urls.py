@@ -0,0 +1,11 @@
+"""URLconf for ASGI requests, applied by api.async_views.AsyncUrlconfMiddleware.
+
+The async API routes come first; anything they don't match falls through
+to the regular URLconf.
+"""
+from django.urls import path, include
+from placement_management.urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/', include(('api.async_urls', 'api'), namespace='api-async')),
+] + sync_urlpatterns
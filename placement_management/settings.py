@@ -50,16 +50,21 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.async_views.AsyncUrlconfMiddleware',
+    'api.instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'api.replicas.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'placement_management.urls'
+# Used for requests served through asgi.py, see api/async_views.py.
+ASGI_URLCONF = 'placement_management.asgi_urls'
 
 TEMPLATES = [
     {
@@ -94,6 +99,19 @@ DATABASES = {
     }
 }
 
+# Read replicas for views using api.replicas.ReplicaReadMixin. Add an alias
+# per replica to DATABASES and list it here, e.g.
+#
+#   DATABASES['replica'] = dict(DATABASES['default'], HOST='replica.internal')
+#   DATABASE_REPLICAS = ['replica']
+#
+# Test settings should leave this empty, api/tests/test_replicas.py turns it
+# on where needed and runs against a 'replica' alias when one is defined.
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['core.replicas.PrimaryReplicaRouter']
+# How long a user's reads stay on the primary after they write.
+REPLICA_PIN_SECONDS = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -154,11 +172,58 @@ JAZZMIN_SETTINGS = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_FILTER_BACKENDS': (
+        'api.filters.FilterFieldsBackend',
+        'api.filters.WhitelistOrderingFilter',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetCursorPagination',
+    'PAGE_SIZE': 50,
+}
+
+# Upper bound for the ?page_size= query parameter on list endpoints
+API_MAX_PAGE_SIZE = 200
+
+# Serve list pages from values() rows through compiled serializers where
+# the serializer allows it, see api/compiled.py.
+API_COMPILED_SERIALIZERS = True
+
+# Per-request SQL instrumentation, see api/instrumentation.py. The
+# Server-Timing header shows query counts and database time to clients,
+# which tells them about the queries behind each endpoint, so it's only
+# sent in development. The logs are written either way.
+QUERY_SERVER_TIMING = DEBUG
+# Requests running more queries than this are logged as warnings.
+QUERY_COUNT_WARNING = 100
+
+# Swap in 'django.core.cache.backends.redis.RedisCache' or the file based
+# backend to share cached API responses between worker processes.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
 }
 
+# Seconds a cached API response (e.g. the company list) is kept
+API_CACHE_TIMEOUT = 300
+
+# Seconds a user row is cached for token authentication, see core/user_cache.py.
+# Saving a user only drops it from the cache of the process that saved it, so
+# with the LocMemCache above other workers keep the old row until it expires.
+# Use a shared cache, or 0 to disable, when running more than one worker.
+USER_CACHE_SECONDS = 60
+
+# Interview calendar, see core/calendar.py. The calendar endpoint lists the
+# next CALENDAR_DAYS days by default, up to CALENDAR_MAX_DAYS with ?days=.
+CALENDAR_DAYS = 14
+CALENDAR_MAX_DAYS = 90
+# The .ics feed also keeps interviews of the last CALENDAR_FEED_PAST_DAYS
+# days, and shows each one as an event of CALENDAR_EVENT_MINUTES.
+CALENDAR_FEED_PAST_DAYS = 30
+CALENDAR_EVENT_MINUTES = 60
+
 # Docs settings
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Placement Management API',
@@ -175,6 +240,30 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploads are stored once per unique content, see core/storage.py.
+DEFAULT_FILE_STORAGE = 'core.storage.ContentAddressedStorage'
+
+# Media is served by api.media.ProtectedMediaView after an ownership check.
+# Set to 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache, lighttpd) to
+# let the front proxy send the file. For nginx, MEDIA_ACCEL_PREFIX must be
+# an internal location aliased to MEDIA_ROOT.
+MEDIA_SENDFILE_BACKEND = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+MEDIA_CACHE_MAX_AGE = 60 * 60
+
+# Uploaded images are processed after the request by a pool of
+# MEDIA_PROCESSING_WORKERS threads, 0 processes them inline on commit.
+MEDIA_PROCESSING_WORKERS = 2
+MEDIA_RENDITION_FORMAT = 'WEBP'
+MEDIA_RENDITION_QUALITY = 80
+# Quality of originals re-encoded to drop their metadata.
+MEDIA_ORIGINAL_QUALITY = 95
+# Rendition name -> bounding box, images are never upscaled.
+MEDIA_RENDITIONS = {
+    'display': (1600, 1600),
+    'thumbnail': (320, 320),
+}
+
 SITE_URL = "http://127.0.0.1:8000"
 
 # Default primary key field type